@@ -1,11 +1,17 @@
 from bas_remote.client import BasRemoteClient
 from bas_remote.errors import BasError, SocketNotConnectedError, ScriptNotSupportedError, ClientNotStartedError
 from bas_remote.errors import ScriptNotExistError, AuthenticationError, AlreadyRunningError, FunctionError
+from bas_remote.errors import RequestTimeoutError, QueueFullError, FunctionTimeoutError, ConnectionLostError
 from bas_remote.options import Options
+from bas_remote.pool import BasRemoteClientPool
+from bas_remote.sync import SyncBasRemoteClient
+from bas_remote.tracing import Tracer, OpenTelemetryTracer
 from bas_remote.types import Message
 
 __all__ = [
     "BasRemoteClient",
+    "BasRemoteClientPool",
+    "SyncBasRemoteClient",
     "SocketNotConnectedError",
     "ScriptNotSupportedError",
     "ClientNotStartedError",
@@ -13,8 +19,14 @@ __all__ = [
     "AuthenticationError",
     "AlreadyRunningError",
     "FunctionError",
+    "RequestTimeoutError",
+    "QueueFullError",
+    "FunctionTimeoutError",
+    "ConnectionLostError",
     "BasError",
     "Options",
+    "Tracer",
+    "OpenTelemetryTracer",
     "Message",
 ]
 
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import time
+from asyncio import AbstractEventLoop, Task
+from collections import OrderedDict
+from hashlib import sha256
+from os import getpid, listdir, makedirs, path, remove, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+Key = Tuple[str, str]
+"""Cache key: function name and canonical JSON of its arguments."""
+
+Entry = Tuple[Any, float]
+"""Cached result and its expiration time."""
+
+MISSING = object()
+
+
+def cache_key(name: str, params: Optional[Dict] = None) -> Optional[Key]:
+    """Get the key of the function call, or None if the arguments can't be serialized."""
+    try:
+        return name, json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ResultCache:
+    """Cache of BAS function results, for functions that return the same result for the same arguments.
+
+    Results are kept in memory, the least recently used ones are removed above `max_size`. If a directory is given,
+    they are also stored there as files, so they survive restarts of the client: `load` reads them back, and the
+    files follow the results in memory, so there are no more than `max_size` of them. Files are read and written in
+    the executor of the loop. Cached results are returned as they are, so they shouldn't be mutated.
+    """
+
+    _entries: "OrderedDict[Key, Entry]"
+    """Cached results and their expiration times, from the least to the most recently used."""
+
+    _changes: Dict[Key, Optional[Entry]]
+    """Results to write to the directory, or None for the files to remove, since the last write."""
+
+    _invalidated: List[Optional[str]]
+    """Functions whose files are removed before the changes are written, None for all functions."""
+
+    _writer: Optional[Task] = None
+    """Task that writes the changes to the directory."""
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        max_size: int = 1000,
+        directory: Optional[str] = None,
+        loop: Optional[AbstractEventLoop] = None,
+    ):
+        """Create an instance of ResultCache class.
+
+        Args:
+            ttls (dict): Seconds to keep the results, by function name. Other functions are not cached.
+            max_size (int): Maximum number of results kept in memory and on disk. Defaults to 1000.
+            directory (str, optional): Location of the result files. Defaults to None (memory only).
+            loop (AbstractEventLoop, optional): AsyncIO event loop object. Defaults to None.
+        """
+        self._ttls = dict(ttls)
+        self._max_size = max_size
+        self._directory = directory
+        self._loop = loop or asyncio.get_event_loop()
+        self._entries = OrderedDict()
+        self._changes = {}
+        self._invalidated = []
+
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache counters: `size`, `hits` and `misses`."""
+        return {"size": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+    def key(self, name: str, params: Optional[Dict] = None) -> Optional[Key]:
+        """Get the cache key of the function call, or None if the function is not cached."""
+        if name not in self._ttls:
+            return None
+        return cache_key(name, params)
+
+    def get(self, key: Key) -> Any:
+        """Get the cached result, or `MISSING` if there is no fresh one."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._remove(key)
+        self._misses += 1
+        return MISSING
+
+    def set(self, key: Key, result: Any) -> None:
+        """Store the function result."""
+        entry = (result, time.time() + self._ttls[key[0]])
+        self._put(key, entry)
+        self._change(key, entry)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Remove the cached results of the function, of all functions if no name is given."""
+        for key in [key for key in self._entries if name is None or key[0] == name]:
+            del self._entries[key]
+        if self._directory is None:
+            return
+        for key in [key for key in self._changes if name is None or key[0] == name]:
+            del self._changes[key]
+        self._invalidated.append(name)
+        self._start_writer()
+
+    async def load(self) -> None:
+        """Read the results stored in the directory by previous clients, it does nothing without a directory."""
+        if self._directory is None:
+            return
+        stored = await self._loop.run_in_executor(None, self._read_directory, self._directory, time.time())
+        for key, entry in stored:
+            if key[0] not in self._ttls:
+                # the function is no longer cached
+                self._change(key, None)
+            elif key not in self._entries:
+                self._put(key, entry)
+
+    async def flush(self) -> None:
+        """Wait until the changed results are written to the directory."""
+        if self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    def _put(self, key: Key, entry: Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            self._change(evicted, None)
+
+    def _remove(self, key: Key) -> None:
+        self._entries.pop(key, None)
+        self._change(key, None)
+
+    def _change(self, key: Key, entry: Optional[Entry]) -> None:
+        if self._directory is None:
+            return
+        self._changes[key] = entry
+        self._start_writer()
+
+    def _start_writer(self) -> None:
+        if self._writer is None and self._directory is not None:
+            self._writer = self._loop.create_task(self._write(self._directory))
+
+    async def _write(self, directory: str) -> None:
+        try:
+            # one batch at a time, so the files are changed in the order of the calls
+            while self._changes or self._invalidated:
+                changes, self._changes = self._changes, {}
+                invalidated, self._invalidated = self._invalidated, []
+                await self._loop.run_in_executor(None, self._write_directory, directory, changes, invalidated)
+        finally:
+            self._writer = None
+
+    @classmethod
+    def _read_directory(cls, directory: str, now: float) -> List[Tuple[Key, Entry]]:
+        """Read the fresh results from the directory, from the least to the most recently written."""
+        try:
+            names = [name for name in listdir(directory) if name.endswith(".json")]
+        except OSError:
+            return []
+
+        stored = []
+        for name in names:
+            file_path = path.join(directory, name)
+            data = cls._read(file_path, {})
+            try:
+                key = (data["name"], data["params"])
+                entry = (data["result"], float(data["expires"]))
+                modified = path.getmtime(file_path)
+            except (KeyError, TypeError, ValueError, OSError):
+                cls._delete(file_path)
+                continue
+            # a file of another key, e.g. after a hash collision, is not trusted
+            if entry[1] <= now or cls._file_path(directory, key) != file_path:
+                cls._delete(file_path)
+                continue
+            stored.append((modified, key, entry))
+
+        stored.sort(key=lambda item: item[0])
+        return [(key, entry) for _, key, entry in stored]
+
+    @classmethod
+    def _write_directory(
+        cls, directory: str, changes: Dict[Key, Optional[Entry]], invalidated: List[Optional[str]]
+    ) -> None:
+        if invalidated:
+            try:
+                names = [name for name in listdir(directory) if name.endswith(".json")]
+            except OSError:
+                names = []
+            for name in names:
+                file_path = path.join(directory, name)
+                if None in invalidated or cls._read(file_path, {}).get("name") in invalidated:
+                    cls._delete(file_path)
+
+        for key, entry in changes.items():
+            file_path = cls._file_path(directory, key)
+            if entry is None:
+                cls._delete(file_path)
+            else:
+                stored = {"name": key[0], "params": key[1], "result": entry[0], "expires": entry[1]}
+                cls._save(directory, file_path, stored)
+
+    @staticmethod
+    def _file_path(directory: str, key: Key) -> str:
+        digest = sha256(f"{key[0]}\0{key[1]}".encode("utf-8")).hexdigest()
+        return path.join(directory, f"{digest}.json")
+
+    @staticmethod
+    def _save(directory: str, file_path: str, stored: Dict[str, Any]) -> None:
+        try:
+            makedirs(directory, exist_ok=True)
+            temp_path = f"{file_path}.{getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(stored, file)
+            replace(temp_path, file_path)
+        except (OSError, TypeError, ValueError):
+            # the result stays cached in memory
+            pass
+
+    @staticmethod
+    def _read(file_path: str, default: Any) -> Any:
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return default
+        return stored if isinstance(stored, dict) else default
+
+    @staticmethod
+    def _delete(file_path: str) -> None:
+        try:
+            remove(file_path)
+        except OSError:
+            pass
+
+
+__all__ = ["ResultCache", "MISSING", "cache_key"]
@@ -1,28 +1,51 @@
 import asyncio
-import json
 import logging
 import socket
 from asyncio import Future
-from contextlib import closing
-from random import randint
-from typing import Callable, Optional, Dict, Any
+from os import path
+from contextlib import asynccontextmanager, closing
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
 
 from pyee.asyncio import AsyncIOEventEmitter
 from websockets.typing import LoggerLike
 
-from bas_remote.errors import AuthenticationError, ClientNotStartedError
+from bas_remote.cache import ResultCache
+from bas_remote.errors import AuthenticationError, ClientNotStartedError, FunctionFatalError, EngineExitedError
+from bas_remote.errors import ConnectionLostError, NetworkFatalError, UnhandledException
+from bas_remote.metrics import Metrics
 from bas_remote.options import Options
-from bas_remote.runners import BasFunction, BasThread
+from bas_remote.registry import RequestRegistry
+from bas_remote.scheduler import Scheduler
+from bas_remote.runners import BasFunction, BasThread, BasThreadPool
+from bas_remote.runners.flight import SingleFlight
+from bas_remote.runners.mapper import ParamsIterable, map_ordered, map_unordered
 from bas_remote.services import EngineService, SocketService
+from bas_remote.supervisor import EngineSupervisor
 from bas_remote.task import TaskCreator
-from bas_remote.types import Message
+from bas_remote.tracing import Span, Tracer, start_span
+from bas_remote.types import Message, codec
+from bas_remote.variables import GlobalVariables
+
+PORT_ATTEMPTS = 3
+"""Number of ports tried when the engine exits before the socket is connected."""
+
+
+STARTUP_MESSAGES = ("initialize", "thread_start", "message")
+"""Messages of the authentication handshake, the other ones are replies to requests."""
+
+
+def find_free_port() -> int:
+    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
+        s.bind(("", 0))
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        return s.getsockname()[1]
 
 
 class BasRemoteClient(AsyncIOEventEmitter):
     """Class that provides methods for remotely interacting with BAS."""
 
-    _requests: Dict[int, Callable] = {}
-    """Dictionary of requests handlers."""
+    _requests: RequestRegistry
+    """Registry of requests that are waiting for the reply."""
 
     _engine: EngineService = None
     """Client engine service object."""
@@ -34,48 +57,220 @@ class BasRemoteClient(AsyncIOEventEmitter):
 
     _future: Future = None
 
+    _load: int = 0
+    """Number of BAS functions that are currently running."""
+
+    _active: int = 0
+    """Number of BAS functions that are running on the current engine, waiting ones are not counted."""
+
+    _generation: int = 0
+    """Number of the current engine, it is increased when the engine is restarted."""
+
+    _ready: Future
+    """Future that is resolved while the engine accepts new functions."""
+
+    _supervisor: Optional[EngineSupervisor] = None
+    """Supervisor that restarts the engine, if it is enabled in the client options."""
+
+    _reconnect_task: Optional[asyncio.Task] = None
+    """Task that reopens the broken connection."""
+
+    _reconnect_stats: Dict[str, float]
+
+    _metrics: Optional[Metrics] = None
+    """Latency histograms and traffic counters, if they are enabled in the client options."""
+
+    _result_cache: Optional[ResultCache] = None
+    """Cache of function results, if it is enabled in the client options."""
+
+    _single_flight: Optional[SingleFlight] = None
+    """Running functions shared by identical calls, if it is enabled in the client options."""
+
+    startup_timings: Dict[str, float]
+    """Duration of every phase of the last `start` call in seconds."""
+
+    _thread_pool: Optional[BasThreadPool] = None
+    """Pool of started threads reused by `run_function` calls."""
+
+    _scheduler: Scheduler
+    """Admission control for tasks sent to the engine."""
+
+    _tracer: Tracer
+    """Tracing hooks called around the function lifecycle."""
+
     logger: LoggerLike
     port: int
     _task_creator: TaskCreator
-    _lock_requests: asyncio.Lock
 
     def __init__(
         self,
         options: Options,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         logger: Optional[LoggerLike] = None,
+        tracer: Optional[Tracer] = None,
     ):
         """Create an instance of BasRemoteClient class.
 
         Args:
             options (Options): Remote control options object.
             loop (AbstractEventLoop, optional): AsyncIO event loop object. Defaults to None.
+            tracer (Tracer, optional): Tracing hooks, e.g. `OpenTelemetryTracer`. Defaults to None (no tracing).
         """
         self.loop = loop or asyncio.get_event_loop()
+        self._tracer = tracer or Tracer()
         self.loop.set_exception_handler(handler=self._exception_handler)
         super().__init__(self.loop)
         self.options = options
 
         self._future = self.loop.create_future()
+        self._ready = self.loop.create_future()
+        self.startup_timings = {}
+        self._reconnect_stats = {
+            "reconnects": 0,
+            "failures": 0,
+            "time_total": 0.0,
+            "time_max": 0.0,
+            "lost": 0,
+            "reissued": 0,
+        }
+        self._requests = RequestRegistry(self.loop, timeout=options.request_timeout)
+        self._scheduler = Scheduler(self.loop, options.max_in_flight, options.max_queue_size)
+        self._global_variables = GlobalVariables(self, options.global_variables_ttl)
+        if options.cache_functions:
+            directory = path.join(options.working_dir, "cache", options.script_name) if options.cache_on_disk else None
+            self._result_cache = ResultCache(options.cache_functions, options.cache_max_size, directory, self.loop)
+        if options.single_flight_functions:
+            self._single_flight = SingleFlight(options.single_flight_functions)
+        if options.metrics:
+            self._metrics = Metrics()
         self._engine = EngineService(self)
-        self._socket = SocketService(self)
+        self._socket = SocketService(self, dispatch=self._dispatch, has_listeners=self._has_listeners)
 
-        self.on("message_received", self._on_message_received)
         self.on("fatal_received", self._on_fatal_received)
         self.on("socket_open", self._on_socket_open)
+        self.on("socket_close", self._on_socket_close)
         if logger is not None:
             self.logger = logger
         else:
             self.logger = logging.getLogger("[bas-remote:client]")
 
         self._task_creator = TaskCreator(loop=self._loop)
-        self._lock_requests = asyncio.Lock()
+
+        if options.thread_pool_max_size:
+            self._thread_pool = BasThreadPool(
+                self,
+                min_size=options.thread_pool_min_size,
+                max_size=options.thread_pool_max_size,
+                idle_timeout=options.thread_pool_idle_timeout,
+            )
+
+        if options.supervise_engine or options.engine_max_tasks or options.engine_max_memory:
+            self._supervisor = EngineSupervisor(
+                self,
+                check_interval=options.engine_check_interval,
+                max_tasks=options.engine_max_tasks,
+                max_memory=options.engine_max_memory,
+            )
 
     @property
     def is_started(self):
         """Gets a value that indicates whether the current client is already running."""
         return self._is_started
 
+    @property
+    def thread_pool(self) -> Optional[BasThreadPool]:
+        """Gets the pool of started threads, if it is enabled in the client options."""
+        return self._thread_pool
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Gets the client scheduler, it exposes running tasks, queue depth and wait time."""
+        return self._scheduler
+
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        """Gets the cache of function results, if it is enabled in the client options."""
+        return self._result_cache
+
+    @property
+    def global_variables(self) -> GlobalVariables:
+        """Gets the global variables of the script, with batch reads and writes and the local cache."""
+        return self._global_variables
+
+    @property
+    def supervisor(self) -> Optional[EngineSupervisor]:
+        """Gets the engine supervisor, if it is enabled in the client options."""
+        return self._supervisor
+
+    @property
+    def is_reconnecting(self) -> bool:
+        """Gets a value that indicates whether the broken connection is being reopened."""
+        return self._reconnect_task is not None
+
+    def reconnect_stats(self) -> Dict[str, float]:
+        """Get the reconnect counters.
+
+        Returns:
+            dict: Number of reconnects and failed attempts, time spent reconnecting, number of requests lost with
+                the connection and number of functions that were run again.
+        """
+        return dict(self._reconnect_stats)
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        """Gets the collected metrics, if they are enabled in the client options."""
+        return self._metrics
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current state and counters of the client.
+
+        Returns:
+            dict: Gauges of running and waiting functions, scheduler and reconnect counters, supervisor counters
+                and collected metrics if they are enabled.
+        """
+        stats = {
+            "gauges": self._gauges(),
+            "scheduler": self._scheduler.stats(),
+            "reconnect": self.reconnect_stats(),
+            "global_variables": self._global_variables.stats(),
+        }
+        if self._result_cache is not None:
+            stats["result_cache"] = self._result_cache.stats()
+        if self._single_flight is not None:
+            stats["single_flight"] = self._single_flight.stats()
+        if self._supervisor is not None:
+            stats["supervisor"] = self._supervisor.stats()
+        if self._metrics is not None:
+            stats["metrics"] = self._metrics.to_dict()
+        return stats
+
+    def export_metrics(self) -> str:
+        """Get the collected metrics and gauges in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text, it contains only gauges if metrics are not enabled in the client options.
+        """
+        metrics = self._metrics if self._metrics is not None else Metrics()
+        return metrics.to_prometheus(self._gauges())
+
+    def _gauges(self) -> Dict[str, float]:
+        gauges: Dict[str, float] = {
+            "load": self._load,
+            "active": self._active,
+            "in_flight": self._scheduler.in_flight,
+            "queue_depth": self._scheduler.queue_depth,
+            "pending_requests": len(self._requests),
+        }
+        if self._thread_pool is not None:
+            gauges["thread_pool_size"] = self._thread_pool.size
+            gauges["thread_pool_idle"] = self._thread_pool.idle
+        return gauges
+
+    @property
+    def load(self) -> int:
+        """Gets the number of BAS functions that are currently running on the client."""
+        return self._load
+
     def _exception_handler(self, loop, context, *args, **kwargs):
         """should not be reached here in normal situation"""
         self.logger.error(context)
@@ -84,32 +279,191 @@ class BasRemoteClient(AsyncIOEventEmitter):
 
     async def start(self) -> None:
         """Start the client and wait for it initialize."""
+        self.startup_timings = {}
+        started = self.loop.time()
+
         await self._engine.initialize()
+        if self._result_cache is not None:
+            await self._result_cache.load()
+        self._timing("initialize", started)
+
+        attached_port = await self._engine.attach() if self.options.detach_engine else None
+        if attached_port is not None:
+            self.port = attached_port
+            self.logger.info("attached to engine at port: %s" % self.port)
+            await self._connect()
+        else:
+            await self._start_engine()
+
+        phase = self.loop.time()
+        await asyncio.wait_for(fut=self._future, timeout=60)
+        self._timing("authenticate", phase)
+
+        if self._thread_pool is not None:
+            phase = self.loop.time()
+            await self._thread_pool.start()
+            self._timing("thread_pool", phase)
+
+        self._resume()
+        if self._supervisor is not None:
+            self._supervisor.start()
+
+        self._timing("total", started)
+        self.logger.info("started in %.3fs: %s" % (self.startup_timings["total"], self.startup_timings))
 
-        def find_free_port():
-            with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
-                s.bind(("", 0))
-                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                return s.getsockname()[1]
+    async def _start_engine(self) -> None:
+        """Start the engine and connect to it, selecting a new port if the engine exits before it is connected.
 
-        self.port = find_free_port()
-        self.logger.info("running at port: %s" % self.port)
-        await asyncio.wait_for(fut=self._engine.start(self.port), timeout=360)
-        await asyncio.wait_for(fut=self._socket.start(self.port), timeout=60)
+        The port is free when it is selected, but another process may take it before the engine binds it.
+        """
+        for attempt in range(1, PORT_ATTEMPTS + 1):
+            self.port = find_free_port()
+            self.logger.info("running at port: %s" % self.port)
+
+            phase = self.loop.time()
+            await asyncio.wait_for(fut=self._engine.start(self.port), timeout=360)
+            self._timing("engine", phase)
+
+            try:
+                await self._connect()
+                return
+            except EngineExitedError as exc:
+                if attempt == PORT_ATTEMPTS:
+                    raise
+                self.logger.warning("%s Retrying with a new port, attempt: %s" % (exc.message, attempt + 1))
+
+    async def _connect(self) -> None:
+        phase = self.loop.time()
+        await asyncio.wait_for(fut=self._socket.start(self.port, check=self._engine.check_process), timeout=60)
+        self._timing("socket", phase)
+
+    def _timing(self, phase: str, started: float) -> None:
+        self.startup_timings[phase] = self.loop.time() - started
+
+    async def _restart_engine(self) -> None:
+        """Replace the engine with a new one, the client stays started and new functions wait for the new engine."""
+        self._pause()
+        self._requests.reject_all(FunctionFatalError("Engine is restarted"))
+        # the new engine starts with the initial values of the variables
+        self._global_variables.invalidate()
+        if self._thread_pool is not None:
+            self._thread_pool.reset()
+
+        await self._socket.close()
+        await self._engine.stop_process()
+
+        self._future = self.loop.create_future()
+        await self._start_engine()
         await asyncio.wait_for(fut=self._future, timeout=60)
+        self._generation += 1
+
+        if self._thread_pool is not None:
+            await self._thread_pool.start()
+        self._resume()
+
+    def _pause(self) -> None:
+        """Make new functions wait until `_resume` is called, e.g. while the engine is restarted."""
+        if self._ready.done():
+            self._ready = self.loop.create_future()
+
+    def _resume(self) -> None:
+        if not self._ready.done():
+            self._ready.set_result(None)
+
+    @asynccontextmanager
+    async def _running(self) -> AsyncIterator[None]:
+        """Context manager that waits until the engine accepts new functions and counts the running one."""
+        if not self.is_started:
+            raise ClientNotStartedError()
+        # shielded, because a cancelled waiter would cancel the future shared by all waiters
+        await asyncio.shield(self._ready)
+        if not self.is_started:
+            raise ClientNotStartedError()
+
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if self._supervisor is not None:
+                self._supervisor.task_done()
+
+    async def _on_socket_close(self) -> None:
+        if self._supervisor is not None and self.is_started and not self.is_reconnecting:
+            self._supervisor.check()
 
     async def _on_fatal_received(self, exc: Exception) -> None:
-        """cancel all tasks, because got fatal exception"""
-        async with self._lock_requests:
-            for _id, callback in self._requests.items():
-                data = '{"Message":"FunctionFatalError: %s","Result":null,"Success":false}' % exc
-                callback(data)
+        """fail all pending requests, because got fatal exception"""
+        if not self.options.reconnect or not self.is_started or self.is_reconnecting:
+            self._requests.reject_all(FunctionFatalError(str(exc)))
+            return
+
+        # threads don't survive the connection, so functions are paused and idempotent ones start from scratch
+        self._pause()
+        self._generation += 1
+        if self._thread_pool is not None:
+            self._thread_pool.reset()
+        self._reconnect_stats["lost"] += len(self._requests)
+        self._requests.reject_all(ConnectionLostError())
+        self._reconnect_task = self.loop.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Reopen the connection to the same engine and repeat the authentication."""
+        self.logger.warning("connection lost, reconnecting at port: %s" % self.port)
+        started = self.loop.time()
+        try:
+            self._future = self.loop.create_future()
+            await self._socket.start(
+                self.port, timeout=self.options.reconnect_timeout, check=self._engine.check_process
+            )
+            await asyncio.wait_for(fut=self._future, timeout=60)
+            if self._thread_pool is not None:
+                await self._thread_pool.start()
+        except Exception as exc:
+            self.logger.error("cannot reconnect: %r" % exc)
+            self._reconnect_stats["failures"] += 1
+            self._reconnect_task = None
+            if self._supervisor is not None:
+                # the supervisor restarts the engine, waiting functions continue on the new one
+                self._supervisor.check()
+            else:
+                self._is_started = False
+                self._resume()
+            return
+
+        duration = self.loop.time() - started
+        self._reconnect_stats["reconnects"] += 1
+        self._reconnect_stats["time_total"] += duration
+        self._reconnect_stats["time_max"] = max(self._reconnect_stats["time_max"], duration)
+        self._reconnect_task = None
+        self._resume()
+
+        self.logger.info("reconnected in %.3fs" % duration)
+        self.emit("socket_reconnect", duration)
+
+    def _has_listeners(self, event: str) -> bool:
+        return bool(self.listeners(event))
+
+    def _dispatch(self, message: Message) -> None:
+        """Handle the message received by the socket service.
+
+        Replies resolve their requests right away, only the startup messages are handled in a task. The
+        `message_received` event is emitted only if someone listens to it.
+        """
+        self.logger.debug("message received: %s", message)
 
-        self._requests.clear()
+        if message.type_ in STARTUP_MESSAGES:
+            self._task_creator.create_task_named(self._on_message_received(message))
+        elif message.async_ and message.id_:
+            if message.type_ == "get_global_variable":
+                self._requests.resolve(message.id_, codec.loads(message.data))
+            else:
+                self._requests.resolve(message.id_, message.data)
 
-    async def _on_message_received(self, message: Message) -> None:
-        self.logger.debug("message received: %s" % message)
+        if self._has_listeners("message_received"):
+            self.emit("message_received", message)
 
+    async def _on_message_received(self, message: Message) -> None:
         if message.type_ == "initialize":
             await self._send("accept_resources", {"-bas-empty-script-": True})
         elif message.type_ == "thread_start" and not self._future.done():
@@ -118,13 +472,6 @@ class BasRemoteClient(AsyncIOEventEmitter):
         elif message.type_ == "message" and not self._future.done():
             self._future.set_exception(AuthenticationError())
             self._is_started = False
-        elif message.async_ and message.id_:
-            async with self._lock_requests:
-                callback = self._requests.pop(message.id_)
-                if message.type_ == "get_global_variable":
-                    callback(json.loads(message.data))
-                else:
-                    callback(message.data)
 
     async def _on_socket_open(self) -> None:
         await self._send(
@@ -136,16 +483,68 @@ class BasRemoteClient(AsyncIOEventEmitter):
             },
         )
 
-    def run_function(self, function_name: str, function_params: Optional[Dict] = None) -> BasFunction:
+    def run_function(
+        self,
+        function_name: str,
+        function_params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ) -> BasFunction:
         """Call the BAS function asynchronously.
 
         Args:
             function_name (str): BAS function name as string.
             function_params (dict, optional): BAS function arguments list. Defaults to None.
+            priority (int): Task priority in the client scheduler, higher values run first. Defaults to 0.
+            timeout (float, optional): Seconds after which the function is stopped and `FunctionTimeoutError`
+                is raised. Defaults to None (no limit).
+            idempotent (bool): Run the function again if the connection is lost while it is running, instead of
+                failing with `ConnectionLostError`. Requires `options.reconnect`. Defaults to False.
         """
         if not self.is_started:
             raise ClientNotStartedError()
-        return BasFunction(self, function_name, function_params)
+        return BasFunction(self, function_name, function_params, priority, timeout, idempotent)
+
+    def map(
+        self, function_name: str, params: ParamsIterable, concurrency: int = 10, ordered: bool = False
+    ) -> AsyncIterator[Tuple[Optional[Dict], Any]]:
+        """Call the BAS function for every arguments list, keeping a limited number of calls in flight.
+
+        Args:
+            function_name (str): BAS function name as string.
+            params (iterable): Sync or async iterable of BAS function arguments lists, it is read lazily.
+            concurrency (int): Maximum number of calls in flight. Defaults to 10.
+            ordered (bool): Yield results in input order instead of completion order. Defaults to False.
+
+        Returns:
+            AsyncIterator: Pairs of arguments list and function result, or the exception object if the call failed.
+        """
+        if not self.is_started:
+            raise ClientNotStartedError()
+        run = map_ordered if ordered else map_unordered
+        return run(self.run_function, function_name, params, concurrency)
+
+    async def get_global_variable(self, name: str) -> Any:
+        """Get the value of the script global variable, from the local cache if it is enabled.
+
+        Args:
+            name (str): Variable name.
+        """
+        if not self.is_started:
+            raise ClientNotStartedError()
+        return await self._global_variables.get(name)
+
+    async def set_global_variable(self, name: str, value: Any) -> None:
+        """Set the value of the script global variable.
+
+        Args:
+            name (str): Variable name.
+            value (any): JSON serializable value.
+        """
+        if not self.is_started:
+            raise ClientNotStartedError()
+        await self._global_variables.set(name, value)
 
     async def send(self, type_: str, data: Optional[Dict] = None, async_: bool = False) -> int:
         """Send the custom message asynchronously and get message id as result.
@@ -162,32 +561,52 @@ class BasRemoteClient(AsyncIOEventEmitter):
             raise ClientNotStartedError()
         return await self._send(type_, data, async_)
 
-    async def send_async(self, type_: str, data: Optional[Dict] = None) -> Any:
+    async def send_async(
+        self, type_: str, data: Optional[Dict] = None, timeout: Optional[float] = None, span: Optional[Span] = None
+    ) -> Any:
         """Send the custom message asynchronously and get result.
 
         Args:
             type_ (str): Selected message type.
             data (dict, optional): Message arguments. Defaults to None.
+            timeout (float, optional): Seconds to wait for the reply. Defaults to `options.request_timeout`.
+            span (Span, optional): Parent span of the send and reply wait spans. Defaults to None.
         """
         if not self.is_started:
             raise ClientNotStartedError()
-        return await self._send_async(type_, data)
+        return await self._send_async(type_, data, timeout, span)
 
-    async def _send(self, type_: str, data: Optional[Dict] = None, async_=False) -> int:
+    async def _send(self, type_: str, data: Optional[Dict] = None, async_=False, id_: Optional[int] = None) -> int:
         message = Message(
             data={} if not data else data,
-            id_=randint(100000, 999999),
+            id_=id_ or self._requests.next_id(),
             async_=async_,
             type_=type_,
         )
         self.logger.debug("message send: %s" % message)
-        return await self._socket.send(message=message)
-
-    async def _send_async(self, type_: str, data: Optional[Dict] = None) -> Any:
-        future = self.loop.create_future()
-        id_ = await self.send(type_, data, True)
-        self._requests[id_] = lambda result: future.set_result(result)
-        return await future
+        try:
+            return await self._socket.send(message=message)
+        except (NetworkFatalError, UnhandledException) as exc:
+            # the connection is reopened when the socket service notices the close
+            if self.options.reconnect and self.is_started:
+                raise ConnectionLostError() from exc
+            raise
+
+    async def _send_async(
+        self, type_: str, data: Optional[Dict] = None, timeout: Optional[float] = None, span: Optional[Span] = None
+    ) -> Any:
+        # the request is registered before sending, so the reply can't arrive before anyone waits for it
+        id_ = self._requests.next_id()
+        future = self._requests.register(id_, timeout)
+        attributes = {"bas.message_id": id_, "bas.message_type": type_}
+        try:
+            with start_span(self._tracer, "bas.send", span, attributes):
+                await self._send(type_, data, True, id_)
+        except BaseException:
+            self._requests.discard(id_)
+            raise
+        with start_span(self._tracer, "bas.wait_reply", span, attributes):
+            return await future
 
     async def start_thread(self, thread_id: int) -> None:
         """Start thread with specified id.
@@ -213,12 +632,28 @@ class BasRemoteClient(AsyncIOEventEmitter):
         """
         return BasThread(self)
 
-    async def close(self) -> None:
-        """Close the client."""
+    async def close(self, stop_engine: bool = False) -> None:
+        """Close the client.
+
+        Args:
+            stop_engine (bool): Stop the engine even if `options.detach_engine` is set. Defaults to False.
+        """
+        if self._supervisor is not None:
+            await self._supervisor.close()
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        if self._thread_pool is not None and self.is_started:
+            await self._thread_pool.close()
         await self._socket.close()
-        await self._engine.close()
+        await self._engine.close(stop_engine)
         self._engine.lock_release()
+        if self._result_cache is not None:
+            await self._result_cache.flush()
         self._is_started = False
+        # functions waiting for a restarted engine wake up and fail, because the client is closed
+        self._resume()
 
 
 __all__ = ["BasRemoteClient"]
@@ -48,16 +48,55 @@ class AlreadyRunningError(BasError):
         super().__init__(self._message)
 
 
+class RequestTimeoutError(BasError):
+    _message = "No reply received from the engine in time."
+
+    def __init__(self):
+        super().__init__(self._message)
+
+
+class QueueFullError(BasError):
+    _message = "Too many tasks are waiting for the engine. Unable to queue a new one."
+
+    def __init__(self):
+        super().__init__(self._message)
+
+
 class FunctionError(BasError):
     def __init__(self, message: str):
         super().__init__(message)
 
 
+class FunctionTimeoutError(BasError):
+    _message = "Function execution exceeded the deadline and was stopped."
+
+    def __init__(self):
+        super().__init__(self._message)
+
+
 class FunctionFatalError(BasError):
     def __init__(self, message: str):
         super().__init__(message)
 
 
+class ConnectionLostError(FunctionFatalError):
+    _message = "Connection to the engine was lost before the reply was received."
+
+    def __init__(self):
+        super().__init__(self._message)
+
+
+class EngineExitedError(BasError):
+    def __init__(self, code: int):
+        super().__init__(f"Engine process exited with code {code}.")
+        self.code = code
+
+
+class DownloadError(BasError):
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
 class NetworkFatalError(BasError):
     _message = "Can not communicate with WebSocket server, connection closed or broken."
 
@@ -95,7 +134,13 @@ __all__ = [
     "AuthenticationError",
     "AlreadyRunningError",
     "FunctionError",
+    "RequestTimeoutError",
+    "QueueFullError",
+    "FunctionTimeoutError",
     "BasError",
     "NetworkFatalError",
+    "DownloadError",
+    "EngineExitedError",
+    "ConnectionLostError",
     "exception_handler",
 ]
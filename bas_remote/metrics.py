@@ -0,0 +1,143 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Default upper bounds of the latency histogram buckets in seconds."""
+
+PREFIX = "bas_remote"
+"""Prefix of the exported metric names."""
+
+
+class Histogram:
+    """Histogram of observed values with fixed bucket bounds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        """Number of values in every bucket, the last one is for values above the largest bound."""
+
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([*self.buckets, float("inf")], self.counts)),
+        }
+
+
+class Metrics:
+    """Counters and histograms of a client, they are collected only when `options.metrics` is set."""
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS):
+        """Create an instance of Metrics class.
+
+        Args:
+            buckets (sequence): Upper bounds of the latency histogram buckets in seconds. Defaults to BUCKETS.
+        """
+        self._buckets = tuple(sorted(buckets))
+        self.durations: Dict[Tuple[str, str], Histogram] = {}
+        """Latency histograms by function name and phase."""
+
+        self.errors: Dict[str, int] = defaultdict(int)
+        """Number of failed functions by exception class."""
+
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.frames_sent = 0
+
+    def observe(self, function_name: str, phase: str, duration: float) -> None:
+        """Record the duration of the function phase: `start_thread`, `run_task`, `stop_thread` or `total`."""
+        histogram = self.durations.get((function_name, phase))
+        if histogram is None:
+            histogram = self.durations[(function_name, phase)] = Histogram(self._buckets)
+        histogram.observe(duration)
+
+    def count_error(self, exc: BaseException) -> None:
+        self.errors[type(exc).__name__] += 1
+
+    def count_sent(self, size: int, messages: int = 1) -> None:
+        """Count the sent frame, it may carry several messages when writes are coalesced."""
+        self.bytes_sent += size
+        self.messages_sent += messages
+        self.frames_sent += 1
+
+    def count_received(self, size: int, messages: int = 1) -> None:
+        self.bytes_received += size
+        self.messages_received += messages
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the collected metrics as a dictionary."""
+        durations: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for (function_name, phase), histogram in self.durations.items():
+            durations[function_name][phase] = histogram.to_dict()
+        return {
+            "durations": dict(durations),
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "messages_sent": self.messages_sent,
+            "messages_received": self.messages_received,
+            "frames_sent": self.frames_sent,
+        }
+
+    def to_prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Format the collected metrics in the Prometheus text exposition format.
+
+        Args:
+            gauges (dict, optional): Current values of gauges exported together with the metrics. Defaults to None.
+        """
+        lines: List[str] = []
+
+        name = f"{PREFIX}_function_duration_seconds"
+        lines.append(f"# HELP {name} Duration of BAS function phases.")
+        lines.append(f"# TYPE {name} histogram")
+        for (function_name, phase), histogram in sorted(self.durations.items()):
+            labels = f'function="{_escape(function_name)}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip([*histogram.buckets, "+Inf"], histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        name = f"{PREFIX}_errors_total"
+        lines.append(f"# HELP {name} Number of failed functions by exception class.")
+        lines.append(f"# TYPE {name} counter")
+        for error, count in sorted(self.errors.items()):
+            lines.append(f'{name}{{error="{_escape(error)}"}} {count}')
+
+        for name, value, description in (
+            ("sent_bytes_total", self.bytes_sent, "Bytes sent to the engine."),
+            ("received_bytes_total", self.bytes_received, "Bytes received from the engine."),
+            ("sent_messages_total", self.messages_sent, "Messages sent to the engine."),
+            ("received_messages_total", self.messages_received, "Messages received from the engine."),
+            ("sent_frames_total", self.frames_sent, "Websocket frames sent to the engine."),
+        ):
+            lines.append(f"# HELP {PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            lines.append(f"{PREFIX}_{name} {value}")
+
+        for name, gauge in (gauges or {}).items():
+            lines.append(f"# TYPE {PREFIX}_{name} gauge")
+            lines.append(f"{PREFIX}_{name} {gauge}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+__all__ = ["Histogram", "Metrics", "BUCKETS"]
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from os import getcwd, path
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -18,6 +19,82 @@ class Options:
     login: str = ""
     """Login from a user account with access to the script."""
 
+    script_properties_ttl: Optional[float] = 3600.0
+    """Seconds for which cached script properties are used without revalidation, None disables the cache."""
+
+    detach_engine: bool = False
+    """Keep the engine running after the client is closed, so the next client of the script attaches to it."""
+
+    request_timeout: Optional[float] = 600.0
+    """Default number of seconds to wait for the reply to an async message, including function runs, so requests
+    that are never answered don't stay pending forever. None means no limit, e.g. for functions that run longer."""
+
+    max_in_flight: int = 0
+    """Maximum number of tasks running on the engine at once, zero means no limit."""
+
+    max_queue_size: int = 1000
+    """Maximum number of tasks waiting for admission when `max_in_flight` is reached, others are rejected."""
+
+    thread_pool_max_size: int = 0
+    """Maximum number of started threads reused by `run_function` calls, zero disables the pool."""
+
+    thread_pool_min_size: int = 0
+    """Number of threads started together with the client and kept alive while it is running."""
+
+    thread_pool_idle_timeout: float = 60.0
+    """Seconds after which an unused pool thread above the minimum size is stopped."""
+
+    reconnect: bool = False
+    """Reopen the connection to the engine when it is broken, functions started with `idempotent=True` are re-run."""
+
+    reconnect_timeout: float = 30.0
+    """Seconds to keep trying to reopen the broken connection."""
+
+    coalesce_writes: bool = False
+    """Send messages queued within one loop iteration as a single websocket frame, instead of a frame per message."""
+
+    coalesce_delay: float = 0.0
+    """Seconds to collect messages before the frame is sent when `coalesce_writes` is set, zero sends it at the end
+    of the current loop iteration."""
+
+    global_variables_ttl: Optional[float] = None
+    """Seconds to keep global variable values in the local cache, None reads them from the engine every time."""
+
+    cache_functions: Optional[Dict[str, float]] = None
+    """Seconds to cache the results by BAS function name, for functions that return the same result for the same
+    arguments. Cached calls don't start a thread in the engine."""
+
+    cache_max_size: int = 1000
+    """Maximum number of function results kept in memory, and in the working folder with `cache_on_disk`."""
+
+    cache_on_disk: bool = False
+    """Also store cached function results in the working folder, so they survive restarts of the client."""
+
+    single_flight_functions: Optional[List[str]] = None
+    """Names of BAS functions whose concurrent calls with the same arguments share one run in the engine, all of
+    them get its result or exception."""
+
+    engine_command: Optional[List[str]] = None
+    """Command that starts a stand-in engine instead of FastExecuteScript.exe, e.g. `fake_engine_command()` from
+    `bas_remote.testing`. The remote control port arguments are appended, script properties are not fetched
+    and the engine is not downloaded."""
+
+    metrics: bool = False
+    """Collect latency histograms and traffic counters, they are available with `client.stats()`."""
+
+    supervise_engine: bool = False
+    """Restart the engine when it crashes, the client keeps running and new tasks wait for the new engine."""
+
+    engine_max_tasks: int = 0
+    """Number of tasks after which the engine is restarted to free its resources, zero means no limit."""
+
+    engine_max_memory: int = 0
+    """Memory in bytes used by the engine after which it is restarted, zero means no limit. Requires psutil, installed
+    with the `supervisor` extra."""
+
+    engine_check_interval: float = 5.0
+    """Seconds between checks of the supervised engine."""
+
     def __post_init__(self):
         if not self.working_dir:
             raise ValueError("Field 'working_dir' must be specified")
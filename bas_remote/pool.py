@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from weakref import WeakSet
+
+from websockets.typing import LoggerLike
+
+from bas_remote.client import BasRemoteClient
+from bas_remote.errors import ClientNotStartedError
+from bas_remote.options import Options
+from bas_remote.runners import BasFunction, BasThread
+from bas_remote.runners.mapper import ParamsIterable, map_ordered, map_unordered
+from bas_remote.tracing import Tracer
+
+
+class BasRemoteClientPool:
+    """Class that spreads BAS function calls across several engine processes."""
+
+    _clients: List[BasRemoteClient]
+    """List of pool clients, each one owns its own engine process."""
+
+    _threads: Dict[BasRemoteClient, WeakSet]
+    """Threads created by the pool, grouped by client."""
+
+    _is_started: bool = False
+
+    logger: LoggerLike
+
+    def __init__(
+        self,
+        options: Options,
+        size: int = 2,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        logger: Optional[LoggerLike] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        """Create an instance of BasRemoteClientPool class.
+
+        Args:
+            options (Options): Remote control options object, shared by all pool clients.
+            size (int): Number of engine processes to start. Defaults to 2.
+            loop (AbstractEventLoop, optional): AsyncIO event loop object. Defaults to None.
+            tracer (Tracer, optional): Tracing hooks shared by all pool clients. Defaults to None (no tracing).
+        """
+        if size < 1:
+            raise ValueError("Pool size must be greater than zero")
+
+        self.loop = loop or asyncio.get_event_loop()
+        self.options = options
+
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.logger = logging.getLogger("[bas-remote:pool]")
+
+        self._clients = [BasRemoteClient(options=options, loop=self.loop, tracer=tracer) for _ in range(size)]
+        self._threads = {client: WeakSet() for client in self._clients}
+
+    @property
+    def is_started(self) -> bool:
+        """Gets a value that indicates whether the current pool is already running."""
+        return self._is_started
+
+    @property
+    def clients(self) -> List[BasRemoteClient]:
+        """Gets the list of pool clients."""
+        return list(self._clients)
+
+    @property
+    def size(self) -> int:
+        """Gets the number of engine processes in the pool."""
+        return len(self._clients)
+
+    async def start(self) -> None:
+        """Start all pool clients and wait for them to initialize."""
+        # the first engine starts alone because it downloads the archive, the others then start together,
+        # each of them locking its own run directory
+        try:
+            await self._clients[0].start()
+            results = await asyncio.gather(*[client.start() for client in self._clients[1:]], return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                raise errors[0]
+        except BaseException:
+            # the engines of the clients that did start are not left running
+            await asyncio.gather(
+                *[client.close() for client in self._clients if client.is_started], return_exceptions=True
+            )
+            raise
+        self._is_started = True
+
+    def _score(self, client: BasRemoteClient) -> int:
+        idle_threads = sum(1 for thread in self._threads[client] if not thread.is_running)
+        return client.load + idle_threads
+
+    def _select(self) -> BasRemoteClient:
+        if not self.is_started:
+            raise ClientNotStartedError()
+        return min(self._clients, key=self._score)
+
+    def run_function(
+        self,
+        function_name: str,
+        function_params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ) -> BasFunction:
+        """Call the BAS function asynchronously on the least loaded engine.
+
+        Args:
+            function_name (str): BAS function name as string.
+            function_params (dict, optional): BAS function arguments list. Defaults to None.
+            priority (int): Task priority in the client scheduler, higher values run first. Defaults to 0.
+            timeout (float, optional): Seconds after which the function is stopped. Defaults to None (no limit).
+            idempotent (bool): Run the function again if the connection is lost while it is running.
+                Defaults to False.
+        """
+        return self._select().run_function(function_name, function_params, priority, timeout, idempotent)
+
+    def map(
+        self, function_name: str, params: ParamsIterable, concurrency: int = 10, ordered: bool = False
+    ) -> AsyncIterator[Tuple[Optional[Dict], Any]]:
+        """Call the BAS function for every arguments list, spreading calls across the pool engines.
+
+        Args:
+            function_name (str): BAS function name as string.
+            params (iterable): Sync or async iterable of BAS function arguments lists, it is read lazily.
+            concurrency (int): Maximum number of calls in flight for the whole pool. Defaults to 10.
+            ordered (bool): Yield results in input order instead of completion order. Defaults to False.
+
+        Returns:
+            AsyncIterator: Pairs of arguments list and function result, or the exception object if the call failed.
+        """
+        if not self.is_started:
+            raise ClientNotStartedError()
+        run = map_ordered if ordered else map_unordered
+        return run(self.run_function, function_name, params, concurrency)
+
+    def create_thread(self) -> BasThread:
+        """Create new BAS thread object on the least loaded engine.
+
+        Returns:
+            BasThread: Thread object.
+        """
+        client = self._select()
+        thread = client.create_thread()
+        self._threads[client].add(thread)
+        return thread
+
+    async def close(self) -> None:
+        """Close all pool clients."""
+        await asyncio.gather(*[client.close() for client in self._clients if client.is_started])
+        self._is_started = False
+
+
+__all__ = ["BasRemoteClientPool"]
@@ -0,0 +1,114 @@
+from asyncio import AbstractEventLoop, Future, TimerHandle
+from typing import Any, Dict, Optional, Tuple
+
+from bas_remote.errors import RequestTimeoutError
+
+MAX_ID = 2**31 - 1
+"""Message ids are kept in the signed 32-bit range and wrap around after it."""
+
+
+class RequestRegistry:
+    """Registry of requests that are waiting for the reply from BAS."""
+
+    _pending: Dict[int, Tuple[Future, Optional[TimerHandle]]]
+    """Pending futures and their expiration timers, by message id."""
+
+    _last_id: int = 0
+
+    def __init__(self, loop: AbstractEventLoop, timeout: Optional[float] = None):
+        """Create an instance of RequestRegistry class.
+
+        Args:
+            loop (AbstractEventLoop): AsyncIO event loop object.
+            timeout (float, optional): Default number of seconds to wait for the reply. Defaults to None (no limit).
+        """
+        self._loop = loop
+        self._timeout = timeout
+        self._pending = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, id_: int) -> bool:
+        return id_ in self._pending
+
+    def next_id(self) -> int:
+        """Get the next message id that is not used by any pending request."""
+        while True:
+            self._last_id = self._last_id % MAX_ID + 1
+            if self._last_id not in self._pending:
+                return self._last_id
+
+    def register(self, id_: int, timeout: Optional[float] = None) -> Future:
+        """Register the request and get the future that is resolved with its reply.
+
+        Args:
+            id_ (int): Message id number.
+            timeout (float, optional): Seconds to wait for the reply. Defaults to the registry timeout.
+
+        Returns:
+            Future: Future resolved with the reply data.
+        """
+        future = self._loop.create_future()
+        timeout = self._timeout if timeout is None else timeout
+        timer = self._loop.call_later(timeout, self._expire, id_) if timeout is not None else None
+
+        self._pending[id_] = (future, timer)
+        future.add_done_callback(lambda _: self.discard(id_, future))
+        return future
+
+    def resolve(self, id_: int, data: Any) -> bool:
+        """Resolve the pending request with the reply data.
+
+        Returns:
+            bool: False if there is no pending request with this id.
+        """
+        future = self._pop(id_)
+        if future is None or future.done():
+            return False
+        future.set_result(data)
+        return True
+
+    def reject(self, id_: int, exc: BaseException) -> bool:
+        """Fail the pending request with the exception.
+
+        Returns:
+            bool: False if there is no pending request with this id.
+        """
+        future = self._pop(id_)
+        if future is None or future.done():
+            return False
+        future.set_exception(exc)
+        return True
+
+    def reject_all(self, exc: BaseException) -> None:
+        """Fail all pending requests with the exception."""
+        for id_ in list(self._pending):
+            self.reject(id_, exc)
+
+    def discard(self, id_: int, future: Optional[Future] = None) -> None:
+        """Remove the request without resolving it, e.g. when the caller doesn't wait for it anymore.
+
+        Args:
+            id_ (int): Message id number.
+            future (Future, optional): Remove the entry only if it still belongs to this future.
+        """
+        entry = self._pending.get(id_)
+        if entry is None or (future is not None and entry[0] is not future):
+            return
+        self._pop(id_)
+
+    def _pop(self, id_: int) -> Optional[Future]:
+        entry = self._pending.pop(id_, None)
+        if entry is None:
+            return None
+        future, timer = entry
+        if timer is not None:
+            timer.cancel()
+        return future
+
+    def _expire(self, id_: int) -> None:
+        self.reject(id_, RequestTimeoutError())
+
+
+__all__ = ["RequestRegistry"]
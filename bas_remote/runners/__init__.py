@@ -1,4 +1,5 @@
 from bas_remote.runners.function import BasFunction
 from bas_remote.runners.thread import BasThread
+from bas_remote.runners.thread_pool import BasThreadPool
 
-__all__ = ["BasFunction", "BasThread"]
+__all__ = ["BasFunction", "BasThread", "BasThreadPool"]
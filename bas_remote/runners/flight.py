@@ -0,0 +1,111 @@
+from asyncio import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from bas_remote.cache import Key, cache_key
+
+
+class Flight:
+    """Run of a BAS function shared by concurrent calls with the same arguments."""
+
+    _futures: List[Future]
+    """Futures of the calls waiting for the run, the first one belongs to the call that runs the function."""
+
+    def __init__(self, registry: "SingleFlight", key: Key, future: Future, abandon: Callable[[], None]):
+        self._registry = registry
+        self._key = key
+        self._futures = [future]
+        self._abandon = abandon
+
+    @property
+    def is_shared(self) -> bool:
+        """Gets a value that indicates whether other calls are still waiting for the run."""
+        return any(not future.done() for future in self._futures[1:])
+
+    def join(self, future: Future) -> None:
+        """Make the call wait for the result of the run."""
+        self._futures.append(future)
+        future.add_done_callback(self._left)
+
+    def resolve(self, result: Any) -> None:
+        """Complete all waiting calls with the result."""
+        for future in self._futures:
+            if not future.done():
+                future.set_result(result)
+        self.close()
+
+    def reject(self, exc: BaseException) -> None:
+        """Fail all waiting calls with the exception."""
+        for future in self._futures:
+            if not future.done():
+                future.set_exception(exc)
+        self.close()
+
+    def _left(self, future: Future) -> None:
+        # the run is stopped when the calling ones are cancelled too
+        if self.is_open and future.cancelled() and all(future.done() for future in self._futures):
+            self.close()
+            self._abandon()
+
+    @property
+    def is_open(self) -> bool:
+        """Gets a value that indicates whether the run is not completed and new calls can join it."""
+        return self._registry._flights.get(self._key) is self
+
+    def close(self) -> None:
+        """Stop accepting new calls, the next identical call starts a new run."""
+        if self.is_open:
+            del self._registry._flights[self._key]
+
+
+class SingleFlight:
+    """Registry of running functions, so concurrent identical calls share one run in the engine."""
+
+    _flights: Dict[Key, Flight]
+    """Running functions by name and arguments."""
+
+    def __init__(self, names: Iterable[str]):
+        """Create an instance of SingleFlight class.
+
+        Args:
+            names (iterable): Names of the functions whose identical calls are shared.
+        """
+        self._names = set(names)
+        self._flights = {}
+        self._started = 0
+        self._joined = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters: running shared functions, `started` runs and `joined` calls that waited for them."""
+        return {"running": len(self._flights), "started": self._started, "joined": self._joined}
+
+    def key(self, name: str, params: Optional[Dict] = None) -> Optional[Key]:
+        """Get the key of the function call, or None if calls of the function are not shared."""
+        return cache_key(name, params) if name in self._names else None
+
+    def join(self, key: Key, future: Future) -> bool:
+        """Make the call wait for the running identical call.
+
+        Returns:
+            bool: False if there is no running identical call.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            return False
+        flight.join(future)
+        self._joined += 1
+        return True
+
+    def start(self, key: Key, future: Future, abandon: Callable[[], None]) -> Flight:
+        """Register the run of the call, identical calls made until it is completed wait for it.
+
+        Args:
+            key (tuple): Key of the call.
+            future (Future): Future of the call.
+            abandon (callable): Function that stops the run when all calls waiting for it are cancelled.
+        """
+        flight = self._flights[key] = Flight(self, key, future, abandon)
+        self._started += 1
+        return flight
+
+
+__all__ = ["Flight", "SingleFlight"]
@@ -1,32 +1,69 @@
 from random import randint
 from typing import Optional, Dict
 
+from bas_remote.errors import FunctionFatalError, FunctionTimeoutError
 from bas_remote.runners.runner import BasRunner
 
 
 class BasFunction(BasRunner):
     """Basic class for interacting with BAS functions."""
 
-    def __init__(self, client, name: str, params: Optional[Dict] = None):
+    _is_stopped: bool = False
+
+    def __init__(
+        self,
+        client,
+        name: str,
+        params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ):
         """Create an instance of BasFunction class.
 
         Args:
             client: Remote client object.
             name (str): BAS function name as string.
             params (dict, optional): BAS function arguments list. Defaults to None.
+            priority (int): Task priority in the client scheduler, higher values run first. Defaults to 0.
+            timeout (float, optional): Seconds after which the function is stopped. Defaults to None (no limit).
+            idempotent (bool): Run the function again if the connection is lost while it is running, instead of
+                failing with `ConnectionLostError`. Defaults to False.
         """
         super().__init__(client)
-        self._run(name, params)
+        self._run(name, params, priority, timeout, idempotent)
 
     async def _run_function(self, name: str, params: Optional[Dict] = None) -> None:
-        self._id = randint(1000000, 9999999)
-        await self._client.start_thread(self.id)
-        await self._run_task(name, params)
-        await self.stop()
+        pool = self._client.thread_pool
+        if pool is None:
+            self._id = randint(1000000, 9999999)
+            with self._phase("start_thread"):
+                await self._client.start_thread(self.id)
+            await self._run_task(name, params)
+            await self.stop()
+            return
+
+        # a pooled thread is usually reused, so this phase is short
+        with self._phase("start_thread"):
+            self._id = await pool.acquire()
+        try:
+            await self._run_task(name, params)
+        finally:
+            # stopped and aborted functions send stop_thread by themselves
+            stopped = self._is_stopped or self._is_aborted
+            pool.release(self.id, discard=stopped or self._is_failed(), stop=not stopped)
+
+    def _is_failed(self) -> bool:
+        """Check if the function failed with an error that could leave its thread broken."""
+        if not self._future.done() or self._future.cancelled():
+            return True
+        return isinstance(self._future.exception(), (FunctionFatalError, FunctionTimeoutError))
 
     async def stop(self) -> None:
         """Immediately stops function execution."""
-        await self._client.stop_thread(self.id)
+        self._is_stopped = True
+        with self._phase("stop_thread"):
+            await self._client.stop_thread(self.id)
 
 
 __all__ = ["BasFunction"]
@@ -0,0 +1,124 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple, Union
+
+Params = Optional[Dict]
+"""BAS function arguments list."""
+
+ParamsIterable = Union[Iterable[Params], AsyncIterable[Params]]
+"""Sync or async iterable of BAS function arguments lists."""
+
+Runner = Callable[[str, Params], Awaitable[Any]]
+"""Callable that starts the BAS function, e.g. `BasRemoteClient.run_function`."""
+
+
+async def _iterate(params: ParamsIterable) -> AsyncIterator[Params]:
+    if hasattr(params, "__aiter__"):
+        async for item in params:  # type: ignore
+            yield item
+    else:
+        for item in params:  # type: ignore
+            yield item
+
+
+def _outcome(future: asyncio.Future) -> Any:
+    """Get the future result, or the exception object if the call failed."""
+    if future.cancelled():
+        return asyncio.CancelledError()
+    return future.exception() or future.result()
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency < 1:
+        raise ValueError("Concurrency must be greater than zero")
+
+
+async def map_unordered(
+    run: Runner, name: str, params: ParamsIterable, concurrency: int
+) -> AsyncIterator[Tuple[Params, Any]]:
+    """Run the BAS function for every arguments list and yield results in completion order.
+
+    Arguments lists are pulled from the iterable lazily, so no more than `concurrency` calls are in flight and
+    no more than `concurrency` results are kept in memory.
+
+    Args:
+        run (Runner): Callable that starts the BAS function.
+        name (str): BAS function name as string.
+        params (iterable): Sync or async iterable of BAS function arguments lists.
+        concurrency (int): Maximum number of calls in flight.
+
+    Yields:
+        tuple: Arguments list and function result, or the exception object if the call failed.
+    """
+    _check_concurrency(concurrency)
+    iterator = _iterate(params).__aiter__()
+    completed: asyncio.Queue = asyncio.Queue()
+    pending: Dict[asyncio.Future, Params] = {}
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                future: asyncio.Future = asyncio.ensure_future(run(name, item))
+                future.add_done_callback(completed.put_nowait)
+                pending[future] = item
+
+            if not pending:
+                return
+
+            future = await completed.get()
+            yield pending.pop(future), _outcome(future)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def map_ordered(
+    run: Runner, name: str, params: ParamsIterable, concurrency: int
+) -> AsyncIterator[Tuple[Params, Any]]:
+    """Run the BAS function for every arguments list and yield results in input order.
+
+    Works like `map_unordered`, but a slow call holds back the results of the calls started after it.
+
+    Args:
+        run (Runner): Callable that starts the BAS function.
+        name (str): BAS function name as string.
+        params (iterable): Sync or async iterable of BAS function arguments lists.
+        concurrency (int): Maximum number of calls in flight.
+
+    Yields:
+        tuple: Arguments list and function result, or the exception object if the call failed.
+    """
+    _check_concurrency(concurrency)
+    iterator = _iterate(params).__aiter__()
+    pending: Deque[Tuple[Params, asyncio.Future]] = deque()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.append((item, asyncio.ensure_future(run(name, item))))
+
+            if not pending:
+                return
+
+            item, future = pending[0]
+            await asyncio.wait([future])
+            pending.popleft()
+            yield item, _outcome(future)
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+__all__ = ["map_unordered", "map_ordered"]
@@ -1,13 +1,17 @@
-import json
 import logging
 from abc import ABC, abstractmethod
-from asyncio import Future, AbstractEventLoop
-from typing import Optional, Dict
+from asyncio import CancelledError, Future, AbstractEventLoop, Task, TimerHandle
+from contextlib import contextmanager
+from typing import Optional, Dict, Iterator
 
 from websockets.typing import LoggerLike
 
-from bas_remote.errors import FunctionError, NetworkFatalError, FunctionFatalError
-from bas_remote.types import Response
+from bas_remote.errors import BasError, FunctionError, NetworkFatalError, FunctionFatalError, RequestTimeoutError
+from bas_remote.errors import FunctionTimeoutError, ConnectionLostError
+from bas_remote.cache import MISSING, Key
+from bas_remote.runners.flight import Flight
+from bas_remote.tracing import NOOP_SPAN, Span, start_span
+from bas_remote.types import Response, codec
 
 
 class BasRunner(ABC):
@@ -16,6 +20,37 @@ class BasRunner(ABC):
     _future: Future = None
 
     _id: int = 0
+
+    _priority: int = 0
+    """Priority of the running task in the client scheduler."""
+
+    _task: Optional[Task] = None
+    """Task that runs the BAS function."""
+
+    _timer: Optional[TimerHandle] = None
+    """Timer that fails the function when its deadline is reached."""
+
+    _is_aborted: bool = False
+    """Is the function cancelled by the caller or by the deadline."""
+
+    _is_idempotent: bool = False
+    """Can the function be run again if the connection is lost while it is running."""
+
+    _name: str = ""
+    """Name of the running BAS function."""
+
+    _started: float = 0.0
+    """Time when the function was called."""
+
+    _span: Span = NOOP_SPAN
+    """Tracing span of the function call, it does nothing until the function is run."""
+
+    _cache_key: Optional[Key] = None
+    """Key of the function result in the client result cache, None if the function is not cached."""
+
+    _flight: Optional[Flight] = None
+    """Run shared with identical concurrent calls, if the function is run by this call."""
+
     logger: LoggerLike
 
     def __init__(self, client, logger: Optional[LoggerLike] = None):
@@ -34,10 +69,160 @@ class BasRunner(ABC):
     def __await__(self):
         return self._future.__await__()
 
-    def _run(self, name: str, params: Optional[Dict] = None):
+    def _run(
+        self,
+        name: str,
+        params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ):
         self._future = self._loop.create_future()
-        task = self._run_function(name, params)
-        self._loop.create_task(task)
+        self._name = name
+        self._started = self._loop.time()
+        self._priority = priority
+        self._is_idempotent = idempotent
+        self._span = self._client._tracer.start_span("bas.run_function")
+        self._span.set_attribute("bas.function", name)
+        self._is_aborted = False
+        self._flight = None
+        self._client._load += 1
+        self._future.add_done_callback(self._on_done)
+        if timeout is not None:
+            self._timer = self._loop.call_later(timeout, self._expire)
+
+        cache = self._client._result_cache
+        self._cache_key = cache.key(name, params) if cache is not None else None
+        if self._cache_key is not None:
+            result = cache.get(self._cache_key)
+            self._span.set_attribute("bas.cache_hit", result is not MISSING)
+            if result is not MISSING:
+                self._future.set_result(result)
+                return
+
+        flights = self._client._single_flight
+        key = flights.key(name, params) if flights is not None else None
+        if key is not None:
+            # an identical call is running, this one waits for its result instead of running the function again
+            is_joined = flights.join(key, self._future)
+            self._span.set_attribute("bas.single_flight_joined", is_joined)
+            if is_joined:
+                return
+            self._flight = flights.start(key, self._future, self._abort)
+
+        task = self._run_active(name, params)
+        self._task = self._loop.create_task(task)
+
+    async def _run_active(self, name: str, params: Optional[Dict] = None) -> None:
+        try:
+            await self._run_attempts(name, params)
+        finally:
+            if self._flight is not None:
+                self._flight.reject(FunctionFatalError("Function is not completed"))
+
+    async def _run_attempts(self, name: str, params: Optional[Dict] = None) -> None:
+        while True:
+            try:
+                # the scheduler slot covers the whole run, so a queued or rejected function doesn't hold a thread
+                async with self._client.scheduler.slot(self._priority):
+                    # waits while the engine is restarted, the client counts running functions to drain the engine
+                    async with self._client._running():
+                        await self._run_function(name, params)
+                return
+            except ConnectionLostError as exc:
+                if not self._is_idempotent or not self._is_awaited():
+                    self._set_exception(exc)
+                    return
+                self.logger.warning(f"connection lost, running function again: {name}")
+                self._client._reconnect_stats["reissued"] += 1
+            except Exception as exc:
+                self.logger.error(exc)
+                self._set_exception(exc if isinstance(exc, BasError) else FunctionFatalError(str(exc)))
+                return
+
+    def _on_done(self, future: Future) -> None:
+        self._client._load -= 1
+        error = CancelledError() if future.cancelled() else future.exception()
+        metrics = self._client._metrics
+        if metrics is not None:
+            self._observe("total", self._started)
+            if error is not None:
+                metrics.count_error(error)
+
+        self._span.set_attribute("bas.thread_id", self.id)
+        if error is not None:
+            self._span.record_exception(error)
+        self._span.end()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # the run continues while identical calls wait for it
+        if future.cancelled() and not self._is_awaited():
+            self._abort()
+
+    def _expire(self) -> None:
+        self._timer = None
+        if not self._future.done():
+            self._set_exception(FunctionTimeoutError())
+            self._abort()
+
+    def _is_awaited(self) -> bool:
+        """Check if the call or identical calls that joined it still wait for the result."""
+        return not self._future.done() or (self._flight is not None and self._flight.is_shared)
+
+    def _abort(self) -> None:
+        """Stop the BAS function that is no longer awaited, so it doesn't keep using the engine thread."""
+        self._is_aborted = True
+        if self._flight is not None:
+            self._flight.close()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        if self.id and self._client.is_started:
+            self._loop.create_task(self._stop_aborted())
+
+    async def _stop_aborted(self) -> None:
+        try:
+            await self.stop()
+        except Exception as exc:
+            self.logger.error(exc)
+
+    @contextmanager
+    def _phase(self, phase: str) -> Iterator[Span]:
+        """Context manager that traces the function phase and records its duration."""
+        started = self._loop.time()
+        try:
+            with start_span(self._client._tracer, f"bas.{phase}", self._span) as span:
+                yield span
+                span.set_attribute("bas.thread_id", self.id)
+        finally:
+            self._observe(phase, started)
+
+    def _observe(self, phase: str, started: float) -> None:
+        """Record the duration of the function phase, if metrics are enabled in the client options."""
+        metrics = self._client._metrics
+        if metrics is not None:
+            metrics.observe(self._name, phase, self._loop.time() - started)
+
+    def _set_result(self, result) -> None:
+        if not self._is_awaited():
+            return
+        if self._flight is not None:
+            self._flight.resolve(result)
+        else:
+            self._future.set_result(result)
+        if self._cache_key is not None:
+            self._client._result_cache.set(self._cache_key, result)
+
+    def _set_exception(self, exception: Exception) -> None:
+        if self._flight is not None:
+            self._flight.reject(exception)
+        elif not self._future.done():
+            self._future.set_exception(exception)
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Immediately stops function execution."""
+        pass
 
     @abstractmethod
     async def _run_function(self, name: str, params: Optional[Dict] = None):
@@ -57,32 +242,44 @@ class BasRunner(ABC):
             params (dict, optional): BAS function arguments list.
         """
         try:
-            result = await self._client.send_async(
-                "run_task",
-                {"params": json.dumps(params if params else {}), "function_name": name, "thread_id": self.id},
-            )
+            with self._phase("run_task") as span:
+                payload = codec.dumps(params if params else {})
+                span.set_attribute("bas.payload_size", len(payload))
+                result = await self._client.send_async(
+                    "run_task",
+                    {"params": payload, "function_name": name, "thread_id": self.id},
+                    span=span,
+                )
+        except ConnectionLostError:
+            # handled by the caller, which runs idempotent functions again
+            raise
+        except RequestTimeoutError as exc:
+            self.logger.error(exc)
+            self._set_exception(exc)
+            return
         except NetworkFatalError as exc:
             self.logger.error(exc)
             exception = FunctionFatalError(str(exc))
-            self._future.set_exception(exception)
+            self._set_exception(exception)
             return
         except Exception as exc:
             self.logger.error(exc)
             exception = FunctionFatalError(str(exc))
-            self._future.set_exception(exception)
+            self._set_exception(exception)
             return
 
-        response = Response.from_json(result)  # type: ignore
+        with start_span(self._client._tracer, "bas.decode", self._span, {"bas.payload_size": len(result)}):
+            response = Response.from_json(result)
         if not response.success:
-            m = response.message
+            m = response.message or ""
             if m.startswith("FunctionFatalError:"):
                 m = m.lstrip("FunctionFatalError:").strip()
                 exception = FunctionFatalError(m)
             else:
                 exception = FunctionError(m)
-            self._future.set_exception(exception)
+            self._set_exception(exception)
         else:
-            self._future.set_result(response.result)
+            self._set_result(response.result)
 
     @property
     def id(self) -> int:
@@ -10,6 +10,9 @@ class BasThread(BasRunner):
 
     _is_running: bool = False
 
+    _generation: int = 0
+    """Engine generation in which the thread has been started."""
+
     def __init__(self, client):
         """Create an instance of BasThread class.
 
@@ -18,14 +21,26 @@ class BasThread(BasRunner):
         """
         super().__init__(client)
 
-    def run_function(self, name: str, params: Optional[Dict] = None):
+    def run_function(
+        self,
+        name: str,
+        params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ):
         """Call the BAS function asynchronously.
 
         Args:
             name (str): BAS function name as string.
             params (dict, optional): BAS function arguments list. Defaults to None.
+            priority (int): Task priority in the client scheduler, higher values run first. Defaults to 0.
+            timeout (float, optional): Seconds after which the function and the thread are stopped.
+                Defaults to None (no limit).
+            idempotent (bool): Run the function again in a new thread if the connection is lost while it is running,
+                instead of failing with `ConnectionLostError`. Defaults to False.
         """
-        self._run(name, params)
+        self._run(name, params, priority, timeout, idempotent)
         return self
 
     async def _run_function(self, name: str, params: Optional[Dict] = None) -> None:
@@ -33,20 +48,26 @@ class BasThread(BasRunner):
         await self.start()
 
         self._is_running = True
-        await self._run_task(name, params)
-        self._is_running = False
+        try:
+            await self._run_task(name, params)
+        finally:
+            self._is_running = False
 
     async def start(self) -> None:
         if self.id and self.is_running:
             raise AlreadyRunningError()
-        if not self.id:
+        # a thread started by a previous engine is gone after the engine is restarted
+        if not self.id or self._generation != self._client._generation:
             self._id = randint(1000000, 9999999)
-            await self._client.start_thread(self.id)
+            self._generation = self._client._generation
+            with self._phase("start_thread"):
+                await self._client.start_thread(self.id)
 
     async def stop(self) -> None:
         """Immediately stops thread execution."""
         if self.id:
-            await self._client.stop_thread(self.id)
+            with self._phase("stop_thread"):
+                await self._client.stop_thread(self.id)
 
         self._is_running = False
         self._id = 0
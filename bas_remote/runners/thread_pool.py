@@ -0,0 +1,232 @@
+import asyncio
+import logging
+from asyncio import AbstractEventLoop, Future, TimerHandle
+from collections import deque
+from random import randint
+from typing import Deque, Optional, Set, Tuple
+
+from websockets.typing import LoggerLike
+
+from bas_remote.errors import FunctionFatalError
+
+
+class BasThreadPool:
+    """Pool of started BAS threads that are reused by one-shot function calls."""
+
+    _loop: AbstractEventLoop
+
+    _idle: Deque[Tuple[int, float]]
+    """Started threads that are not leased, with the time they were released."""
+
+    _leased: Set[int]
+    """Threads that are currently leased by function calls."""
+
+    _waiters: Deque[Future]
+    """Callers that wait for a free thread, in arrival order."""
+
+    _timer: Optional[TimerHandle] = None
+
+    _is_closed: bool = False
+
+    logger: LoggerLike
+
+    def __init__(
+        self,
+        client,
+        min_size: int = 0,
+        max_size: int = 1,
+        idle_timeout: float = 60.0,
+        logger: Optional[LoggerLike] = None,
+    ):
+        """Create an instance of BasThreadPool class.
+
+        Args:
+            client: Remote client object.
+            min_size (int): Number of threads that are started with the client and never evicted. Defaults to 0.
+            max_size (int): Maximum number of started threads. Defaults to 1.
+            idle_timeout (float): Seconds after which an unused thread above `min_size` is stopped. Defaults to 60.
+        """
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Thread pool size must satisfy 0 <= min_size <= max_size and max_size > 0")
+
+        self._loop = client.loop
+        self._client = client
+        self._min_size = min_size
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+
+        self._idle = deque()
+        self._leased = set()
+        self._waiters = deque()
+
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.logger = logging.getLogger("[bas-remote:thread-pool]")
+
+    @property
+    def size(self) -> int:
+        """Gets the number of started threads, both idle and leased."""
+        return len(self._idle) + len(self._leased)
+
+    @property
+    def idle(self) -> int:
+        """Gets the number of started threads that are waiting for a call."""
+        return len(self._idle)
+
+    def _new_id(self) -> int:
+        while True:
+            thread_id = randint(1000000, 9999999)
+            if thread_id not in self._leased and all(thread_id != idle_id for idle_id, _ in self._idle):
+                return thread_id
+
+    async def start(self) -> None:
+        """Start `min_size` threads, so the first calls don't have to wait for them."""
+        self._is_closed = False
+        while self.size < self._min_size:
+            thread_id = self._new_id()
+            self._idle.append((thread_id, self._loop.time()))
+            await self._client.start_thread(thread_id)
+
+    async def acquire(self) -> int:
+        """Lease a started thread, starting a new one if the pool is not full.
+
+        Returns:
+            int: Thread identifier.
+        """
+        if self._idle:
+            # the most recently used thread goes first, so the rest can expire
+            thread_id, _ = self._idle.pop()
+            self._leased.add(thread_id)
+            return thread_id
+
+        if self.size < self._max_size:
+            thread_id = self._new_id()
+            self._leased.add(thread_id)
+            try:
+                await self._client.start_thread(thread_id)
+            except BaseException:
+                self._leased.discard(thread_id)
+                raise
+            return thread_id
+
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(waiter.result())
+            raise
+
+    def release(self, thread_id: int, discard: bool = False, stop: bool = True) -> None:
+        """Give the leased thread back to the pool.
+
+        Args:
+            thread_id (int): Thread identifier.
+            discard (bool): Remove the thread instead of reusing it, e.g. after a fatal error. Defaults to False.
+            stop (bool): Send `stop_thread` for the removed thread, unless the caller has done it. Defaults to True.
+        """
+        if thread_id not in self._leased:
+            return
+
+        if discard or self._is_closed:
+            self._leased.discard(thread_id)
+            if stop:
+                self._stop_thread(thread_id)
+            self._wake_waiter()
+            return
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(thread_id)
+                return
+
+        self._leased.discard(thread_id)
+        self._idle.append((thread_id, self._loop.time()))
+        self._schedule_eviction()
+
+    def _wake_waiter(self) -> None:
+        """Let the first waiter start its own thread, because a pool slot has been freed."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            thread_id = self._new_id()
+            self._leased.add(thread_id)
+            self._loop.create_task(self._start_for(waiter, thread_id))
+            return
+
+    async def _start_for(self, waiter: Future, thread_id: int) -> None:
+        try:
+            await self._client.start_thread(thread_id)
+        except Exception as exc:
+            self._leased.discard(thread_id)
+            if not waiter.done():
+                waiter.set_exception(exc)
+            return
+        if waiter.done():
+            self.release(thread_id)
+        else:
+            waiter.set_result(thread_id)
+
+    def _schedule_eviction(self) -> None:
+        if self._timer is None and self.size > self._min_size:
+            self._timer = self._loop.call_later(self._idle_timeout, self._evict)
+
+    def _evict(self) -> None:
+        self._timer = None
+        deadline = self._loop.time() - self._idle_timeout
+
+        # idle threads are ordered by release time, so the oldest ones are on the left
+        while self._idle and self.size > self._min_size and self._idle[0][1] <= deadline:
+            thread_id, _ = self._idle.popleft()
+            self.logger.debug(f"evict idle thread: {thread_id}")
+            self._stop_thread(thread_id)
+
+        if self._idle and self.size > self._min_size:
+            delay = self._idle[0][1] + self._idle_timeout - self._loop.time()
+            self._timer = self._loop.call_later(max(delay, 0), self._evict)
+
+    def _stop_thread(self, thread_id: int) -> None:
+        if self._client.is_started:
+            self._loop.create_task(self._stop(thread_id))
+
+    async def _stop(self, thread_id: int) -> None:
+        try:
+            await self._client.stop_thread(thread_id)
+        except Exception as exc:
+            self.logger.error(exc)
+
+    def reset(self) -> None:
+        """Forget all threads, because the engine that has run them is gone."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_exception(FunctionFatalError("Engine is restarted"))
+        self._waiters.clear()
+        self._idle.clear()
+        self._leased.clear()
+
+    async def close(self) -> None:
+        """Stop all idle threads, leased threads are stopped when they are released."""
+        self._is_closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.cancel()
+        self._waiters.clear()
+
+        idle, self._idle = self._idle, deque()
+        for thread_id, _ in idle:
+            await self._client.stop_thread(thread_id)
+
+
+__all__ = ["BasThreadPool"]
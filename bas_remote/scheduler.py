@@ -0,0 +1,130 @@
+import heapq
+from asyncio import AbstractEventLoop, CancelledError, Future
+from contextlib import asynccontextmanager
+from itertools import count
+from typing import AsyncIterator, Dict, List, Tuple
+
+from bas_remote.errors import QueueFullError
+
+
+class Scheduler:
+    """Admission control that limits the number of tasks running on the engine at once.
+
+    Tasks above the limit wait in a bounded queue, higher priority tasks are admitted first and tasks with the same
+    priority are admitted in arrival order. When the queue is full, new tasks are rejected right away.
+    """
+
+    _queue: List[Tuple[int, int, Future]]
+    """Heap of waiting tasks: negated priority, arrival number and the future resolved on admission."""
+
+    _in_flight: int = 0
+
+    _waiting: int = 0
+
+    def __init__(self, loop: AbstractEventLoop, max_in_flight: int = 0, max_queue_size: int = 0):
+        """Create an instance of Scheduler class.
+
+        Args:
+            loop (AbstractEventLoop): AsyncIO event loop object.
+            max_in_flight (int): Maximum number of running tasks, zero means no limit. Defaults to 0.
+            max_queue_size (int): Maximum number of waiting tasks. Defaults to 0.
+        """
+        self._loop = loop
+        self._max_in_flight = max_in_flight
+        self._max_queue_size = max_queue_size
+        self._queue = []
+        self._counter = count()
+
+        self._wait_count = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Gets the number of running tasks."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Gets the number of tasks waiting for admission."""
+        return self._waiting
+
+    def stats(self) -> Dict[str, float]:
+        """Get the scheduler counters.
+
+        Returns:
+            dict: Running and waiting tasks, number of rejected tasks and the time spent in the queue.
+        """
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": self._waiting,
+            "rejected": self._rejected,
+            "wait_count": self._wait_count,
+            "wait_time_total": self._wait_time_total,
+            "wait_time_max": self._wait_time_max,
+        }
+
+    async def acquire(self, priority: int = 0) -> None:
+        """Wait until the task may be sent to the engine.
+
+        Args:
+            priority (int): Task priority, higher values are admitted first. Defaults to 0.
+
+        Raises:
+            QueueFullError: The in-flight limit is reached and the wait queue is full.
+        """
+        if not self._max_in_flight or (self._in_flight < self._max_in_flight and not self._waiting):
+            self._in_flight += 1
+            return
+
+        if self._waiting >= self._max_queue_size:
+            self._rejected += 1
+            raise QueueFullError()
+
+        future = self._loop.create_future()
+        heapq.heappush(self._queue, (-priority, next(self._counter), future))
+        self._waiting += 1
+        started = self._loop.time()
+
+        try:
+            await future
+        except CancelledError:
+            if future.cancelled():
+                self._waiting -= 1
+            else:
+                # the slot was handed over at the same moment, so give it to the next task
+                self.release()
+            raise
+
+        waited = self._loop.time() - started
+        self._wait_count += 1
+        self._wait_time_total += waited
+        self._wait_time_max = max(self._wait_time_max, waited)
+
+    def release(self) -> None:
+        """Free the slot taken by `acquire`, passing it to the next waiting task if there is one."""
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._waiting -= 1
+            future.set_result(None)
+            return
+        self._in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 0) -> AsyncIterator[None]:
+        """Context manager that holds the scheduler slot while the task is running.
+
+        Args:
+            priority (int): Task priority, higher values are admitted first. Defaults to 0.
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+__all__ = ["Scheduler"]
@@ -1,4 +1,5 @@
+from bas_remote.services.decoder import MessageDecoder
 from bas_remote.services.engine_service import EngineService
 from bas_remote.services.socket_service import SocketService
 
-__all__ = ["EngineService", "SocketService"]
+__all__ = ["EngineService", "MessageDecoder", "SocketService"]
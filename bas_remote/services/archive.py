@@ -0,0 +1,102 @@
+import asyncio
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from os import cpu_count, getpid, makedirs, path, replace, stat
+from shutil import rmtree
+from threading import Event
+from typing import List
+from zipfile import BadZipFile, ZipFile, ZipInfo
+
+EXTRACT_WORKERS = min(4, cpu_count() or 1)
+"""Default number of threads that extract the engine archive."""
+
+
+def _split_members(members: List[ZipInfo], count: int) -> List[List[ZipInfo]]:
+    """Split archive members into groups of roughly equal uncompressed size, largest members first."""
+    groups: List[List[ZipInfo]] = [[] for _ in range(count)]
+    sizes = [0] * count
+    for member in sorted(members, key=lambda info: info.file_size, reverse=True):
+        index = sizes.index(min(sizes))
+        groups[index].append(member)
+        sizes[index] += member.file_size
+    return [group for group in groups if group]
+
+
+def _create_directories(members: List[ZipInfo], target_dir: str) -> None:
+    """Create the directories of all members up front, so the workers don't race to create the same one."""
+    for member in members:
+        # same sanitizing as ZipFile.extract, unsafe path components are dropped
+        parts = [part for part in member.filename.split("/") if part not in ("", ".", "..")]
+        makedirs(path.join(target_dir, *parts[:-1]), exist_ok=True)
+
+
+def _extract_members(zip_path: str, members: List[ZipInfo], target_dir: str, cancelled: Event) -> None:
+    """Extract the members with a separate archive handle, so the workers don't share the file position."""
+    with ZipFile(zip_path, "r") as file:
+        for member in members:
+            if cancelled.is_set():
+                return
+            # the CRC of every member is checked while it is read, a damaged one raises BadZipFile
+            extracted = file.extract(member, target_dir)
+            if not member.is_dir() and stat(extracted).st_size != member.file_size:
+                raise BadZipFile(f"Extracted size mismatch: {member.filename}")
+
+
+def _extract_archive(zip_path: str, target_dir: str, workers: int, cancelled: Event) -> None:
+    """Extract the archive into a staging directory and move it to the target one, it blocks until all workers stop."""
+    staging_dir = f"{target_dir}.{getpid()}.partial"
+    rmtree(staging_dir, ignore_errors=True)
+    try:
+        with ZipFile(zip_path, "r") as file:
+            members = file.infolist()
+        _create_directories(members, staging_dir)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bas-remote-extract") as executor:
+            futures = [
+                executor.submit(_extract_members, zip_path, group, staging_dir, cancelled)
+                for group in _split_members(members, workers)
+            ]
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    # the other workers stop after their current member
+                    cancelled.set()
+        for future in futures:
+            future.result()
+        if cancelled.is_set():
+            raise CancelledError()
+    except BaseException:
+        rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    if path.exists(target_dir):
+        rmtree(target_dir)
+    replace(staging_dir, target_dir)
+
+
+async def extract_archive(zip_path: str, target_dir: str, workers: int = EXTRACT_WORKERS) -> None:
+    """Extract the archive in a thread pool and atomically move the result to the target directory.
+
+    Members are extracted into a staging directory next to the target one, the target directory is replaced only
+    when every member is extracted and verified, so an interrupted extraction never leaves a broken engine behind.
+    All file operations run in the default executor of the loop. When the call is cancelled, it waits until the
+    workers stop and the staging directory is removed.
+
+    Args:
+        zip_path (str): Location of the archive file.
+        target_dir (str): Location of the directory with extracted files.
+        workers (int): Maximum number of extracting threads. Defaults to EXTRACT_WORKERS.
+    """
+    loop = asyncio.get_event_loop()
+    cancelled = Event()
+    future = loop.run_in_executor(None, _extract_archive, zip_path, target_dir, max(workers, 1), cancelled)
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancelled.set()
+        try:
+            await future
+        except BaseException:
+            pass
+        raise
+
+
+__all__ = ["extract_archive", "EXTRACT_WORKERS"]
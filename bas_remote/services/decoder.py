@@ -0,0 +1,90 @@
+from typing import List
+
+SEPARATOR = "---Message--End---"
+
+
+class MessageDecoder:
+    """Incremental decoder that splits the websocket stream into complete messages.
+
+    Incoming frames are kept as a list of chunks and only the newly arrived data is scanned for the separator,
+    so a message spread over many frames is joined only once.
+    """
+
+    _chunks: List[str]
+    """Frames of the message that is not complete yet."""
+
+    _tail: str = ""
+    """Last characters of the buffered data, used to find a separator split between two frames."""
+
+    def __init__(self, separator: str = SEPARATOR):
+        """Create an instance of MessageDecoder class.
+
+        Args:
+            separator (str): String that ends every message. Defaults to SEPARATOR.
+        """
+        self._separator = separator
+        self._chunks = []
+
+    @property
+    def pending(self) -> int:
+        """Gets the length of buffered data that doesn't form a complete message yet."""
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def feed(self, data: str) -> List[str]:
+        """Add the received frame and return all messages completed by it.
+
+        Args:
+            data (str): Received websocket frame.
+
+        Returns:
+            list: Complete messages without separators, empty messages are skipped.
+        """
+        separator = self._separator
+        messages: List[str] = []
+        start = 0
+
+        if self._chunks:
+            # the separator can start in the buffered data and end in the new frame
+            probe = self._tail + data[: len(separator) - 1]
+            index = probe.find(separator)
+            if index != -1:
+                cut = len(self._tail) - index
+                buffered = "".join(self._chunks)
+                self._append(messages, buffered[: len(buffered) - cut])
+                self._chunks = []
+                self._tail = ""
+                start = len(separator) - cut
+
+        while True:
+            index = data.find(separator, start)
+            if index == -1:
+                break
+            if self._chunks:
+                self._chunks.append(data[start:index])
+                self._append(messages, "".join(self._chunks))
+                self._chunks = []
+                self._tail = ""
+            else:
+                self._append(messages, data[start:index])
+            start = index + len(separator)
+
+        rest = data[start:] if start else data
+        if rest:
+            self._chunks.append(rest)
+            keep = len(separator) - 1
+            self._tail = (self._tail + rest)[-keep:]
+
+        return messages
+
+    @staticmethod
+    def _append(messages: List[str], message: str) -> None:
+        if message:
+            messages.append(message)
+
+    def reset(self) -> None:
+        """Drop all buffered data."""
+        self._chunks = []
+        self._tail = ""
+
+
+__all__ = ["MessageDecoder", "SEPARATOR"]
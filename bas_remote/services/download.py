@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+from glob import escape, glob
+from os import path, remove, replace
+from shutil import copyfileobj
+from typing import Callable, List, Optional, Tuple
+
+import aiofiles
+from aiohttp import ClientError, ClientSession
+from filelock import FileLock, Timeout
+
+from bas_remote.errors import DownloadError
+
+CHUNK_SIZE = 1024 * 1024
+"""Size of the buffer used to read the response body."""
+
+CONNECTIONS = 4
+"""Default number of parallel range requests."""
+
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+"""Files smaller than this are not split into several range requests."""
+
+LOCK_POLL_INTERVAL = 0.5
+"""Seconds between attempts to take the download lock held by another process."""
+
+
+def _segments(size: int, connections: int) -> List[Tuple[int, int]]:
+    """Split the file into inclusive byte ranges, one for every connection."""
+    count = max(1, min(connections, size // MIN_SEGMENT_SIZE))
+    step = -(-size // count)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def _part_path(file_path: str, start: int, end: int) -> str:
+    # segment bounds are part of the name, so a partial file is resumed only with the same segmentation
+    return f"{file_path}.part-{start}-{end}"
+
+
+def _file_size(file_path: str) -> int:
+    return path.getsize(file_path) if path.exists(file_path) else 0
+
+
+async def _head(session: ClientSession, url: str) -> Tuple[Optional[int], bool, str]:
+    """Get the file size, whether range requests are supported and the URL after redirects.
+
+    Servers that reject HEAD requests give no size and no ranges, so the file is downloaded with a plain GET.
+    """
+    try:
+        async with session.head(url, allow_redirects=True) as response:
+            if response.status >= 400:
+                return None, False, url
+            ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return response.content_length, ranges, str(response.url)
+    except ClientError:
+        return None, False, url
+
+
+async def _download_segment(session: ClientSession, url: str, file_path: str, start: int, end: int) -> bool:
+    """Download the missing bytes of the segment, False if the server ignores the range."""
+    part_path = _part_path(file_path, start, end)
+    offset = start + _file_size(part_path)
+    if offset > end + 1:
+        # a part longer than its range is damaged, so the range is downloaded again
+        remove(part_path)
+        offset = start
+    if offset > end:
+        return True
+
+    async with session.get(url, headers={"Range": f"bytes={offset}-{end}"}) as response:
+        response.raise_for_status()
+        if response.status != 206:
+            return False
+        async with aiofiles.open(part_path, "ab") as file:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await file.write(chunk)
+    return True
+
+
+async def _download_segments(session: ClientSession, url: str, file_path: str, segments: List[Tuple[int, int]]) -> bool:
+    """Download the segments in parallel, False if the server ignores the ranges."""
+    tasks = [asyncio.ensure_future(_download_segment(session, url, file_path, start, end)) for start, end in segments]
+    try:
+        return all(await asyncio.gather(*tasks))
+    except BaseException:
+        # the other segments stop writing, the bytes they have downloaded are resumed by the next attempt
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _download_stream(session: ClientSession, url: str, part_path: str) -> None:
+    async with session.get(url) as response:
+        response.raise_for_status()
+        async with aiofiles.open(part_path, "wb") as file:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                await file.write(chunk)
+
+
+def _join_segments(file_path: str, segments: List[Tuple[int, int]], part_path: str) -> None:
+    with open(part_path, "wb") as target:
+        for start, end in segments:
+            segment_path = _part_path(file_path, start, end)
+            if _file_size(segment_path) != end - start + 1:
+                raise DownloadError(f"Segment {start}-{end} is incomplete")
+            with open(segment_path, "rb") as source:
+                copyfileobj(source, target, CHUNK_SIZE)
+
+
+def _verify(part_path: str, size: Optional[int], sha256: Optional[str], verify: Optional[Callable[[str], bool]]):
+    if size is not None and _file_size(part_path) != size:
+        raise DownloadError(f"Size mismatch: expected {size}, got {_file_size(part_path)}")
+
+    if sha256 is not None:
+        digest = hashlib.sha256()
+        with open(part_path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        if digest.hexdigest().lower() != sha256.lower():
+            raise DownloadError("Checksum mismatch")
+
+    if verify is not None and not verify(part_path):
+        raise DownloadError("Downloaded file is damaged")
+
+
+def _remove_parts(file_path: str, keep: Tuple[str, ...] = ()) -> None:
+    for part_path in glob(f"{escape(file_path)}.part*"):
+        if part_path in keep:
+            continue
+        try:
+            remove(part_path)
+        except OSError:
+            pass
+
+
+async def download_file(
+    session: ClientSession,
+    url: str,
+    file_path: str,
+    connections: int = CONNECTIONS,
+    sha256: Optional[str] = None,
+    verify: Optional[Callable[[str], bool]] = None,
+) -> None:
+    """Download the file with parallel range requests and move it to the target location when it is verified.
+
+    Partially downloaded ranges are kept next to the target file and resumed by the next call. The download is
+    guarded by a file lock, so several processes that need the same file download it only once.
+
+    Args:
+        session (ClientSession): HTTP client session.
+        url (str): File URL.
+        file_path (str): Location of the downloaded file.
+        connections (int): Maximum number of parallel range requests. Defaults to CONNECTIONS.
+        sha256 (str, optional): Expected SHA-256 hex digest of the file. Defaults to None.
+        verify (callable, optional): Function that checks the downloaded file before it is moved. Defaults to None.
+    """
+    loop = asyncio.get_event_loop()
+    lock = FileLock(f"{file_path}.lock")
+    while True:
+        try:
+            lock.acquire(timeout=0)
+            break
+        except Timeout:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+
+    try:
+        if path.exists(file_path):
+            return
+
+        size, ranges, url = await _head(session, url)
+        part_path = f"{file_path}.part"
+        segments = _segments(size, connections) if size and ranges else []
+        # parts of another segmentation, e.g. when the remote file has changed, are never resumed
+        _remove_parts(file_path, tuple(_part_path(file_path, start, end) for start, end in segments))
+
+        try:
+            if segments and await _download_segments(session, url, file_path, segments):
+                await loop.run_in_executor(None, _join_segments, file_path, segments, part_path)
+            else:
+                # servers that advertise ranges but ignore them send the whole file
+                await _download_stream(session, url, part_path)
+            await loop.run_in_executor(None, _verify, part_path, size, sha256, verify)
+        except DownloadError:
+            # the parts failed the checks and can't be trusted anymore, so the next attempt starts from scratch;
+            # after network errors they are kept and resumed
+            _remove_parts(file_path)
+            raise
+
+        replace(part_path, file_path)
+        _remove_parts(file_path)
+    finally:
+        lock.release()
+
+
+__all__ = ["download_file"]
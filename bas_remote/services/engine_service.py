@@ -1,18 +1,22 @@
 import asyncio
 import logging
 import subprocess
-from os import listdir, makedirs, path
+import sys
+from os import listdir, makedirs, path, remove
 from platform import machine
 from shutil import rmtree
-from typing import Optional
-from zipfile import ZipFile
+from typing import List, Optional
+from zipfile import is_zipfile
 
-from aiofiles import open
 from aiohttp import ClientSession
 from filelock import FileLock, Timeout, BaseFileLock
 from websockets.typing import LoggerLike
 
-from bas_remote.errors import ScriptNotExistError, ScriptNotSupportedError
+from bas_remote.errors import ScriptNotExistError, ScriptNotSupportedError, EngineExitedError
+from bas_remote.services.archive import extract_archive
+from bas_remote.services.download import download_file
+from bas_remote.services.engine_state import EngineState
+from bas_remote.services.script_cache import CachedScript, ScriptCache
 from bas_remote.task import TaskCreator
 from bas_remote.types import Script
 
@@ -28,11 +32,20 @@ class EngineService:
     _zip_dir: str = None
     """The path to the directory in which the archive file of the engine is located."""
 
+    _exe_name: str = ""
+    """The base name of the run directory that belongs to the current script hash."""
+
     logger: LoggerLike
     _lock: Optional[BaseFileLock] = None
 
     _task_creator: TaskCreator
 
+    _revalidate_task: Optional[asyncio.Task] = None
+    """Background task that revalidates stale cached script properties."""
+
+    _state: Optional[EngineState] = None
+    """State of the detached engine used by the service."""
+
     def __init__(self, client, logger: Optional[LoggerLike] = None):
         """Create an instance of EngineService class."""
         script_name = client.options.script_name
@@ -42,8 +55,12 @@ class EngineService:
         self._script_dir = path.join(working_dir, "run", script_name)
         self._engine_dir = path.join(working_dir, "engine")
         self._script_name = script_name
+        self._cache = ScriptCache(path.join(self._script_dir, "properties.json"))
+        self._cache_ttl = client.options.script_properties_ttl
+        self._detach = client.options.detach_engine
+        self._engine_command = client.options.engine_command
 
-        self._process = None
+        self._process: Optional[subprocess.Popen] = None
 
         if logger is not None:
             self.logger = logger
@@ -59,6 +76,11 @@ class EngineService:
             port (int):
                 Selected port number.
         """
+        if self._engine_command is not None:
+            self._acquire_run_directory()
+            makedirs(self._exe_dir, exist_ok=True)
+            self._start_engine_process(port)
+            return
 
         arch = 64 if machine().endswith("64") else 32
         zip_name = f"FastExecuteScriptProtected.x{arch}"
@@ -68,23 +90,59 @@ class EngineService:
 
         self.logger.debug(f"start at port :{port}, arch:{arch}, zip_name:{zip_name}, url_name:{url_name}")
 
-        if not path.exists(self._zip_dir):
-            makedirs(self._zip_dir)
+        if not path.exists(zip_path):
+            makedirs(self._zip_dir, exist_ok=True)
             await self._download_executable(zip_path, zip_name, url_name)
 
-        if not path.exists(self._exe_dir):
-            makedirs(self._exe_dir)
+        self._acquire_run_directory()
+
+        if not path.exists(path.join(self._exe_dir, "FastExecuteScript.exe")):
             await self._extract_executable(zip_path)
 
         self._start_engine_process(port)
-        self._clear_run_directory()
+        await self._clear_run_directory()
+
+    async def attach(self) -> Optional[int]:
+        """Lock the run directory of a detached engine that is still running.
+
+        Returns:
+            int: Remote control port of the engine, or None if there is no engine to attach to.
+        """
+        index = 0
+        while True:
+            name = self._exe_name if index == 0 else f"{self._exe_name}_{index}"
+            exe_dir = path.join(self._script_dir, name)
+            if not path.exists(exe_dir):
+                return None
+            index += 1
+
+            # a locked directory belongs to an engine used by another client
+            if not self.lock_acquire(exe_dir):
+                continue
+
+            state = EngineState.load(exe_dir)
+            if state is not None and await state.is_alive():
+                self.logger.debug(f"attach to engine: pid={state.pid}, port={state.port}")
+                self._exe_dir = exe_dir
+                self._state = state
+                return state.port
+
+            self.lock_release()
 
     async def initialize(self):
-        url = f"{END_POINT}/scripts/{self._script_name}/properties"
+        if self._engine_command is not None:
+            # a stand-in engine doesn't need the script properties, its run directories are kept apart
+            self._exe_name = "local"
+            return
 
-        async with ClientSession(loop=self._loop) as session:
-            async with session.get(url) as response:
-                script = Script(await response.json())
+        cached = self._cache.load() if self._cache_ttl is not None else None
+
+        if cached is None:
+            script = await self._fetch_script()
+        else:
+            script = Script(cached.data)
+            if not cached.is_fresh(self._cache_ttl):
+                self._revalidate_task = self._loop.create_task(self._revalidate_script(cached))
 
         if not script.is_exist:
             raise ScriptNotExistError()
@@ -93,68 +151,185 @@ class EngineService:
             raise ScriptNotSupportedError()
 
         self._zip_dir = path.join(self._engine_dir, script.engine_version)
-        self._exe_dir = path.join(self._script_dir, script.hash[0:5])
+        self._exe_name = script.hash[0:5]
+
+    async def _fetch_script(self, cached: Optional[CachedScript] = None) -> Script:
+        """Get script properties from the server, revalidating the cached ones if they are given."""
+        url = f"{END_POINT}/scripts/{self._script_name}/properties"
+        headers = cached.headers if cached else {}
+
+        async with ClientSession(loop=self._loop) as session:
+            async with session.get(url, headers=headers) as response:
+                if cached and response.status == 304:
+                    self._cache.touch(cached)
+                    return Script(cached.data)
+                data = await response.json()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+        script = Script(data)
+        if self._cache_ttl is not None and script.is_exist and script.is_supported:
+            self._cache.save(data, etag, last_modified)
+        return script
+
+    async def _revalidate_script(self, cached: CachedScript) -> None:
+        try:
+            await self._fetch_script(cached)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.logger.warning(f"can not revalidate script properties: {exc}")
 
     async def _download_executable(self, zip_path: str, zip_name: str, url_name: str) -> None:
         url = f"{END_POINT}/distr/{url_name}/{path.basename(self._zip_dir)}/{zip_name}.zip"
         self.logger.debug(f"download executable: {url}")
 
         async with ClientSession(loop=self._loop) as session:
-            async with session.get(url) as response:
-                async with open(zip_path, "wb") as file:
-                    while True:
-                        chunk = await response.content.read(1024 * 16)
-                        if not chunk:
-                            break
-                        await file.write(chunk)
-                    return await response.release()
+            await download_file(session, url, zip_path, verify=is_zipfile)
 
     async def _extract_executable(self, zip_path: str) -> None:
         self.logger.debug(f"extract executable: {zip_path}")
+        await extract_archive(zip_path, self._exe_dir)
 
-        with ZipFile(zip_path, "r") as file:
-
-            async def task(name, zip_file: ZipFile):
-                zip_file.extract(name, self._exe_dir, None)
-
-            tasks = [task(name, file) for name in file.namelist()]
-            await asyncio.gather(*tasks, return_exceptions=True)
+    def _command(self, port: int) -> List[str]:
+        executable = [path.join(self._exe_dir, "FastExecuteScript.exe")]
+        if self._engine_command is not None:
+            executable = list(self._engine_command)
+        return [*executable, f"--remote-control-port={port}", "--remote-control"]
 
     def _start_engine_process(self, port: int) -> None:
-        cmd = [path.join(self._exe_dir, "FastExecuteScript.exe"), f"--remote-control-port={port}", "--remote-control"]
+        cmd = self._command(port)
         cwd = self._exe_dir
 
         self.logger.debug(f"start engine process: {cmd}, {cwd}")
 
-        self._process = subprocess.Popen(cmd, cwd=cwd)
-        self.lock_acquire()
+        if not self._detach:
+            self._process = subprocess.Popen(cmd, cwd=cwd)
+            return
 
-    def lock_acquire(self):
-        lock = self._get_lock_path()
-        self._lock = FileLock(lock, timeout=5)
+        # a detached engine keeps running when the client process exits
+        if sys.platform == "win32":
+            flags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+            process = subprocess.Popen(cmd, cwd=cwd, creationflags=flags)
+        else:
+            process = subprocess.Popen(cmd, cwd=cwd, start_new_session=True)
+        self._process = process
+        self._state = EngineState(process.pid, port)
+        self._state.save(self._exe_dir)
+
+    async def stop_process(self) -> None:
+        """Kill the engine process and wait until it exits, so a new one can be started."""
+        process, self._process = self._process, None
+        if process is None:
+            if self._state is not None:
+                self._state.terminate()
+        elif process.poll() is None:
+            process.kill()
+            await self._loop.run_in_executor(None, process.wait)
+
+        if self._state is not None:
+            EngineState.remove(self._exe_dir)
+            self._state = None
+
+    def check_process(self) -> None:
+        """Raise EngineExitedError if the engine process started by the service has exited."""
+        if self._process is not None and self._process.poll() is not None:
+            raise EngineExitedError(self._process.returncode)
+
+    def _acquire_run_directory(self) -> None:
+        """Select the first run directory that is not used by another engine and lock it.
+
+        Every engine process needs its own copy of the executable, so several clients of the same script
+        get separate directories: ``<hash>``, ``<hash>_1``, ``<hash>_2`` and so on.
+        """
+        if self._lock and self._lock.is_locked:
+            return
+
+        makedirs(self._script_dir, exist_ok=True)
+
+        index = 0
+        while True:
+            name = self._exe_name if index == 0 else f"{self._exe_name}_{index}"
+            exe_dir = path.join(self._script_dir, name)
+            if self.lock_acquire(exe_dir):
+                self._exe_dir = exe_dir
+                return
+            index += 1
+
+    def lock_acquire(self, dir_path=None) -> bool:
+        lock = FileLock(self._get_lock_path(dir_path), timeout=0)
+        try:
+            lock.acquire()
+        except Timeout:
+            return False
+        self._lock = lock
         self.logger.debug(f"lock: {self._lock.lock_file}")
-        self._lock.acquire()
+        return True
 
     def lock_release(self):
         if self._lock:
             self._lock.release(force=True)
 
-    def _clear_run_directory(self) -> None:
-        for dir_path in [name for name in listdir(self._script_dir) if path.isfile(name)]:
-            dir_path = path.join(self._script_dir, dir_path)
+    async def _clear_run_directory(self) -> None:
+        """Remove unused run directories left by previous versions of the script, and lock files without
+        a directory, e.g. of pool slots that are no longer used."""
+        for name in listdir(self._script_dir):
+            dir_path = path.join(self._script_dir, name)
+            if not path.isdir(dir_path) or name.startswith(self._exe_name):
+                continue
+            state = EngineState.load(dir_path)
+            if state is not None and await state.is_alive():
+                continue
             lock_path = self._get_lock_path(dir_path)
             if not is_locked(lock_path):
-                rmtree(dir_path)
+                rmtree(dir_path, ignore_errors=True)
+
+        for name in listdir(self._script_dir):
+            lock_path = path.join(self._script_dir, name)
+            # a locked file may belong to a directory that is not created yet
+            if name.endswith(".lock") and not path.isdir(lock_path[: -len(".lock")]) and not is_locked(lock_path):
+                try:
+                    remove(lock_path)
+                except OSError:
+                    pass
 
     def _get_lock_path(self, dir_path=None) -> str:
-        return path.join(dir_path or self._exe_dir, ".lock")
+        return f"{dir_path or self._exe_dir}.lock"
+
+    async def close(self, stop_engine: bool = False) -> None:
+        """Close the engine service.
 
-    async def close(self) -> None:
-        """Close the engine service."""
+        Args:
+            stop_engine (bool): Stop the detached engine too, instead of leaving it for the next client.
+                Defaults to False.
+        """
         self.logger.info("closing...")
-        self._process.kill()
+        if self._revalidate_task is not None:
+            self._revalidate_task.cancel()
+
+        if self._state is None:
+            if self._process:
+                self._process.kill()
+        elif stop_engine:
+            if self._process:
+                self._process.kill()
+            else:
+                self._state.terminate()
+            EngineState.remove(self._exe_dir)
+            self._state = None
+
         self.lock_release()
 
+    @property
+    def process(self) -> Optional[subprocess.Popen]:
+        """Gets the engine process started by the service, None if the engine is attached or not started."""
+        return self._process
+
+    @property
+    def run_directory(self) -> Optional[str]:
+        """Gets the run directory used by the engine process."""
+        return self._exe_dir
+
 
 def is_locked(lock_path):
     try:
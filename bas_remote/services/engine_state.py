@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+import signal
+from os import path, replace
+from typing import Optional
+
+from filelock import FileLock
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # type: ignore
+
+STATE_FILE = "engine.json"
+"""Name of the state file of a detached engine, stored in its run directory."""
+
+
+class EngineState:
+    """Port and process id of a detached engine, stored in its run directory."""
+
+    def __init__(self, pid: int, port: int):
+        self.pid = pid
+        """Engine process id."""
+
+        self.port = port
+        """Remote control port of the engine."""
+
+    @classmethod
+    def load(cls, dir_path: str) -> Optional["EngineState"]:
+        """Read the engine state from the run directory, returns None if it is missing or broken."""
+        state_path = path.join(dir_path, STATE_FILE)
+        if not path.exists(state_path):
+            return None
+        try:
+            with FileLock(f"{state_path}.lock", timeout=5):
+                with open(state_path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+            return cls(int(data["pid"]), int(data["port"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, dir_path: str) -> None:
+        """Write the engine state to the run directory."""
+        state_path = path.join(dir_path, STATE_FILE)
+        with FileLock(f"{state_path}.lock", timeout=5):
+            with open(f"{state_path}.tmp", "w", encoding="utf-8") as file:
+                json.dump({"pid": self.pid, "port": self.port}, file)
+            replace(f"{state_path}.tmp", state_path)
+
+    @staticmethod
+    def remove(dir_path: str) -> None:
+        """Remove the engine state from the run directory."""
+        state_path = path.join(dir_path, STATE_FILE)
+        with FileLock(f"{state_path}.lock", timeout=5):
+            if path.exists(state_path):
+                os.remove(state_path)
+
+    async def is_alive(self) -> bool:
+        """Check that the engine process exists and accepts connections on its port."""
+        if psutil is not None and not psutil.pid_exists(self.pid):
+            return False
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", self.port), timeout=1)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    def terminate(self) -> None:
+        """Terminate the engine process."""
+        try:
+            os.kill(self.pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+
+__all__ = ["EngineState"]
@@ -0,0 +1,72 @@
+import json
+import time
+from os import getpid, makedirs, path, replace
+from typing import Any, Dict, Optional
+
+
+class CachedScript:
+    """Script properties loaded from the cache file."""
+
+    def __init__(self, data: Dict[str, Any], fetched_at: float, etag: Optional[str], last_modified: Optional[str]):
+        self.data = data
+        """Raw script properties returned by the server."""
+
+        self.fetched_at = fetched_at
+        """Time when the properties were fetched or revalidated."""
+
+        self.etag = etag
+        """Value of the `ETag` header, used for revalidation."""
+
+        self.last_modified = last_modified
+        """Value of the `Last-Modified` header, used for revalidation."""
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Gets the conditional request headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ScriptCache:
+    """Cache of script properties stored in the working folder, so the client can start without the network."""
+
+    def __init__(self, file_path: str):
+        """Create an instance of ScriptCache class.
+
+        Args:
+            file_path (str): Location of the cache file.
+        """
+        self._file_path = file_path
+
+    def load(self) -> Optional[CachedScript]:
+        """Read the cached properties, returns None if the cache is missing or broken."""
+        try:
+            with open(self._file_path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+            return CachedScript(entry["data"], entry["fetched_at"], entry.get("etag"), entry.get("last_modified"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, data: Dict[str, Any], etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Write the properties to the cache file, replacing it atomically."""
+        entry = {"data": data, "fetched_at": time.time(), "etag": etag, "last_modified": last_modified}
+        makedirs(path.dirname(self._file_path), exist_ok=True)
+
+        temp_path = f"{self._file_path}.{getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(entry, file)
+        replace(temp_path, self._file_path)
+
+    def touch(self, cached: CachedScript) -> None:
+        """Mark the cached properties as revalidated."""
+        self.save(cached.data, cached.etag, cached.last_modified)
+
+
+__all__ = ["CachedScript", "ScriptCache"]
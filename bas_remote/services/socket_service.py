@@ -1,7 +1,7 @@
 import asyncio
 import logging
-from asyncio import AbstractEventLoop
-from typing import Optional
+from asyncio import AbstractEventLoop, Future
+from typing import Callable, List, Optional, Tuple
 
 import websockets.legacy.client
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
@@ -10,10 +10,15 @@ from websockets.legacy.client import connect
 from websockets.typing import LoggerLike
 
 from bas_remote.errors import SocketNotConnectedError, NetworkFatalError, UnhandledException
+from bas_remote.services.decoder import SEPARATOR, MessageDecoder
 from bas_remote.task import TaskCreator
 from bas_remote.types import Message
 
-SEPARATOR = "---Message--End---"
+CONNECT_DELAY = 0.01
+"""Delay before the second connection attempt, it is doubled after every failed attempt."""
+
+CONNECT_MAX_DELAY = 1.0
+"""Maximum delay between connection attempts."""
 
 
 class SocketClosedException(Exception):
@@ -25,22 +30,48 @@ class SocketService:
 
     _socket: WebSocketClientProtocol = None
 
-    _buffer: str = ""
+    _decoder: MessageDecoder
     logger: LoggerLike
     _loop: AbstractEventLoop
     _task_creator: TaskCreator
     _last_message: Optional[Message] = None
-
-    def __init__(self, client, logger: Optional[LoggerLike] = None):
-        """Create an instance of SocketService class."""
+    _flush_handle: Optional[asyncio.Handle] = None
+
+    def __init__(
+        self,
+        client,
+        logger: Optional[LoggerLike] = None,
+        dispatch: Optional[Callable[[Message], None]] = None,
+        has_listeners: Optional[Callable[[str], bool]] = None,
+    ):
+        """Create an instance of SocketService class.
+
+        Args:
+            client (BasRemoteClient): Client that owns the service.
+            logger (LoggerLike, optional): Logger of the service. Defaults to None.
+            dispatch (callable, optional): Function called with every received message. Defaults to None (the
+                `message_received` event is emitted).
+            has_listeners (callable, optional): Function that tells whether an event has listeners, events without
+                them are not built. Defaults to None (events are always emitted).
+        """
         self._emit = client.emit
+        self._dispatch = dispatch or (lambda message: self._emit("message_received", message))
+        self._has_listeners = has_listeners or (lambda event: True)
         self._loop = client.loop
+        self._metrics = client._metrics
+        self._coalesce = client.options.coalesce_writes
+        self._coalesce_delay = client.options.coalesce_delay
+        self._batch: List[Tuple[str, Future]] = []
+        """Packets waiting to be sent as one frame, with the futures of their senders."""
+
+        self._batch_socket: Optional[WebSocketClientProtocol] = None
         if logger is not None:
             self.logger = logger
         else:
             self.logger = logging.getLogger("[bas-remote:socket]")
 
         self._task_creator = TaskCreator(loop=self._loop)
+        self._decoder = MessageDecoder(SEPARATOR)
 
     def _connect_websocket(self, port: int, *args, **kwargs) -> websockets.legacy.client.Connect:
         return connect(
@@ -49,23 +80,34 @@ class SocketService:
             max_size=None,
         )
 
-    async def start(self, port: int) -> None:
+    async def start(self, port: int, timeout: float = 60, check: Optional[Callable[[], None]] = None) -> None:
         """Asynchronously start the socket service with the specified port.
 
+        Connection attempts are repeated with exponential backoff, starting with `CONNECT_DELAY`, so an engine
+        that is ready quickly is connected quickly.
+
         Arguments:
             port (int): Selected port number.
+            timeout (float): Seconds to keep trying. Defaults to 60.
+            check (callable, optional): Function called before every attempt, it raises if waiting is pointless,
+                e.g. when the engine process has exited. Defaults to None.
         """
 
+        self._decoder.reset()
         attempt = 1
+        delay = CONNECT_DELAY
+        deadline = self._loop.time() + timeout
         while not self.is_connected:
+            if check is not None:
+                check()
             self.logger.debug(f"starting at port: {port}, attempt: {attempt} ...")
             try:
-                # TODO: should be configurable
                 self._socket = await self._connect_websocket(port=port)
-            except ConnectionRefusedError:
-                if attempt == 60:
+            except OSError:
+                if self._loop.time() + delay > deadline:
                     raise SocketNotConnectedError()
-                await asyncio.sleep(1)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, CONNECT_MAX_DELAY)
                 attempt += 1
         self._opened()
 
@@ -74,11 +116,11 @@ class SocketService:
         return self._socket is not None and self._socket.open
 
     def _process_data(self, data: str) -> None:
-        buffer = (self._buffer + data).split(SEPARATOR)
-        for message in [item for item in buffer if item]:
-            unpacked = Message.from_json(message)  # type: ignore
-            self._emit("message_received", unpacked)
-        self._buffer = buffer.pop()
+        messages = self._decoder.feed(data)
+        if self._metrics is not None:
+            self._metrics.count_received(len(data.encode()), len(messages))
+        for message in messages:
+            self._dispatch(Message.from_json(message))
 
     def _process_error(self, exc: Exception) -> None:
         self._emit("fatal_received", exc)
@@ -94,9 +136,10 @@ class SocketService:
         asyncio.gather(self.listen(), return_exceptions=True)
 
     async def listen(self) -> None:
+        socket = self._socket
         while True:
             try:
-                data = await self._socket.recv()
+                data = await socket.recv()
                 self._process_data(data)
             except ConnectionClosedOK:
                 break
@@ -109,14 +152,19 @@ class SocketService:
                 self._process_error(exc=exc)
                 break
         self.logger.info("connection closed")
-        self._closed()
+        # the socket may have been replaced by a new connection already
+        if socket is self._socket:
+            self._closed()
 
     async def send(self, message: Message) -> int:
         self._last_message = message
-        packet = message.to_json() + SEPARATOR  # type: ignore
+        packet = message.to_json() + SEPARATOR
 
         try:
-            await self._socket.send(packet)
+            if self._coalesce:
+                await self._enqueue(packet)
+            else:
+                await self._write(self._socket, packet)
         except websockets.exceptions.ConnectionClosedError as exc:
             self.logger.error(exc)
             await self.close()
@@ -126,9 +174,53 @@ class SocketService:
             await self.close()
             raise UnhandledException() from exc
 
-        self._emit("message_sent", message)
+        if self._has_listeners("message_sent"):
+            self._emit("message_sent", message)
         return message.id_
 
+    async def _write(self, socket: WebSocketClientProtocol, frame: str, messages: int = 1) -> None:
+        await socket.send(frame)
+        if self._metrics is not None:
+            self._metrics.count_sent(len(frame.encode()), messages)
+
+    def _enqueue(self, packet: str) -> Future:
+        """Add the packet to the batch, the returned future is resolved when the batch is sent."""
+        # packets for a replaced connection are not mixed with the new ones
+        if self._batch and self._batch_socket is not self._socket:
+            self._flush()
+
+        future = self._loop.create_future()
+        self._batch.append((packet, future))
+        self._batch_socket = self._socket
+        if self._flush_handle is None:
+            if self._coalesce_delay > 0:
+                self._flush_handle = self._loop.call_later(self._coalesce_delay, self._flush)
+            else:
+                self._flush_handle = self._loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if batch:
+            self._loop.create_task(self._send_batch(self._batch_socket, batch))
+
+    async def _send_batch(self, socket: Optional[WebSocketClientProtocol], batch: List[Tuple[str, Future]]) -> None:
+        try:
+            if socket is None:
+                raise NetworkFatalError()
+            await self._write(socket, "".join(packet for packet, _ in batch), len(batch))
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
     async def close(self) -> None:
         """Close the socket service."""
 
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+from asyncio import AbstractEventLoop, Task
+from contextlib import suppress
+from typing import Dict, Optional
+
+from websockets.typing import LoggerLike
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # type: ignore
+
+DRAIN_POLL_INTERVAL = 0.05
+"""Seconds between checks of the running tasks while the engine is drained before recycling."""
+
+
+class EngineSupervisor:
+    """Supervisor that keeps the engine of the client healthy while it runs for a long time.
+
+    The engine process is checked periodically: when it crashes, it is restarted with exponential backoff, and when
+    it has run too many tasks or uses too much memory, it is recycled. Before recycling, new tasks wait until the
+    running ones are finished, so no work is lost. Memory and CPU are sampled only if `psutil` is installed
+    (the `supervisor` extra).
+    """
+
+    _task: Optional[Task] = None
+    """Task that periodically checks the engine."""
+
+    _restart: Optional[Task] = None
+    """Task that restarts or recycles the engine."""
+
+    _restarted_at: float = 0.0
+    """Loop time when the supervisor was started or the engine was last restarted."""
+
+    _delay: float = 0.0
+    """Delay before the next restart after a crash, it grows while the engine keeps crashing."""
+
+    _sampled = None
+    """Process object used to sample the engine, `cpu_percent` is measured between calls on the same object."""
+
+    logger: LoggerLike
+
+    def __init__(
+        self,
+        client,
+        check_interval: float = 5.0,
+        max_tasks: int = 0,
+        max_memory: int = 0,
+        drain_timeout: float = 300.0,
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 60.0,
+        logger: Optional[LoggerLike] = None,
+    ):
+        """Create an instance of EngineSupervisor class.
+
+        Args:
+            client: Remote client object.
+            check_interval (float): Seconds between engine checks. Defaults to 5.
+            max_tasks (int): Number of tasks after which the engine is recycled, zero means no limit. Defaults to 0.
+            max_memory (int): Memory in bytes used by the engine and its child processes after which the engine
+                is recycled, zero means no limit. Defaults to 0.
+            drain_timeout (float): Seconds to wait for running tasks before the engine is recycled anyway.
+                Defaults to 300.
+            restart_delay (float): Delay before restarting an engine that crashed again shortly after the previous
+                restart, it is doubled after every such crash. Defaults to 1.
+            max_restart_delay (float): Maximum delay before restarting a crashed engine. Defaults to 60.
+        """
+        self._loop: AbstractEventLoop = client.loop
+        self._client = client
+        self._check_interval = check_interval
+        self._max_tasks = max_tasks
+        self._max_memory = max_memory
+        self._drain_timeout = drain_timeout
+        self._restart_delay = restart_delay
+        self._max_restart_delay = max_restart_delay
+
+        self._tasks = 0
+        self._crashes = 0
+        self._recycles = 0
+        self._restarts = 0
+        self._memory = 0
+        self._cpu_percent = 0.0
+
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.logger = logging.getLogger("[bas-remote:supervisor]")
+
+    @property
+    def is_restarting(self) -> bool:
+        """Gets a value that indicates whether the engine is being restarted or recycled."""
+        return self._restart is not None and not self._restart.done()
+
+    def stats(self) -> Dict[str, float]:
+        """Get the supervisor counters.
+
+        Returns:
+            dict: Number of crashes, recycles and restarts, tasks run by the current engine and its last sampled
+                memory usage in bytes and CPU usage in percent.
+        """
+        return {
+            "crashes": self._crashes,
+            "recycles": self._recycles,
+            "restarts": self._restarts,
+            "tasks": self._tasks,
+            "memory": self._memory,
+            "cpu_percent": self._cpu_percent,
+        }
+
+    def start(self) -> None:
+        """Start checking the engine."""
+        self._tasks = 0
+        self._restarted_at = self._loop.time()
+        self._task = self._loop.create_task(self._watch())
+
+    async def close(self) -> None:
+        """Stop checking the engine and cancel the restart in progress."""
+        for task in (self._task, self._restart):
+            if task is not None and not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._restart = None
+
+    def task_done(self) -> None:
+        """Count the finished task, recycling the engine when it has run `max_tasks` tasks."""
+        self._tasks += 1
+        if self._max_tasks and self._tasks >= self._max_tasks:
+            self._schedule(self._recycle(f"{self._tasks} tasks are done"))
+
+    def check(self) -> None:
+        """Check the engine right away, e.g. when its connection is closed."""
+        if self._task is None or self.is_restarting or self._client.is_reconnecting:
+            return
+
+        process = self._client._engine.process
+        if (process is not None and process.poll() is not None) or not self._client._socket.is_connected:
+            self._crashes += 1
+            self._schedule(self._recover("engine has crashed"))
+            return
+
+        self._sample(process)
+        if self._max_memory and self._memory > self._max_memory:
+            self._schedule(self._recycle(f"engine uses {self._memory} bytes of memory"))
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self._check_interval)
+            self.check()
+
+    def _schedule(self, coro) -> None:
+        if self.is_restarting:
+            coro.close()
+            return
+        self._restart = self._loop.create_task(coro)
+
+    def _sample(self, process) -> None:
+        if psutil is None or process is None:
+            return
+        try:
+            if self._sampled is None or self._sampled.pid != process.pid:
+                self._sampled = psutil.Process(process.pid)
+            processes = [self._sampled] + self._sampled.children(recursive=True)
+            self._memory = sum(item.memory_info().rss for item in processes)
+            self._cpu_percent = self._sampled.cpu_percent()
+        except psutil.Error as exc:
+            self.logger.debug(f"cannot sample engine process: {exc}")
+
+    async def _recycle(self, reason: str) -> None:
+        self.logger.info(f"recycling engine: {reason}")
+        self._client._pause()
+
+        deadline = self._loop.time() + self._drain_timeout
+        while self._client._active and self._loop.time() < deadline:
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+
+        self._recycles += 1
+        self._delay = 0.0
+        await self._restart_engine()
+
+    async def _recover(self, reason: str) -> None:
+        self.logger.warning(f"restarting engine: {reason}")
+        self._client._pause()
+
+        # an engine that crashes soon after the restart is likely to crash again, so the delay grows
+        if self._loop.time() - self._restarted_at > self._max_restart_delay:
+            self._delay = 0.0
+        await asyncio.sleep(self._delay)
+        await self._restart_engine()
+
+    async def _restart_engine(self) -> None:
+        while True:
+            try:
+                await self._client._restart_engine()
+                break
+            except Exception as exc:
+                self.logger.error(f"cannot restart engine: {exc!r}")
+                self._delay = min(max(self._delay * 2, self._restart_delay), self._max_restart_delay)
+                await asyncio.sleep(self._delay)
+
+        self._delay = min(max(self._delay * 2, self._restart_delay), self._max_restart_delay)
+        self._restarts += 1
+        self._tasks = 0
+        self._sampled = None
+        self._restarted_at = self._loop.time()
+
+
+__all__ = ["EngineSupervisor"]
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Coroutine, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from websockets.typing import LoggerLike
+
+from bas_remote.client import BasRemoteClient
+from bas_remote.options import Options
+from bas_remote.tracing import Tracer
+
+
+class SyncBasRemoteClient:
+    """Client for synchronous code, it runs `BasRemoteClient` on an event loop in a background thread.
+
+    All methods can be called from any thread, so many threads share one engine and one connection. Blocking
+    methods wait for the result, `submit` methods return `concurrent.futures.Future` objects; cancelling such
+    a future stops the BAS function.
+    """
+
+    _client: BasRemoteClient
+
+    logger: LoggerLike
+
+    def __init__(self, options: Options, logger: Optional[LoggerLike] = None, tracer: Optional[Tracer] = None):
+        """Create an instance of SyncBasRemoteClient class and start its event loop thread.
+
+        Args:
+            options (Options): Remote control options object.
+            tracer (Tracer, optional): Tracing hooks, e.g. `OpenTelemetryTracer`. Defaults to None (no tracing).
+        """
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.logger = logging.getLogger("[bas-remote:sync]")
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="bas-remote-loop", daemon=True)
+        self._thread.start()
+        try:
+            self._client = self._call(self._create(options, logger, tracer))
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    async def _create(self, options: Options, logger: Optional[LoggerLike], tracer: Optional[Tracer]):
+        return BasRemoteClient(options, loop=self.loop, logger=logger, tracer=tracer)
+
+    def __enter__(self) -> "SyncBasRemoteClient":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def client(self) -> BasRemoteClient:
+        """Gets the underlying client, its methods have to be called on `loop`."""
+        return self._client
+
+    @property
+    def is_started(self) -> bool:
+        """Gets a value that indicates whether the client is already running."""
+        return self._client.is_started
+
+    def start(self) -> None:
+        """Start the client and wait until it is ready."""
+        self._call(self._client.start())
+
+    def close(self, stop_engine: bool = False) -> None:
+        """Close the client, stop the event loop and wait for its thread.
+
+        Args:
+            stop_engine (bool): Stop the engine even if `options.detach_engine` is set. Defaults to False.
+        """
+        if self.loop.is_closed():
+            return
+        try:
+            self._call(self._client.close(stop_engine))
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current state and counters of the client, see `BasRemoteClient.stats`."""
+        return self._call(self._stats())
+
+    async def _stats(self) -> Dict[str, Any]:
+        return self._client.stats()
+
+    def run_function(
+        self,
+        function_name: str,
+        function_params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ) -> Any:
+        """Call the BAS function and wait for its result.
+
+        Args:
+            function_name (str): BAS function name as string.
+            function_params (dict, optional): BAS function arguments list. Defaults to None.
+            priority (int): Task priority in the client scheduler, higher values run first. Defaults to 0.
+            timeout (float, optional): Seconds after which the function is stopped and `FunctionTimeoutError`
+                is raised. Defaults to None (no limit).
+            idempotent (bool): Run the function again if the connection is lost while it is running.
+                Defaults to False.
+        """
+        return self.submit(function_name, function_params, priority, timeout, idempotent).result()
+
+    def submit(
+        self,
+        function_name: str,
+        function_params: Optional[Dict] = None,
+        priority: int = 0,
+        timeout: Optional[float] = None,
+        idempotent: bool = False,
+    ) -> Future:
+        """Call the BAS function without waiting for it, the arguments are the same as for `run_function`.
+
+        Returns:
+            Future: Future resolved with the function result.
+        """
+        return self._submit(self._run_function(function_name, function_params, priority, timeout, idempotent))
+
+    async def _run_function(self, *args) -> Any:
+        return await self._client.run_function(*args)
+
+    def map(
+        self, function_name: str, params: Iterable[Optional[Dict]], concurrency: int = 10, ordered: bool = False
+    ) -> Iterator[Tuple[Optional[Dict], Any]]:
+        """Call the BAS function for every arguments list, keeping a limited number of calls in flight.
+
+        Args:
+            function_name (str): BAS function name as string.
+            params (iterable): Arguments lists, they are read lazily on the event loop thread.
+            concurrency (int): Maximum number of calls in flight. Defaults to 10.
+            ordered (bool): Yield results in input order instead of completion order. Defaults to False.
+
+        Returns:
+            Iterator: Pairs of arguments list and function result, or the exception object if the call failed.
+        """
+        results = self._call(self._map(function_name, params, concurrency, ordered))
+        try:
+            while True:
+                try:
+                    yield self._call(_await(results.__anext__()))
+                except StopAsyncIteration:
+                    return
+        finally:
+            # calls in flight are stopped when the caller doesn't read the results anymore
+            if not self.loop.is_closed():
+                self._call(_await(results.aclose()))
+
+    def submit_map(
+        self, function_name: str, params: Iterable[Optional[Dict]], concurrency: int = 10, ordered: bool = False
+    ) -> Future:
+        """Call the BAS function for every arguments list without waiting, the arguments are the same as for `map`.
+
+        Returns:
+            Future: Future resolved with the list of pairs of arguments list and function result.
+        """
+        return self._submit(self._map_all(function_name, params, concurrency, ordered))
+
+    async def _map(self, *args) -> AsyncIterator[Tuple[Optional[Dict], Any]]:
+        return self._client.map(*args)
+
+    async def _map_all(self, *args) -> List[Tuple[Optional[Dict], Any]]:
+        return [pair async for pair in self._client.map(*args)]
+
+    def get_global_variable(self, name: str) -> Any:
+        """Get the value of the script global variable, see `BasRemoteClient.get_global_variable`."""
+        return self._call(self._client.get_global_variable(name))
+
+    def set_global_variable(self, name: str, value: Any) -> None:
+        """Set the value of the script global variable, see `BasRemoteClient.set_global_variable`."""
+        self._call(self._client.set_global_variable(name, value))
+
+    def _submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        if threading.current_thread() is self._thread:
+            # the coroutine is never scheduled, closing it avoids the "never awaited" warning
+            coro.close()
+            raise RuntimeError("SyncBasRemoteClient can't be used from its event loop thread, use `client` instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def _call(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        return self._submit(coro).result()
+
+
+async def _await(awaitable: Awaitable) -> Any:
+    # run_coroutine_threadsafe accepts only coroutines, not the awaitables of async generators
+    return await awaitable
+
+
+__all__ = ["SyncBasRemoteClient"]
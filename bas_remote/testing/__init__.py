@@ -0,0 +1,37 @@
+import sys
+from typing import List, Optional
+
+from bas_remote.testing.engine import FakeEngine, DEFAULT_FUNCTIONS
+
+
+def fake_engine_command(
+    latency: float = 0.0,
+    payload_size: int = 0,
+    failure_rate: float = 0.0,
+    drop_after: int = 0,
+    password: Optional[str] = None,
+) -> List[str]:
+    """Get the command that starts the fake engine in a separate process, for `options.engine_command`.
+
+    Args:
+        latency (float): Seconds every task takes before the reply is sent. Defaults to 0.
+        payload_size (int): Default length of the string returned by the `Payload` function. Defaults to 0.
+        failure_rate (float): Probability that a task fails with `FunctionError`. Defaults to 0.
+        drop_after (int): Number of the task on which the connection is broken, zero means never. Defaults to 0.
+        password (str, optional): Password expected from the client, None accepts any. Defaults to None.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "bas_remote.testing",
+        f"--latency={latency}",
+        f"--payload-size={payload_size}",
+        f"--failure-rate={failure_rate}",
+        f"--drop-after={drop_after}",
+    ]
+    if password is not None:
+        command.append(f"--password={password}")
+    return command
+
+
+__all__ = ["FakeEngine", "DEFAULT_FUNCTIONS", "fake_engine_command"]
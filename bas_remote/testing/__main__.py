@@ -0,0 +1,37 @@
+import asyncio
+import logging
+from argparse import ArgumentParser
+
+from bas_remote.testing.engine import FakeEngine
+
+
+async def main() -> None:
+    parser = ArgumentParser(prog="python -m bas_remote.testing", description="Fake BAS engine for tests.")
+    parser.add_argument("--remote-control-port", type=int, default=0)
+    parser.add_argument("--remote-control", action="store_true", help="accepted for compatibility with the engine")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--payload-size", type=int, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-after", type=int, default=0)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    engine = FakeEngine(
+        latency=args.latency,
+        payload_size=args.payload_size,
+        failure_rate=args.failure_rate,
+        drop_after=args.drop_after,
+        password=args.password,
+    )
+    port = await engine.start(args.remote_control_port)
+    engine.logger.info(f"listening at port: {port}")
+    await asyncio.Future()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
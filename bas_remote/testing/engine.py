@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Union
+
+from websockets.legacy.server import WebSocketServer, WebSocketServerProtocol, serve
+from websockets.typing import LoggerLike
+
+from bas_remote.services.decoder import SEPARATOR, MessageDecoder
+from bas_remote.types import Message, Response, codec
+
+Function = Callable[[Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+
+def _add(params: Dict[str, Any]) -> Any:
+    return params["X"] + params["Y"]
+
+
+def _echo(params: Dict[str, Any]) -> Any:
+    return params
+
+
+async def _sleep(params: Dict[str, Any]) -> Any:
+    await asyncio.sleep(params.get("Seconds", 0))
+    return params.get("Seconds", 0)
+
+
+DEFAULT_FUNCTIONS: Dict[str, Function] = {"Add": _add, "Echo": _echo, "Sleep": _sleep}
+"""Functions of the fake engine script, `Payload` is added by the engine itself."""
+
+
+class FakeEngine:
+    """Websocket server that speaks the remote control protocol of the engine, for tests and benchmarks.
+
+    It authenticates the client, keeps track of started threads and runs `run_task` messages with the script
+    functions given to it. Latency, result size and failures can be configured to test the client without the
+    real engine.
+    """
+
+    _server: Optional[WebSocketServer] = None
+
+    logger: LoggerLike
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        payload_size: int = 0,
+        failure_rate: float = 0.0,
+        drop_after: int = 0,
+        password: Optional[str] = None,
+        functions: Optional[Dict[str, Function]] = None,
+        logger: Optional[LoggerLike] = None,
+    ):
+        """Create an instance of FakeEngine class.
+
+        Args:
+            latency (float): Seconds every task takes before the reply is sent. Defaults to 0.
+            payload_size (int): Default length of the string returned by the `Payload` function. Defaults to 0.
+            failure_rate (float): Probability that a task fails with `FunctionError`. Defaults to 0.
+            drop_after (int): Number of the task on which the connection is broken without replying,
+                zero means never. Defaults to 0.
+            password (str, optional): Password expected in `remote_control_data`, None accepts any.
+                Defaults to None.
+            functions (dict, optional): Script functions by name. Defaults to DEFAULT_FUNCTIONS.
+        """
+        self.latency = latency
+        self.payload_size = payload_size
+        self.failure_rate = failure_rate
+        self.drop_after = drop_after
+        self.password = password
+
+        self.functions = dict(DEFAULT_FUNCTIONS if functions is None else functions)
+        self.functions.setdefault("Payload", self._payload)
+
+        self.threads: Set[int] = set()
+        """Threads that are started and not stopped yet."""
+
+        self.variables: Dict[str, Any] = {}
+        """Global variables of the script, by name without the `GLOBAL:` prefix."""
+
+        self.connections = 0
+        self.received = 0
+        self.tasks = 0
+        self.max_threads = 0
+
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.logger = logging.getLogger("[bas-remote:fake-engine]")
+
+    @property
+    def port(self) -> int:
+        """Gets the port the engine listens on, zero if it is not started."""
+        if self._server is None:
+            return 0
+        return next(iter(self._server.sockets)).getsockname()[1]
+
+    async def start(self, port: int = 0, host: str = "127.0.0.1") -> int:
+        """Start listening for the client.
+
+        Args:
+            port (int): Remote control port, zero selects a free one. Defaults to 0.
+            host (str): Interface to listen on. Defaults to "127.0.0.1".
+
+        Returns:
+            int: Remote control port.
+        """
+        self._server = await serve(self._handle, host, port, max_size=None)
+        return self.port
+
+    async def close(self) -> None:
+        """Stop listening and close all connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _payload(self, params: Dict[str, Any]) -> str:
+        return "x" * params.get("Size", self.payload_size)
+
+    async def _handle(self, websocket: WebSocketServerProtocol, *args) -> None:
+        self.connections += 1
+        decoder = MessageDecoder(SEPARATOR)
+        tasks: Set[asyncio.Task] = set()
+
+        async def send(message: Message) -> None:
+            await websocket.send(message.to_json() + SEPARATOR)
+
+        try:
+            async for frame in websocket:
+                text = frame if isinstance(frame, str) else frame.decode("utf-8")
+                for packet in decoder.feed(text):
+                    message = Message.from_json(packet)
+                    if message.type_ == "run_task":
+                        self.received += 1
+                        if self.received == self.drop_after:
+                            self.logger.debug("dropping connection")
+                            await websocket.close(code=1011)
+                            return
+                        task = asyncio.ensure_future(self._run_task(message, send))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    else:
+                        await self._process(message, send)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _process(self, message: Message, send: Callable[[Message], Awaitable[None]]) -> None:
+        if message.type_ == "remote_control_data":
+            if self.password is not None and message.data.get("password") != self.password:
+                await send(Message(False, "message", 0, {"text": "Wrong password"}))
+            else:
+                await send(Message(False, "initialize", 0, {}))
+        elif message.type_ == "accept_resources":
+            await send(Message(False, "thread_start", 0, {}))
+        elif message.type_ == "start_thread":
+            self.threads.add(message.data["thread_id"])
+            self.max_threads = max(self.max_threads, len(self.threads))
+        elif message.type_ == "stop_thread":
+            self.threads.discard(message.data["thread_id"])
+        elif message.type_ == "get_global_variable":
+            value = self.variables.get(message.data["name"].split(":", 1)[-1])
+            await send(Message(True, message.type_, message.id_, codec.dumps(value)))
+        elif message.type_ == "set_global_variable":
+            self.variables[message.data["name"].split(":", 1)[-1]] = codec.loads(message.data["value"])
+            await send(Message(True, message.type_, message.id_, ""))
+        elif message.async_:
+            # unknown requests are answered, so the client doesn't wait for them
+            await send(Message(True, message.type_, message.id_, ""))
+
+    async def _run_task(self, message: Message, send: Callable[[Message], Awaitable[None]]) -> None:
+        self.tasks += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        name = message.data["function_name"]
+        response = Response(success=True, message="")
+        if message.data["thread_id"] not in self.threads:
+            response = Response(message=f"FunctionFatalError: Thread {message.data['thread_id']} is not started")
+        elif self.failure_rate and random.random() < self.failure_rate:
+            response = Response(message=f"Injected failure of {name}")
+        elif name not in self.functions:
+            response = Response(message=f"Function {name} not found")
+        else:
+            try:
+                result = self.functions[name](codec.loads(message.data["params"]))
+                if asyncio.iscoroutine(result):
+                    result = await result
+                response.result = result
+            except Exception as exc:
+                response = Response(message=f"{type(exc).__name__}: {exc}")
+
+        await send(Message(True, "run_task", message.id_, response.to_json()))
+
+
+__all__ = ["FakeEngine", "DEFAULT_FUNCTIONS"]
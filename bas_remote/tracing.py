@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None  # type: ignore
+
+
+class Span:
+    """Span of the traced operation, the base class does nothing."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = Span()
+
+
+class Tracer:
+    """Tracing hooks called around the function lifecycle, the base class does nothing.
+
+    Subclasses return their own spans from `start_span`. The client opens a `bas.run_function` span for every
+    function call, with child spans for `bas.start_thread`, `bas.run_task`, `bas.send`, `bas.wait_reply`,
+    `bas.decode` and `bas.stop_thread`.
+    """
+
+    def start_span(self, name: str, parent: Optional[Span] = None) -> Span:
+        """Start the span.
+
+        Args:
+            name (str): Span name.
+            parent (Span, optional): Parent span, None for the function span. Defaults to None.
+        """
+        return NOOP_SPAN
+
+
+class OpenTelemetrySpan(Span):
+    def __init__(self, span):
+        self.span = span
+        """Wrapped OpenTelemetry span."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.span.set_attribute(key, value)
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.span.record_exception(exc)
+        self.span.set_status(trace.Status(trace.StatusCode.ERROR, type(exc).__name__))
+
+    def end(self) -> None:
+        self.span.end()
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that reports spans to OpenTelemetry, it does nothing if `opentelemetry-api` is not installed.
+
+    Function spans are children of the span that is current when the function is called, so BAS calls are
+    correlated with the request that made them.
+    """
+
+    def __init__(self, tracer: Any = None):
+        """Create an instance of OpenTelemetryTracer class.
+
+        Args:
+            tracer (opentelemetry.trace.Tracer, optional): Tracer that creates the spans.
+                Defaults to the tracer of the global provider.
+        """
+        self._tracer: Any = None
+        if trace is not None:
+            self._tracer = tracer or trace.get_tracer("bas_remote")
+
+    def start_span(self, name: str, parent: Optional[Span] = None) -> Span:
+        if self._tracer is None:
+            return NOOP_SPAN
+        context = None
+        if isinstance(parent, OpenTelemetrySpan):
+            context = trace.set_span_in_context(parent.span)
+        return OpenTelemetrySpan(self._tracer.start_span(name, context=context))
+
+
+@contextmanager
+def start_span(
+    tracer: Tracer, name: str, parent: Optional[Span] = None, attributes: Optional[Dict[str, Any]] = None
+) -> Iterator[Span]:
+    """Context manager that starts the span, records the raised exception and ends the span on exit."""
+    span = tracer.start_span(name, parent)
+    if attributes:
+        for key, value in attributes.items():
+            span.set_attribute(key, value)
+    try:
+        yield span
+    except BaseException as exc:
+        span.record_exception(exc)
+        raise
+    finally:
+        span.end()
+
+
+__all__ = ["Span", "Tracer", "OpenTelemetryTracer", "start_span"]
@@ -1,5 +1,6 @@
+from bas_remote.types.codec import get_codec, set_codec
 from bas_remote.types.message import Message
 from bas_remote.types.response import Response
 from bas_remote.types.script import Script
 
-__all__ = ["Message", "Response", "Script"]
+__all__ = ["Message", "Response", "Script", "get_codec", "set_codec"]
@@ -0,0 +1,116 @@
+import json
+from typing import Any, Dict, Optional, Type, Union
+
+
+class JsonCodec:
+    """Codec based on the standard `json` module, always available."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+    @staticmethod
+    def loads(data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec based on the optional `orjson` package."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        # keys that are not strings are converted like the standard `json` module does
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj, option=self._option).decode("utf-8")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._loads(data)
+
+
+class UjsonCodec:
+    """Codec based on the optional `ujson` package."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._loads(data)
+
+
+CODECS: Dict[str, Type] = {
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+    JsonCodec.name: JsonCodec,
+}
+"""Known codecs in order of preference."""
+
+_codec: Any = None
+
+
+def _default_codec() -> Any:
+    for codec in CODECS.values():
+        try:
+            return codec()
+        except ImportError:
+            continue
+    return JsonCodec()
+
+
+def get_codec() -> Any:
+    """Gets the codec used to encode and decode BAS messages."""
+    global _codec
+    if _codec is None:
+        _codec = _default_codec()
+    return _codec
+
+
+def set_codec(codec: Optional[Union[str, Any]] = None) -> Any:
+    """Select the codec used to encode and decode BAS messages.
+
+    Args:
+        codec (str or object, optional): Codec name ("json", "orjson", "ujson") or any object with `dumps` and
+            `loads` methods. Defaults to None, which selects the fastest installed codec.
+
+    Returns:
+        object: Selected codec.
+    """
+    global _codec
+    if codec is None:
+        _codec = _default_codec()
+    elif isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec: {codec}")
+        _codec = CODECS[codec]()
+    else:
+        _codec = codec
+    return _codec
+
+
+def dumps(obj: Any) -> str:
+    """Encode the object to JSON string with the selected codec."""
+    return get_codec().dumps(obj)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode the JSON string with the selected codec."""
+    return get_codec().loads(data)
+
+
+__all__ = ["JsonCodec", "OrjsonCodec", "UjsonCodec", "get_codec", "set_codec", "dumps", "loads"]
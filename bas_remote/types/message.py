@@ -1,29 +1,52 @@
-from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Dict, Union
 
-from dataclasses_json import dataclass_json, config
+from bas_remote.types import codec
 
 
-@dataclass_json
-@dataclass
 class Message:
     """Class that represents default BAS message."""
 
-    async_: bool = field(
-        metadata=config(
-            field_name="async",
-        )
-    )
+    __slots__ = ("async_", "type_", "id_", "data")
+
+    async_: bool
     """Is message async."""
 
-    type_: str = field(metadata=config(field_name="type"))
+    type_: str
     """Message type string."""
 
-    id_: int = field(metadata=config(field_name="id"))
+    id_: int
     """Message id number."""
 
-    data: Any = None
+    data: Any
     """Message data object."""
 
+    def __init__(self, async_: bool, type_: str, id_: int, data: Any = None):
+        self.async_ = async_
+        self.type_ = type_
+        self.id_ = id_
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, kvs: Dict[str, Any]) -> "Message":
+        return cls(kvs.get("async", False), kvs.get("type", ""), kvs.get("id", 0), kvs.get("data"))
+
+    @classmethod
+    def from_json(cls, s: Union[str, bytes]) -> "Message":
+        return cls.from_dict(codec.loads(s))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"async": self.async_, "type": self.type_, "id": self.id_, "data": self.data}
+
+    def to_json(self) -> str:
+        return codec.dumps(self.to_dict())
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.async_, self.type_, self.id_, self.data) == (other.async_, other.type_, other.id_, other.data)
+
+    def __repr__(self) -> str:
+        return f"Message(async_={self.async_!r}, type_={self.type_!r}, id_={self.id_!r}, data={self.data!r})"
+
 
 __all__ = ["Message"]
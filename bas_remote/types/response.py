@@ -1,22 +1,48 @@
-from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Union
 
-from dataclasses_json import dataclass_json, LetterCase
+from bas_remote.types import codec
 
 
-@dataclass_json(letter_case=LetterCase.PASCAL)
-@dataclass
 class Response:
     """Class that represents default BAS response."""
 
-    success: bool = False
-    """[description]"""
+    __slots__ = ("success", "message", "result")
 
-    message: Optional[str] = None
+    success: bool
+    """Is function completed successfully."""
+
+    message: Optional[str]
     """Response error message."""
 
-    result: Any = None
+    result: Any
     """Response result object."""
 
+    def __init__(self, success: bool = False, message: Optional[str] = None, result: Any = None):
+        self.success = success
+        self.message = message
+        self.result = result
+
+    @classmethod
+    def from_dict(cls, kvs: Dict[str, Any]) -> "Response":
+        return cls(kvs.get("Success", False), kvs.get("Message"), kvs.get("Result"))
+
+    @classmethod
+    def from_json(cls, s: Union[str, bytes]) -> "Response":
+        return cls.from_dict(codec.loads(s))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"Success": self.success, "Message": self.message, "Result": self.result}
+
+    def to_json(self) -> str:
+        return codec.dumps(self.to_dict())
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.success, self.message, self.result) == (other.success, other.message, other.result)
+
+    def __repr__(self) -> str:
+        return f"Response(success={self.success!r}, message={self.message!r}, result={self.result!r})"
+
 
 __all__ = ["Response"]
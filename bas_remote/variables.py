@@ -0,0 +1,129 @@
+import asyncio
+from asyncio import Future
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from bas_remote.types import codec
+
+PREFIX = "GLOBAL:"
+"""Prefix of the global variable names in the engine messages."""
+
+
+class GlobalVariables:
+    """Global variables of the script, read through a local cache when `options.global_variables_ttl` is set.
+
+    Values read from the engine and written by the client are cached for `ttl` seconds. Concurrent reads of the
+    same variable share one request. Cached values are returned as they are, so they shouldn't be mutated.
+    """
+
+    _cache: Dict[str, Tuple[Any, float]]
+    """Cached values and their expiration times, by variable name."""
+
+    _pending: Dict[str, Future]
+    """Reads waiting for the reply, by variable name."""
+
+    def __init__(self, client, ttl: Optional[float] = None):
+        """Create an instance of GlobalVariables class.
+
+        Args:
+            client (BasRemoteClient): Client that sends the requests.
+            ttl (float, optional): Seconds to keep the values in the cache. Defaults to None (no cache).
+        """
+        self._client = client
+        self._loop = client.loop
+        self._ttl = ttl
+        self._cache = {}
+        self._pending = {}
+
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache counters: `size`, `hits` and `misses`."""
+        return {"size": len(self._cache), "hits": self._hits, "misses": self._misses}
+
+    async def get(self, name: str, refresh: bool = False) -> Any:
+        """Get the value of the global variable.
+
+        Args:
+            name (str): Variable name.
+            refresh (bool): Read the value from the engine even if it is cached. Defaults to False.
+        """
+        if not refresh and self._ttl is not None:
+            entry = self._cache.get(name)
+            if entry is not None:
+                if entry[1] > self._loop.time():
+                    self._hits += 1
+                    return entry[0]
+                del self._cache[name]
+        self._misses += 1
+
+        future = self._pending.get(name)
+        if future is None:
+            future = self._pending[name] = asyncio.ensure_future(self._fetch(name))
+            future.add_done_callback(lambda _: self._fetched(name, future))
+        # a cancelled caller doesn't cancel the read shared with the other ones
+        return await asyncio.shield(future)
+
+    async def set(self, name: str, value: Any) -> None:
+        """Set the value of the global variable.
+
+        Args:
+            name (str): Variable name.
+            value (any): JSON serializable value.
+        """
+        self._forget(name)
+        try:
+            await self._client.send_async("set_global_variable", {"name": PREFIX + name, "value": codec.dumps(value)})
+        except BaseException:
+            self._forget(name)
+            raise
+        if self._ttl is not None:
+            self._cache[name] = (value, self._loop.time() + self._ttl)
+
+    async def get_many(self, names: Iterable[str], refresh: bool = False) -> Dict[str, Any]:
+        """Get the values of several global variables, the ones that are not cached are requested concurrently.
+
+        Args:
+            names (iterable): Variable names.
+            refresh (bool): Read the values from the engine even if they are cached. Defaults to False.
+
+        Returns:
+            dict: Values by variable name.
+        """
+        names = list(dict.fromkeys(names))
+        values = await asyncio.gather(*[self.get(name, refresh) for name in names])
+        return dict(zip(names, values))
+
+    async def set_many(self, values: Dict[str, Any]) -> None:
+        """Set the values of several global variables concurrently.
+
+        Args:
+            values (dict): JSON serializable values by variable name.
+        """
+        await asyncio.gather(*[self.set(name, value) for name, value in values.items()])
+
+    def invalidate(self, *names: str) -> None:
+        """Remove the variables from the cache, all of them if no names are given."""
+        if not names:
+            self._cache.clear()
+            self._pending.clear()
+        for name in names:
+            self._forget(name)
+
+    def _forget(self, name: str) -> None:
+        # a read that is still running doesn't put its outdated value into the cache
+        self._cache.pop(name, None)
+        self._pending.pop(name, None)
+
+    async def _fetch(self, name: str) -> Any:
+        return await self._client.send_async("get_global_variable", {"name": PREFIX + name})
+
+    def _fetched(self, name: str, future: Future) -> None:
+        if self._pending.get(name) is not future:
+            return
+        del self._pending[name]
+        if self._ttl is not None and not future.cancelled() and future.exception() is None:
+            self._cache[name] = (future.result(), self._loop.time() + self._ttl)
+
+
+__all__ = ["GlobalVariables"]
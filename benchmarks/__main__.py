@@ -0,0 +1,57 @@
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+from argparse import ArgumentParser
+
+import bas_remote
+from benchmarks.compare import compare, format_table
+from benchmarks.suite import Suite
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="python -m benchmarks", description="Benchmarks of the client with the fake engine.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all of them by default")
+    parser.add_argument("-o", "--output", help="file to write the JSON report to, stdout by default")
+    parser.add_argument("-b", "--baseline", help="stored JSON report to compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2, help="relative change flagged as regression")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake engine takes for every task")
+    parser.add_argument("--coalesce-writes", action="store_true", help="send queued messages as one frame")
+    parser.add_argument("--quick", action="store_true", help="make fewer calls, for a smoke run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = {
+        "version": bas_remote.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": asyncio.run(
+            Suite(quick=args.quick, latency=args.latency, coalesce_writes=args.coalesce_writes).run(args.names)
+        ),
+    }
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(report, json.load(f), args.threshold)
+        regressions = sum(row["regression"] for row in rows)
+        report["comparison"] = rows
+        print(format_table(rows), file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if regressions:
+        print(f"{regressions} metrics regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
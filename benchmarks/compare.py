@@ -0,0 +1,53 @@
+from typing import Any, Dict, List
+
+HIGHER_IS_BETTER = {"calls_per_second", "mb_per_second"}
+"""Metrics that get worse when they decrease, the other ones are durations in seconds."""
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Compare the metrics of benchmarks that are present in both reports.
+
+    Args:
+        current (dict): Report of the current run.
+        baseline (dict): Stored report to compare with.
+        threshold (float): Relative change of a metric that is reported as a regression. Defaults to 0.2.
+
+    Returns:
+        list: Comparison of every metric, with `change` relative to the baseline and the `regression` flag.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["params"] != result["params"]:
+            continue
+        for metric, value in result["metrics"].items():
+            base_value = base["metrics"].get(metric)
+            if not base_value:
+                continue
+            change = (value - base_value) / base_value
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            rows.append(
+                {
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": base_value,
+                    "current": value,
+                    "change": change,
+                    "regression": worse > threshold,
+                }
+            )
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<18} {'metric':<22} {'baseline':>12} {'current':>12} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['benchmark']:<18} {row['metric']:<22} {row['baseline']:>12.6g} {row['current']:>12.6g}"
+            f" {row['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+__all__ = ["compare", "format_table", "HIGHER_IS_BETTER"]
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import tempfile
+import time
+from shutil import rmtree
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+from bas_remote import BasRemoteClient, Options
+from bas_remote.testing import fake_engine_command
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))  # root directory
+
+CONCURRENCY = (1, 10, 100, 1000)
+"""Numbers of concurrent calls of the throughput benchmarks."""
+
+LARGE_RESULT_SIZE = 4 * 1024 * 1024
+"""Length of the string returned by the large result benchmark, like `TestReturnBigData`."""
+
+Result = Dict[str, Dict[str, Any]]
+"""Benchmark result with `params` it was run with and measured `metrics`."""
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Get the nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_metrics(latencies: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "mean": sum(latencies) / len(latencies),
+    }
+
+
+class Suite:
+    """Benchmarks of the client against the fake engine started as a separate process."""
+
+    def __init__(self, quick: bool = False, latency: float = 0.0, coalesce_writes: bool = False):
+        """Create an instance of Suite class.
+
+        Args:
+            quick (bool): Make fewer calls, for a smoke run. Defaults to False.
+            latency (float): Seconds the fake engine takes for every task. Defaults to 0.
+            coalesce_writes (bool): Value of `options.coalesce_writes`. Defaults to False.
+        """
+        self.quick = quick
+        self.latency = latency
+        self.coalesce_writes = coalesce_writes
+        self.working_dir = tempfile.mkdtemp(prefix="bas-remote-benchmarks-")
+
+        # the engine runs in its own directory, the package has to be importable from there
+        pythonpath = os.environ.get("PYTHONPATH")
+        os.environ["PYTHONPATH"] = ROOT if not pythonpath else os.pathsep.join([ROOT, pythonpath])
+
+    def options(self) -> Options:
+        return Options(
+            working_dir=self.working_dir,
+            script_name="Benchmark",
+            engine_command=fake_engine_command(latency=self.latency),
+            coalesce_writes=self.coalesce_writes,
+        )
+
+    async def run(self, names: Sequence[str] = ()) -> Dict[str, Result]:
+        """Run the benchmarks.
+
+        Args:
+            names (sequence): Names of the benchmarks to run, all of them if empty. Defaults to ().
+        """
+        benchmarks: Dict[str, Callable[[], Awaitable[Result]]] = {"startup": self.startup}
+        for concurrency in CONCURRENCY:
+            benchmarks[f"throughput_{concurrency}"] = lambda concurrency=concurrency: self.throughput(concurrency)
+        benchmarks["large_result"] = self.large_result
+
+        results = {}
+        try:
+            for name, benchmark in benchmarks.items():
+                if not names or name in names:
+                    results[name] = await benchmark()
+        finally:
+            rmtree(self.working_dir, ignore_errors=True)
+        return results
+
+    async def startup(self) -> Result:
+        """Measure the time from `client.start()` until the client is ready, engine launch included."""
+        runs = 3 if self.quick else 10
+        timings: Dict[str, List[float]] = {}
+        for _ in range(runs):
+            client = BasRemoteClient(self.options())
+            await client.start()
+            await client.close(stop_engine=True)
+            for phase, duration in client.startup_timings.items():
+                timings.setdefault(phase, []).append(duration)
+
+        metrics = latency_metrics(timings.pop("total"))
+        for phase, durations in timings.items():
+            metrics[f"{phase}_mean"] = sum(durations) / len(durations)
+        return {"params": {"runs": runs}, "metrics": metrics}
+
+    async def throughput(self, concurrency: int) -> Result:
+        """Measure calls per second and call latency with the given number of concurrent calls."""
+        calls = max(concurrency * (2 if self.quick else 10), 100 if self.quick else 1000)
+        client = BasRemoteClient(self.options())
+        await client.start()
+        try:
+            # the first calls are slower, they are not measured
+            await asyncio.gather(*[client.run_function("Add", {"X": i, "Y": i}) for i in range(min(concurrency, 10))])
+
+            latencies: List[float] = []
+            remaining = calls
+
+            async def worker():
+                nonlocal remaining
+                while remaining > 0:
+                    remaining -= 1
+                    started = time.perf_counter()
+                    await client.run_function("Add", {"X": remaining, "Y": 1})
+                    latencies.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await asyncio.gather(*[worker() for _ in range(concurrency)])
+            elapsed = time.perf_counter() - started
+        finally:
+            await client.close(stop_engine=True)
+
+        metrics = {"calls_per_second": calls / elapsed, **latency_metrics(latencies)}
+        return {"params": {"concurrency": concurrency, "calls": calls}, "metrics": metrics}
+
+    async def large_result(self) -> Result:
+        """Measure the time of calls that return a multi-megabyte result, which is mostly decoding."""
+        runs = 3 if self.quick else 10
+        client = BasRemoteClient(self.options())
+        await client.start()
+        try:
+            await client.run_function("Payload", {"Size": 1})
+
+            latencies: List[float] = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                result = await client.run_function("Payload", {"Size": LARGE_RESULT_SIZE})
+                latencies.append(time.perf_counter() - started)
+                assert len(result) == LARGE_RESULT_SIZE
+        finally:
+            await client.close(stop_engine=True)
+
+        metrics = latency_metrics(latencies)
+        metrics["mb_per_second"] = LARGE_RESULT_SIZE / (1024 * 1024) / metrics["mean"]
+        return {"params": {"size": LARGE_RESULT_SIZE, "runs": runs}, "metrics": metrics}
+
+
+__all__ = ["Suite", "CONCURRENCY", "LARGE_RESULT_SIZE", "percentile"]
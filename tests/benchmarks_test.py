@@ -0,0 +1,38 @@
+import unittest
+
+from benchmarks.compare import compare
+from benchmarks.suite import percentile
+
+
+def report(**metrics):
+    return {"results": {"throughput_10": {"params": {"concurrency": 10}, "metrics": metrics}}}
+
+
+class BenchmarksTestCase(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_compare_flags_regressions(self):
+        baseline = report(calls_per_second=1000.0, p99=0.010)
+        current = report(calls_per_second=700.0, p99=0.011)
+        rows = {row["metric"]: row for row in compare(current, baseline, threshold=0.2)}
+        self.assertTrue(rows["calls_per_second"]["regression"])
+        self.assertAlmostEqual(rows["calls_per_second"]["change"], -0.3)
+        self.assertFalse(rows["p99"]["regression"])
+
+    def test_compare_improvements(self):
+        baseline = report(calls_per_second=1000.0, p99=0.010)
+        current = report(calls_per_second=2000.0, p99=0.005)
+        self.assertFalse(any(row["regression"] for row in compare(current, baseline)))
+
+    def test_compare_skips_different_params(self):
+        baseline = report(calls_per_second=1000.0)
+        baseline["results"]["throughput_10"]["params"]["concurrency"] = 20
+        self.assertEqual(compare(report(calls_per_second=10.0), baseline), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
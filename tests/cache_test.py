@@ -0,0 +1,118 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from bas_remote.cache import MISSING, ResultCache
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.loop.close()
+
+    def test_key(self):
+        cache = ResultCache({"Add": 60})
+        self.assertIsNone(cache.key("Other", {"X": 1}))
+        self.assertEqual(cache.key("Add", {"X": 1, "Y": 2}), cache.key("Add", {"Y": 2, "X": 1}))
+        self.assertNotEqual(cache.key("Add", {"X": 1}), cache.key("Add", {"X": 2}))
+        self.assertEqual(cache.key("Add"), cache.key("Add", {}))
+
+    def test_hits_and_misses(self):
+        cache = ResultCache({"Add": 60})
+        key = cache.key("Add", {"X": 1})
+        self.assertIs(cache.get(key), MISSING)
+        cache.set(key, 2)
+        self.assertEqual(cache.get(key), 2)
+        self.assertEqual(cache.stats(), {"size": 1, "hits": 1, "misses": 1})
+
+    def test_lru(self):
+        cache = ResultCache({"Add": 60}, max_size=2)
+        keys = [cache.key("Add", {"X": i}) for i in range(3)]
+        cache.set(keys[0], 0)
+        cache.set(keys[1], 1)
+        cache.get(keys[0])
+        cache.set(keys[2], 2)
+        self.assertEqual(cache.get(keys[0]), 0)
+        self.assertIs(cache.get(keys[1]), MISSING)
+        self.assertEqual(cache.get(keys[2]), 2)
+
+    def test_ttl(self):
+        cache = ResultCache({"Add": 10})
+        key = cache.key("Add", {"X": 1})
+        cache.set(key, 2)
+        with mock.patch("bas_remote.cache.time.time", return_value=time.time() + 11):
+            self.assertIs(cache.get(key), MISSING)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_disk(self):
+        cache = self.disk_cache({"Add": 60, "Echo": 60})
+        cache.set(cache.key("Add", {"X": 1}), 2)
+        cache.set(cache.key("Echo", {"X": 1}), {"X": 1})
+        self.loop.run_until_complete(cache.flush())
+
+        # a new client reads the results stored by the previous one
+        cache = self.disk_cache({"Add": 60, "Echo": 60})
+        self.assertEqual(cache.get(cache.key("Add", {"X": 1})), 2)
+        self.assertEqual(cache.get(cache.key("Echo", {"X": 1})), {"X": 1})
+
+        cache.invalidate("Add")
+        self.loop.run_until_complete(cache.flush())
+        cache = self.disk_cache({"Add": 60, "Echo": 60})
+        self.assertIs(cache.get(cache.key("Add", {"X": 1})), MISSING)
+        self.assertEqual(cache.get(cache.key("Echo", {"X": 1})), {"X": 1})
+
+        cache.invalidate()
+        self.assertEqual(cache.stats()["size"], 0)
+        self.loop.run_until_complete(cache.flush())
+        cache = self.disk_cache({"Add": 60, "Echo": 60})
+        self.assertIs(cache.get(cache.key("Echo", {"X": 1})), MISSING)
+
+    def test_disk_limit(self):
+        cache = self.disk_cache({"Add": 60}, max_size=2)
+        keys = [cache.key("Add", {"X": i}) for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.set(key, i)
+        self.loop.run_until_complete(cache.flush())
+
+        # the files follow the results in memory
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        cache = self.disk_cache({"Add": 60}, max_size=2)
+        self.assertIs(cache.get(keys[0]), MISSING)
+        self.assertIs(cache.get(keys[1]), MISSING)
+        self.assertEqual(cache.get(keys[2]), 2)
+        self.assertEqual(cache.get(keys[3]), 3)
+
+    def test_disk_load(self):
+        cache = self.disk_cache({"Add": 60, "Echo": 60})
+        keys = [cache.key("Add", {"X": i}) for i in range(3)]
+        with mock.patch("bas_remote.cache.time.time", return_value=time.time() - 100):
+            cache.set(keys[0], 0)
+        cache.set(keys[1], 1)
+        cache.set(keys[2], 2)
+        cache.set(cache.key("Echo", {"X": 1}), {"X": 1})
+        self.loop.run_until_complete(cache.flush())
+        os.utime(cache._file_path(self.directory, keys[1]), (0, 0))
+
+        # expired results, the oldest ones above the limit and functions that are no longer cached are removed
+        cache = self.disk_cache({"Add": 60}, max_size=1)
+        self.assertEqual(cache.stats()["size"], 1)
+        self.assertEqual(cache.get(keys[2]), 2)
+        self.loop.run_until_complete(cache.flush())
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(cache._file_path(self.directory, keys[2]))])
+
+    def disk_cache(self, ttls, max_size=1000):
+        cache = ResultCache(ttls, max_size, self.directory, self.loop)
+        self.loop.run_until_complete(cache.load())
+        return cache
+
+
+if __name__ == "__main__":
+    unittest.main()
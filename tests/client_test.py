@@ -0,0 +1,76 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bas_remote import BasRemoteClient, Options
+from bas_remote.testing import FakeEngine
+from bas_remote.types import Message
+
+
+class ClientDispatchTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+        self.client = BasRemoteClient(Options(working_dir=self.working_dir, script_name="Test"), loop=self.loop)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def test_reply_resolves_request_directly(self):
+        future = self.client._requests.register(7)
+        self.client._dispatch(Message(True, "run_task", 7, "data"))
+        # no task is scheduled, the reply is already there
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), "data")
+
+    def test_global_variable_reply_is_decoded(self):
+        future = self.client._requests.register(8)
+        self.client._dispatch(Message(True, "get_global_variable", 8, '{"a": 1}'))
+        self.assertEqual(future.result(), {"a": 1})
+
+    def test_unanswered_request_expires(self):
+        self.client._requests.register(11)
+        _, timer = self.client._requests._pending[11]
+        self.assertIsNotNone(timer)
+        self.assertAlmostEqual(timer.when() - self.loop.time(), self.client.options.request_timeout, delta=1)
+        self.client._requests.discard(11)
+
+    def test_event_is_emitted_to_listeners(self):
+        received = []
+        self.client._dispatch(Message(True, "run_task", 9, "data"))
+        self.client.on("message_received", received.append)
+        message = Message(True, "run_task", 10, "data")
+        self.client._dispatch(message)
+        self.assertEqual(received, [message])
+
+    def test_events_with_engine(self):
+        engine = FakeEngine()
+        received, sent = [], []
+        self.client.on("message_received", lambda message: received.append(message.type_))
+        self.client.on("message_sent", lambda message: sent.append(message.type_))
+        self.client._engine.initialize = mock.AsyncMock()
+        self.client._engine.start = mock.AsyncMock()
+        self.client._engine.close = mock.AsyncMock()
+
+        async def main():
+            port = await engine.start()
+            try:
+                with mock.patch("bas_remote.client.find_free_port", return_value=port):
+                    await self.client.start()
+                try:
+                    return await self.client.run_function("Add", {"X": 1, "Y": 2})
+                finally:
+                    await self.client.close()
+            finally:
+                await engine.close()
+
+        self.assertEqual(self.loop.run_until_complete(main()), 3)
+        self.assertEqual(received, ["initialize", "thread_start", "run_task"])
+        self.assertEqual(sent, ["remote_control_data", "accept_resources", "start_thread", "run_task", "stop_thread"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from bas_remote.metrics import Histogram, Metrics
+
+
+class HistogramTestCase(unittest.TestCase):
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+
+class MetricsTestCase(unittest.TestCase):
+    def test_to_dict(self):
+        metrics = Metrics(buckets=(1.0,))
+        metrics.observe("Add", "run_task", 0.5)
+        metrics.count_error(ValueError())
+        metrics.count_sent(10)
+        metrics.count_received(30, 2)
+
+        result = metrics.to_dict()
+        self.assertEqual(result["durations"]["Add"]["run_task"]["buckets"], {1.0: 1, float("inf"): 0})
+        self.assertEqual(result["errors"], {"ValueError": 1})
+        self.assertEqual((result["bytes_sent"], result["messages_sent"]), (10, 1))
+        self.assertEqual((result["bytes_received"], result["messages_received"]), (30, 2))
+
+    def test_to_prometheus(self):
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.observe('Say "hi"', "total", 0.05)
+        metrics.observe('Say "hi"', "total", 5.0)
+        metrics.count_error(ValueError())
+
+        lines = metrics.to_prometheus({"in_flight": 3}).splitlines()
+        labels = 'function="Say \\"hi\\"",phase="total"'
+        self.assertIn(f'bas_remote_function_duration_seconds_bucket{{{labels},le="0.1"}} 1', lines)
+        self.assertIn(f'bas_remote_function_duration_seconds_bucket{{{labels},le="1.0"}} 1', lines)
+        self.assertIn(f'bas_remote_function_duration_seconds_bucket{{{labels},le="+Inf"}} 2', lines)
+        self.assertIn(f"bas_remote_function_duration_seconds_count{{{labels}}} 2", lines)
+        self.assertIn('bas_remote_errors_total{error="ValueError"} 1', lines)
+        self.assertIn("# TYPE bas_remote_in_flight gauge", lines)
+        self.assertIn("bas_remote_in_flight 3", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bas_remote import BasRemoteClientPool, Options
+from bas_remote.errors import AuthenticationError, ClientNotStartedError
+
+
+class PoolTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+        options = Options(working_dir=self.working_dir, script_name="TestRemoteControlV2")
+        self.pool = BasRemoteClientPool(options, size=3, loop=self.loop)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def test_pool_size(self):
+        self.assertEqual(self.pool.size, 3)
+        self.assertEqual(len(set(self.pool.clients)), 3)
+
+    def test_pool_not_started(self):
+        with self.assertRaises(ClientNotStartedError):
+            self.pool.create_thread()
+
+    def test_pool_least_loaded(self):
+        self.pool._is_started = True
+        clients = self.pool.clients
+        clients[0]._load = 2
+        clients[1]._load = 0
+        clients[2]._load = 1
+        self.assertIs(self.pool._select(), clients[1])
+
+    def test_pool_threads_are_spread(self):
+        self.pool._is_started = True
+        threads = [self.pool.create_thread() for _ in range(3)]
+        self.assertEqual(len({thread._client for thread in threads}), 3)
+
+    def test_failed_start_closes_clients(self):
+        clients = self.pool.clients
+        for client in clients:
+            client.start = mock.AsyncMock(side_effect=lambda client=client: setattr(client, "_is_started", True))
+            client.close = mock.AsyncMock()
+        clients[2].start.side_effect = AuthenticationError()
+
+        with self.assertRaises(AuthenticationError):
+            self.loop.run_until_complete(self.pool.start())
+        self.assertFalse(self.pool.is_started)
+        self.assertEqual([client.close.await_count for client in clients], [1, 1, 0])
+
+    def test_pool_run_directories(self):
+        engines = [client._engine for client in self.pool.clients]
+        for engine in engines:
+            engine._exe_name = "abcde"
+            engine._acquire_run_directory()
+
+        directories = [engine.run_directory for engine in engines]
+        self.assertEqual(
+            [os.path.basename(directory) for directory in directories],
+            ["abcde", "abcde_1", "abcde_2"],
+        )
+
+        for engine in engines:
+            engine.lock_release()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bas_remote import BasRemoteClient, Options
+from bas_remote.errors import ConnectionLostError
+from bas_remote.testing import FakeEngine
+
+
+class ReconnectTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+        # the connection is broken on the first task, without a reply
+        self.engine = FakeEngine(drop_after=1)
+        self.port = self.loop.run_until_complete(self.engine.start())
+
+    def tearDown(self) -> None:
+        self.loop.run_until_complete(self.engine.close())
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def create_client(self) -> BasRemoteClient:
+        options = Options(working_dir=self.working_dir, script_name="Test", reconnect=True, reconnect_timeout=5)
+        client = BasRemoteClient(options, loop=self.loop)
+        client._engine.initialize = mock.AsyncMock()
+        client._engine.start = mock.AsyncMock()
+        client._engine.close = mock.AsyncMock()
+        return client
+
+    def run_client(self, main):
+        client = self.create_client()
+
+        async def run():
+            with mock.patch("bas_remote.client.find_free_port", return_value=self.port):
+                await client.start()
+            try:
+                return await main(client)
+            finally:
+                await client.close()
+
+        return client, self.loop.run_until_complete(run())
+
+    def test_idempotent_function_is_reissued(self):
+        async def main(client):
+            return await client.run_function("Add", {"X": 1, "Y": 2}, idempotent=True)
+
+        client, result = self.run_client(main)
+        self.assertEqual(result, 3)
+        self.assertEqual((self.engine.connections, self.engine.received, self.engine.tasks), (2, 2, 1))
+        stats = client.reconnect_stats()
+        self.assertEqual(stats["reconnects"], 1)
+        self.assertEqual(stats["reissued"], 1)
+        self.assertEqual(stats["lost"], 1)
+
+    def test_function_fails_without_flag(self):
+        async def main(client):
+            with self.assertRaises(ConnectionLostError):
+                await client.run_function("Add", {"X": 1, "Y": 2})
+            # the client keeps working on the new connection
+            return await client.run_function("Add", {"X": 2, "Y": 2})
+
+        client, result = self.run_client(main)
+        self.assertEqual(result, 4)
+        self.assertEqual((self.engine.connections, self.engine.received, self.engine.tasks), (2, 2, 1))
+        self.assertEqual(client.reconnect_stats()["reissued"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+from bas_remote.errors import RequestTimeoutError
+from bas_remote.registry import MAX_ID, RequestRegistry
+
+
+class RequestRegistryTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def test_ids_are_unique(self):
+        registry = RequestRegistry(self.loop)
+        ids = [registry.next_id() for _ in range(1000)]
+        self.assertEqual(len(set(ids)), 1000)
+
+    def test_ids_skip_pending(self):
+        registry = RequestRegistry(self.loop)
+        registry._last_id = MAX_ID - 1
+        registry.register(1)
+        self.assertEqual(registry.next_id(), MAX_ID)
+        self.assertEqual(registry.next_id(), 2)
+
+    def test_resolve(self):
+        registry = RequestRegistry(self.loop)
+        future = registry.register(1)
+        self.assertTrue(registry.resolve(1, "data"))
+        self.assertEqual(self.loop.run_until_complete(future), "data")
+        self.assertEqual(len(registry), 0)
+        self.assertFalse(registry.resolve(1, "data"))
+
+    def test_reject_all(self):
+        registry = RequestRegistry(self.loop)
+        futures = [registry.register(i) for i in range(1, 4)]
+        registry.reject_all(ValueError("closed"))
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(len(registry), 0)
+
+    def test_timeout(self):
+        registry = RequestRegistry(self.loop, timeout=0.01)
+        future = registry.register(1)
+        with self.assertRaises(RequestTimeoutError):
+            self.loop.run_until_complete(future)
+        self.assertNotIn(1, registry)
+
+    def test_cancelled_request_removed(self):
+        registry = RequestRegistry(self.loop, timeout=10)
+        future = registry.register(1)
+        future.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(len(registry), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import unittest
+
+from bas_remote.errors import FunctionError
+from bas_remote.runners import BasFunction, BasThread
+from bas_remote.runners.flight import SingleFlight
+from tests.runners.function_test import FakeClient
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.client = FakeClient(self.loop)
+        self.client._single_flight = SingleFlight(["Test"])
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    async def settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def test_identical_calls_share_run(self):
+        async def scenario():
+            calls = [BasFunction(self.client, "Test", {"value": 5, "delay": 0.05}) for _ in range(5)]
+            calls.append(BasThread(self.client).run_function("Test", {"delay": 0.05, "value": 5}))
+            results = await asyncio.gather(*calls)
+            # the next call runs the function again
+            results.append(await BasFunction(self.client, "Test", {"value": 5, "delay": 0.05}))
+            return results
+
+        self.assertEqual(self.run_async(scenario()), [5] * 7)
+        self.assertEqual(len(self.client.started), 2)
+        self.assertEqual(self.client._load, 0)
+        self.assertEqual(self.client._single_flight.stats(), {"running": 0, "started": 2, "joined": 5})
+
+    def test_different_calls_are_not_shared(self):
+        async def scenario():
+            return await asyncio.gather(
+                BasFunction(self.client, "Test", {"value": 1, "delay": 0.05}),
+                BasFunction(self.client, "Test", {"value": 2, "delay": 0.05}),
+                BasFunction(self.client, "Other", {"value": 1, "delay": 0.05}),
+                BasFunction(self.client, "Other", {"value": 1, "delay": 0.05}),
+            )
+
+        self.assertEqual(self.run_async(scenario()), [1, 2, 1, 1])
+        self.assertEqual(len(self.client.started), 4)
+
+    def test_exception_is_shared(self):
+        async def send_async(type_, data=None, timeout=None, span=None):
+            await asyncio.sleep(0.05)
+            return json.dumps({"Success": False, "Message": "error", "Result": None})
+
+        self.client.send_async = send_async
+
+        async def scenario():
+            calls = [BasFunction(self.client, "Test", {"value": 5}) for _ in range(3)]
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        results = self.run_async(scenario())
+        self.assertTrue(all(isinstance(result, FunctionError) for result in results))
+        self.assertEqual(len(self.client.started), 1)
+
+    def test_cancelled_caller_keeps_run(self):
+        async def scenario():
+            first = self.loop.create_task(self.await_function())
+            await asyncio.sleep(0.01)
+            second = self.loop.create_task(self.await_function())
+            await asyncio.sleep(0.01)
+            first.cancel()
+            result = await second
+            await self.settle()
+            return result
+
+        self.assertEqual(self.run_async(scenario()), 5)
+        self.assertEqual(len(self.client.started), 1)
+        self.assertEqual(self.client.stopped, self.client.started)
+
+    def test_run_stopped_when_all_callers_cancelled(self):
+        async def scenario():
+            tasks = [self.loop.create_task(self.await_function(delay=10)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            for task in tasks:
+                task.cancel()
+            await self.settle()
+
+        self.run_async(scenario())
+        self.assertEqual(len(self.client.started), 1)
+        self.assertEqual(self.client.stopped, self.client.started)
+        self.assertEqual(self.client.pending, 0)
+        self.assertEqual(self.client._single_flight.stats()["running"], 0)
+
+    async def await_function(self, delay=0.05):
+        return await BasFunction(self.client, "Test", {"value": 5, "delay": delay})
+
+
+if __name__ == "__main__":
+    unittest.main()
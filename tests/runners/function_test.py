@@ -0,0 +1,235 @@
+import asyncio
+import json
+import unittest
+from contextlib import asynccontextmanager
+
+from bas_remote.cache import ResultCache
+from bas_remote.errors import FunctionError, FunctionTimeoutError, QueueFullError
+from bas_remote.metrics import Metrics
+from bas_remote.runners import BasFunction, BasThread, BasThreadPool
+from bas_remote.scheduler import Scheduler
+from bas_remote.tracing import Span, Tracer
+from bas_remote.types import codec
+
+
+class FakeClient:
+    is_started = True
+    thread_pool = None
+    _load = 0
+    _generation = 0
+    _metrics = None
+    _result_cache = None
+    _single_flight = None
+    _tracer = Tracer()
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.scheduler = Scheduler(loop)
+        self.started = []
+        self.stopped = []
+        self.pending = 0
+
+    @asynccontextmanager
+    async def _running(self):
+        yield
+
+    async def start_thread(self, thread_id):
+        self.started.append(thread_id)
+
+    async def stop_thread(self, thread_id):
+        self.stopped.append(thread_id)
+
+    async def send_async(self, type_, data=None, timeout=None, span=None):
+        params = json.loads(data["params"])
+        self.pending += 1
+        try:
+            await asyncio.sleep(params.get("delay", 0))
+        finally:
+            self.pending -= 1
+        return json.dumps({"Success": True, "Message": "", "Result": params.get("value")})
+
+
+class RecordingSpan(Span):
+    def __init__(self, name, parent):
+        self.name = name
+        self.parent = parent
+        self.attributes = {}
+        self.exception = None
+        self.is_ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exc):
+        self.exception = exc
+
+    def end(self):
+        self.is_ended = True
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, parent=None):
+        span = RecordingSpan(name, parent)
+        self.spans.append(span)
+        return span
+
+
+class FunctionTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.client = FakeClient(self.loop)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    async def settle(self):
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    def test_function_result(self):
+        result = self.run_async(self.await_function({"value": 5}))
+        self.assertEqual(result, 5)
+        self.assertEqual(self.client.started, self.client.stopped)
+        self.assertEqual(self.client._load, 0)
+
+    async def await_function(self, params, timeout=None):
+        return await BasFunction(self.client, "Test", params, timeout=timeout)
+
+    def test_function_timeout(self):
+        with self.assertRaises(FunctionTimeoutError):
+            self.run_async(self.await_function({"delay": 10}, timeout=0.01))
+        self.run_async(self.settle())
+        self.assertEqual(self.client.stopped, self.client.started)
+        self.assertEqual(self.client.pending, 0)
+        self.assertEqual(self.client.scheduler.in_flight, 0)
+
+    def test_function_cancelled(self):
+        async def scenario():
+            task = self.loop.create_task(self.await_function({"delay": 10}))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            await self.settle()
+
+        self.run_async(scenario())
+        self.assertEqual(self.client.stopped, self.client.started)
+        self.assertEqual(self.client.pending, 0)
+
+    def test_thread_started_after_admission(self):
+        self.client.scheduler = Scheduler(self.loop, max_in_flight=1, max_queue_size=1)
+
+        async def scenario():
+            running = self.loop.create_task(self.await_function({"delay": 0.05, "value": 1}))
+            await self.settle()
+            queued = self.loop.create_task(self.await_function({"value": 2}))
+            await self.settle()
+            self.assertEqual(len(self.client.started), 1)
+            with self.assertRaises(QueueFullError):
+                await self.await_function({"value": 3})
+            self.assertEqual(len(self.client.started), 1)
+            return await asyncio.gather(running, queued)
+
+        self.assertEqual(self.run_async(scenario()), [1, 2])
+        self.assertEqual(self.client.stopped, self.client.started)
+        self.assertEqual(self.client.scheduler.in_flight, 0)
+
+    def test_pooled_thread_discarded_on_timeout(self):
+        self.client.thread_pool = BasThreadPool(self.client, max_size=1)
+        with self.assertRaises(FunctionTimeoutError):
+            self.run_async(self.await_function({"delay": 10}, timeout=0.01))
+        self.run_async(self.settle())
+        self.assertEqual(self.client.thread_pool.size, 0)
+        self.assertEqual(self.client.stopped, self.client.started)
+
+    def test_thread_timeout(self):
+        thread = BasThread(self.client)
+
+        async def scenario():
+            with self.assertRaises(FunctionTimeoutError):
+                await thread.run_function("Test", {"delay": 10}, timeout=0.01)
+            await self.settle()
+            return await thread.run_function("Test", {"value": 1})
+
+        self.assertEqual(self.run_async(scenario()), 1)
+        self.assertEqual(len(self.client.stopped), 1)
+        self.assertEqual(len(self.client.started), 2)
+
+    def test_cached_result(self):
+        self.client._result_cache = ResultCache({"Test": 60})
+
+        async def scenario():
+            first = await BasFunction(self.client, "Test", {"value": 5, "delay": 0})
+            second = await BasFunction(self.client, "Test", {"delay": 0, "value": 5})
+            thread = await BasThread(self.client).run_function("Test", {"value": 5, "delay": 0})
+            other = await BasFunction(self.client, "Test", {"value": 6})
+            return first, second, thread, other
+
+        self.assertEqual(self.run_async(scenario()), (5, 5, 5, 6))
+        # cached calls don't start threads
+        self.assertEqual(len(self.client.started), 2)
+        self.assertEqual(self.client._load, 0)
+        self.assertEqual(self.client._result_cache.stats(), {"size": 2, "hits": 2, "misses": 2})
+
+    def test_errors_are_not_cached(self):
+        self.client._result_cache = ResultCache({"Test": 60})
+
+        async def send_async(type_, data=None, timeout=None, span=None):
+            return json.dumps({"Success": False, "Message": "error", "Result": None})
+
+        self.client.send_async = send_async
+        for _ in range(2):
+            with self.assertRaises(FunctionError):
+                self.run_async(self.await_function({"value": 5}))
+        self.assertEqual(len(self.client.started), 2)
+        self.assertEqual(self.client._result_cache.stats()["size"], 0)
+
+    def test_metrics(self):
+        self.client._metrics = Metrics()
+
+        async def scenario():
+            await self.await_function({"value": 1, "delay": 0.02})
+            with self.assertRaises(FunctionTimeoutError):
+                await self.await_function({"delay": 10}, timeout=0.01)
+
+        self.run_async(scenario())
+        metrics = self.client._metrics.to_dict()
+        phases = metrics["durations"]["Test"]
+        self.assertEqual(phases["total"]["count"], 2)
+        self.assertEqual(phases["start_thread"]["count"], 2)
+        # the function that timed out is stopped too
+        self.assertEqual(phases["stop_thread"]["count"], 2)
+        self.assertGreaterEqual(phases["run_task"]["sum"], 0.02)
+        self.assertEqual(metrics["errors"], {"FunctionTimeoutError": 1})
+
+    def test_tracing(self):
+        self.client._tracer = RecordingTracer()
+        self.run_async(self.await_function({"value": 1}))
+
+        spans = {span.name: span for span in self.client._tracer.spans}
+        names = ["bas.run_function", "bas.start_thread", "bas.run_task", "bas.decode", "bas.stop_thread"]
+        self.assertEqual(list(spans), names)
+        root = spans["bas.run_function"]
+        self.assertIsNone(root.parent)
+        self.assertEqual(root.attributes, {"bas.function": "Test", "bas.thread_id": self.client.started[0]})
+        self.assertTrue(all(span.parent is root for name, span in spans.items() if name != "bas.run_function"))
+        self.assertEqual(spans["bas.run_task"].attributes["bas.payload_size"], len(codec.dumps({"value": 1})))
+        self.assertTrue(all(span.is_ended for span in spans.values()))
+
+    def test_tracing_error(self):
+        self.client._tracer = RecordingTracer()
+        with self.assertRaises(FunctionTimeoutError):
+            self.run_async(self.await_function({"delay": 10}, timeout=0.01))
+        self.run_async(self.settle())
+
+        root = self.client._tracer.spans[0]
+        self.assertIsInstance(root.exception, FunctionTimeoutError)
+        self.assertTrue(all(span.is_ended for span in self.client._tracer.spans))
+
+
+if __name__ == "__main__":
+    unittest.main()
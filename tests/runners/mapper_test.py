@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from bas_remote.runners.mapper import map_ordered, map_unordered
+
+
+class MapperTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    async def run_function(self, name, params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(params["delay"])
+            if params.get("fail"):
+                raise ValueError(name)
+            return params["value"]
+        finally:
+            self.in_flight -= 1
+
+    def collect(self, iterator):
+        async def collect():
+            return [item async for item in iterator]
+
+        return self.loop.run_until_complete(collect())
+
+    def test_unordered_completion_order(self):
+        params = [{"value": 1, "delay": 0.03}, {"value": 2, "delay": 0.01}, {"value": 3, "delay": 0.02}]
+        result = self.collect(map_unordered(self.run_function, "Test", params, concurrency=3))
+        self.assertEqual([value for _, value in result], [2, 3, 1])
+
+    def test_ordered_input_order(self):
+        params = [{"value": 1, "delay": 0.03}, {"value": 2, "delay": 0.01}, {"value": 3, "delay": 0.02}]
+        result = self.collect(map_ordered(self.run_function, "Test", params, concurrency=3))
+        self.assertEqual([value for _, value in result], [1, 2, 3])
+        self.assertEqual([item for item, _ in result], params)
+
+    def test_concurrency_limit(self):
+        for mapper in [map_ordered, map_unordered]:
+            with self.subTest(mapper=mapper.__name__):
+                self.max_in_flight = 0
+                params = ({"value": i, "delay": 0.001} for i in range(50))
+                result = self.collect(mapper(self.run_function, "Test", params, concurrency=4))
+                self.assertEqual(sorted(value for _, value in result), list(range(50)))
+                self.assertEqual(self.max_in_flight, 4)
+
+    def test_input_read_lazily(self):
+        pulled = []
+
+        def params():
+            for i in range(100):
+                pulled.append(i)
+                yield {"value": i, "delay": 0}
+
+        async def first():
+            iterator = map_unordered(self.run_function, "Test", params(), concurrency=2)
+            result = await iterator.__anext__()
+            await iterator.aclose()
+            return result
+
+        self.loop.run_until_complete(first())
+        self.assertLessEqual(len(pulled), 3)
+
+    def test_async_iterable_and_errors(self):
+        async def params():
+            yield {"value": 1, "delay": 0}
+            yield {"value": 2, "delay": 0, "fail": True}
+
+        result = self.collect(map_ordered(self.run_function, "Test", params(), concurrency=2))
+        self.assertEqual(result[0][1], 1)
+        self.assertIsInstance(result[1][1], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
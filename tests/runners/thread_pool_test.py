@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+
+from bas_remote.runners import BasThreadPool
+
+
+class FakeClient:
+    is_started = True
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.started = []
+        self.stopped = []
+
+    async def start_thread(self, thread_id):
+        self.started.append(thread_id)
+
+    async def stop_thread(self, thread_id):
+        self.stopped.append(thread_id)
+
+
+class ThreadPoolTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.client = FakeClient(self.loop)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_min_size_started(self):
+        pool = BasThreadPool(self.client, min_size=2, max_size=4)
+        self.run_async(pool.start())
+        self.assertEqual(len(self.client.started), 2)
+        self.assertEqual(pool.idle, 2)
+
+    def test_thread_reused(self):
+        pool = BasThreadPool(self.client, max_size=2)
+        first = self.run_async(pool.acquire())
+        pool.release(first)
+        second = self.run_async(pool.acquire())
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.started, [first])
+
+    def test_max_size_waits(self):
+        pool = BasThreadPool(self.client, max_size=1)
+
+        async def scenario():
+            first = await pool.acquire()
+            waiter = self.loop.create_task(pool.acquire())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            pool.release(first)
+            return first, await waiter
+
+        first, second = self.run_async(scenario())
+        self.assertEqual(first, second)
+        self.assertEqual(pool.size, 1)
+
+    def test_discarded_thread_stopped(self):
+        pool = BasThreadPool(self.client, max_size=1)
+
+        async def scenario():
+            thread_id = await pool.acquire()
+            pool.release(thread_id, discard=True)
+            await asyncio.sleep(0)
+            return thread_id
+
+        thread_id = self.run_async(scenario())
+        self.assertEqual(self.client.stopped, [thread_id])
+        self.assertEqual(pool.size, 0)
+
+    def test_idle_eviction(self):
+        pool = BasThreadPool(self.client, min_size=1, max_size=3, idle_timeout=0.01)
+
+        async def scenario():
+            await pool.start()
+            ids = [await pool.acquire() for _ in range(3)]
+            for thread_id in ids:
+                pool.release(thread_id)
+            await asyncio.sleep(0.05)
+
+        self.run_async(scenario())
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(len(self.client.stopped), 2)
+
+    def test_close_stops_idle(self):
+        pool = BasThreadPool(self.client, min_size=2, max_size=2)
+        self.run_async(pool.start())
+        self.run_async(pool.close())
+        self.assertEqual(sorted(self.client.stopped), sorted(self.client.started))
+
+
+if __name__ == "__main__":
+    unittest.main()
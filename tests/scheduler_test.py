@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+from bas_remote.errors import QueueFullError
+from bas_remote.scheduler import Scheduler
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_unlimited(self):
+        scheduler = Scheduler(self.loop)
+        for _ in range(100):
+            self.run_async(scheduler.acquire())
+        self.assertEqual(scheduler.in_flight, 100)
+        self.assertEqual(scheduler.queue_depth, 0)
+
+    def test_queue_full_rejected(self):
+        scheduler = Scheduler(self.loop, max_in_flight=1, max_queue_size=1)
+
+        async def scenario():
+            await scheduler.acquire()
+            waiter = self.loop.create_task(scheduler.acquire())
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.queue_depth, 1)
+            with self.assertRaises(QueueFullError):
+                await scheduler.acquire()
+            scheduler.release()
+            await waiter
+
+        self.run_async(scenario())
+        self.assertEqual(scheduler.in_flight, 1)
+        self.assertEqual(scheduler.stats()["rejected"], 1)
+        self.assertEqual(scheduler.stats()["wait_count"], 1)
+
+    def test_priority_order(self):
+        scheduler = Scheduler(self.loop, max_in_flight=1, max_queue_size=10)
+        order = []
+
+        async def task(name, priority):
+            async with scheduler.slot(priority):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async def scenario():
+            await scheduler.acquire()
+            tasks = [
+                self.loop.create_task(task("low", 0)),
+                self.loop.create_task(task("high", 5)),
+                self.loop.create_task(task("low-2", 0)),
+                self.loop.create_task(task("medium", 1)),
+            ]
+            await asyncio.sleep(0)
+            scheduler.release()
+            await asyncio.gather(*tasks)
+
+        self.run_async(scenario())
+        self.assertEqual(order, ["high", "medium", "low", "low-2"])
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_cancelled_waiter(self):
+        scheduler = Scheduler(self.loop, max_in_flight=1, max_queue_size=10)
+
+        async def scenario():
+            await scheduler.acquire()
+            waiter = self.loop.create_task(scheduler.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.queue_depth, 0)
+            scheduler.release()
+
+        self.run_async(scenario())
+        self.assertEqual(scheduler.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from zipfile import BadZipFile, ZipFile
+
+from bas_remote.services.archive import extract_archive
+
+
+class ExtractArchiveTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.temp_dir = tempfile.mkdtemp()
+        self.zip_path = os.path.join(self.temp_dir, "engine.zip")
+        self.target_dir = os.path.join(self.temp_dir, "engine")
+        self.files = {f"dir{i % 3}/file{i}.bin": os.urandom(1000 * (i + 1)) for i in range(20)}
+        self.files["FastExecuteScript.exe"] = b"exe"
+
+        with ZipFile(self.zip_path, "w") as file:
+            for name, content in self.files.items():
+                file.writestr(name, content)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_extract(self):
+        self.loop.run_until_complete(extract_archive(self.zip_path, self.target_dir, workers=3))
+        for name, content in self.files.items():
+            with open(os.path.join(self.target_dir, name), "rb") as file:
+                self.assertEqual(file.read(), content)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["engine", "engine.zip"])
+
+    def test_damaged_archive_keeps_target(self):
+        os.makedirs(self.target_dir)
+        with open(os.path.join(self.target_dir, "FastExecuteScript.exe"), "wb") as file:
+            file.write(b"old")
+
+        with open(self.zip_path, "r+b") as file:
+            data = bytearray(file.read())
+            offset = data.index(self.files["dir0/file0.bin"][:100])
+            data[offset] ^= 0xFF
+            file.seek(0)
+            file.write(data)
+
+        with self.assertRaises(BadZipFile):
+            self.loop.run_until_complete(extract_archive(self.zip_path, self.target_dir, workers=2))
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["engine", "engine.zip"])
+        self.assertEqual(os.listdir(self.target_dir), ["FastExecuteScript.exe"])
+        with open(os.path.join(self.target_dir, "FastExecuteScript.exe"), "rb") as file:
+            self.assertEqual(file.read(), b"old")
+
+    def test_cancelled_extraction(self):
+        with ZipFile(self.zip_path, "w") as file:
+            for i in range(200):
+                file.writestr(f"dir/file{i}.bin", os.urandom(100000))
+
+        async def main():
+            task = asyncio.ensure_future(extract_archive(self.zip_path, self.target_dir, workers=2))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.loop.run_until_complete(main())
+        # the workers are stopped, nothing is written after the cancellation
+        self.assertEqual(os.listdir(self.temp_dir), ["engine.zip"])
+
+
+if __name__ == "__main__":
+    unittest.main()
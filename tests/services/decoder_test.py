@@ -0,0 +1,56 @@
+import unittest
+
+from bas_remote.services.decoder import SEPARATOR, MessageDecoder
+
+
+class MessageDecoderTestCase(unittest.TestCase):
+    def test_single_message(self):
+        decoder = MessageDecoder()
+        self.assertEqual(decoder.feed('{"id":1}' + SEPARATOR), ['{"id":1}'])
+        self.assertEqual(decoder.pending, 0)
+
+    def test_many_messages_in_one_frame(self):
+        decoder = MessageDecoder()
+        messages = ['{"id":%d}' % i for i in range(100)]
+        self.assertEqual(decoder.feed(SEPARATOR.join(messages) + SEPARATOR), messages)
+
+    def test_partial_message_is_not_emitted(self):
+        decoder = MessageDecoder()
+        self.assertEqual(decoder.feed('{"id":1}' + SEPARATOR + '{"id":'), ['{"id":1}'])
+        self.assertEqual(decoder.pending, len('{"id":'))
+        self.assertEqual(decoder.feed("2}" + SEPARATOR), ['{"id":2}'])
+
+    def test_message_split_across_frames(self):
+        message = "x" * 10000
+        packet = message + SEPARATOR
+        for size in [1, 3, 7, len(SEPARATOR), 1000]:
+            with self.subTest(size=size):
+                decoder = MessageDecoder()
+                result = []
+                for i in range(0, len(packet), size):
+                    end = i + size
+                    result.extend(decoder.feed(packet[i:end]))
+                self.assertEqual(result, [message])
+                self.assertEqual(decoder.pending, 0)
+
+    def test_separator_split_across_frames(self):
+        packet = "a" + SEPARATOR + "b" + SEPARATOR
+        for cut in range(1, len(packet)):
+            with self.subTest(cut=cut):
+                decoder = MessageDecoder()
+                result = decoder.feed(packet[:cut]) + decoder.feed(packet[cut:])
+                self.assertEqual(result, ["a", "b"])
+
+    def test_empty_messages_skipped(self):
+        decoder = MessageDecoder()
+        self.assertEqual(decoder.feed(SEPARATOR + SEPARATOR + "a" + SEPARATOR), ["a"])
+
+    def test_reset(self):
+        decoder = MessageDecoder()
+        decoder.feed("garbage")
+        decoder.reset()
+        self.assertEqual(decoder.feed("a" + SEPARATOR), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from aiohttp import ClientResponseError, ClientSession, web
+
+from bas_remote.errors import DownloadError
+from bas_remote.services import download
+from bas_remote.services.download import download_file
+
+
+class DownloadTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.temp_dir = tempfile.mkdtemp()
+        self.content = os.urandom(3 * 1024 * 1024 + 123)
+        self.source_path = os.path.join(self.temp_dir, "source.zip")
+        self.file_path = os.path.join(self.temp_dir, "engine", "engine.zip")
+        os.makedirs(os.path.dirname(self.file_path))
+        with open(self.source_path, "wb") as file:
+            file.write(self.content)
+
+        self.ranges = []
+        self.reject_head = False
+        self.ignore_ranges = False
+        self.failed_range = None
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            if request.method == "HEAD" and self.reject_head:
+                raise web.HTTPMethodNotAllowed("HEAD", ["GET"])
+            header = request.headers.get("Range")
+            self.ranges.append(header)
+            if header is not None and header == self.failed_range:
+                # fails after the other segments are downloaded
+                await asyncio.sleep(0.2)
+                raise web.HTTPServiceUnavailable()
+            if header is not None and self.ignore_ranges:
+                with open(self.source_path, "rb") as file:
+                    return web.Response(body=file.read(), headers={"Accept-Ranges": "bytes"})
+            return web.FileResponse(self.source_path)
+
+        app = web.Application()
+        app.router.add_route("*", "/engine.zip", handler)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.url = f"http://127.0.0.1:{self.runner.addresses[0][1]}/engine.zip"
+
+        self.min_segment_size = download.MIN_SEGMENT_SIZE
+        download.MIN_SEGMENT_SIZE = 1024 * 1024
+
+    def tearDown(self) -> None:
+        download.MIN_SEGMENT_SIZE = self.min_segment_size
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def download(self, **kwargs):
+        async def run():
+            async with ClientSession() as session:
+                await download_file(session, self.url, self.file_path, **kwargs)
+
+        self.loop.run_until_complete(run())
+
+    def read(self) -> bytes:
+        with open(self.file_path, "rb") as file:
+            return file.read()
+
+    def test_parallel_download(self):
+        self.download(connections=3, sha256=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(len([header for header in self.ranges if header]), 3)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.file_path)) if ".part" in name], [])
+
+    def test_resume_partial_segment(self):
+        size = len(self.content)
+        start, end = download._segments(size, 1)[0]
+        with open(f"{self.file_path}.part-{start}-{end}", "wb") as file:
+            file.write(self.content[:1000])
+
+        self.download(connections=1)
+        self.assertEqual(self.read(), self.content)
+        self.assertIn(f"bytes=1000-{size - 1}", self.ranges)
+
+    def test_overlong_segment_downloaded_again(self):
+        size = len(self.content)
+        start, end = download._segments(size, 1)[0]
+        with open(f"{self.file_path}.part-{start}-{end}", "wb") as file:
+            file.write(self.content + b"garbage")
+
+        self.download(connections=1)
+        self.assertEqual(self.read(), self.content)
+        self.assertIn(f"bytes=0-{size - 1}", self.ranges)
+
+    def test_stale_parts_removed(self):
+        # parts of a previous version of the file with another size
+        stale = [f"{self.file_path}.part-0-999", f"{self.file_path}.part"]
+        for part_path in stale:
+            with open(part_path, "wb") as file:
+                file.write(b"old")
+
+        self.download(connections=3)
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.file_path)) if ".part" in name], [])
+
+    def test_incomplete_segment_cleaned_up(self):
+        with mock.patch.object(download, "_join_segments", side_effect=DownloadError("Segment is incomplete")):
+            with self.assertRaises(DownloadError):
+                self.download(connections=3)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.file_path)) if ".part" in name], [])
+
+        # the next start is not stuck
+        self.download(connections=3)
+        self.assertEqual(self.read(), self.content)
+
+    def test_head_rejected(self):
+        self.reject_head = True
+        self.download(connections=3, sha256=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(self.ranges, [None])
+
+    def test_ranges_ignored(self):
+        self.ignore_ranges = True
+        self.download(connections=3)
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual(self.ranges[-1], None)
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.file_path)) if ".part" in name], [])
+
+    def test_failed_segment_keeps_parts(self):
+        size = len(self.content)
+        segments = download._segments(size, 3)
+        start, end = segments[-1]
+        self.failed_range = f"bytes={start}-{end}"
+        with self.assertRaises(ClientResponseError):
+            self.download(connections=3)
+
+        # the completed segments are not downloaded again
+        self.failed_range = None
+        self.ranges = []
+        self.download(connections=3)
+        self.assertEqual(self.read(), self.content)
+        self.assertEqual([header for header in self.ranges if header], [f"bytes={start}-{end}"])
+
+    def test_checksum_mismatch(self):
+        with self.assertRaises(DownloadError):
+            self.download(sha256="0" * 64)
+        self.assertFalse(os.path.exists(self.file_path))
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.file_path)) if ".part" in name], [])
+
+    def test_existing_file_skipped(self):
+        with open(self.file_path, "wb") as file:
+            file.write(b"done")
+        self.download()
+        self.assertEqual(self.ranges, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from bas_remote import Options
+from bas_remote.services import EngineService
+from bas_remote.services.engine_state import EngineState
+
+
+class EngineStateTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self) -> None:
+        self.server.close()
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def create_engine(self) -> EngineService:
+        options = Options(working_dir=self.working_dir, script_name="Test", detach_engine=True)
+        engine = EngineService(SimpleNamespace(options=options, loop=self.loop))
+        engine._exe_name = "abcde"
+        return engine
+
+    def create_run_directory(self, name: str, state: EngineState = None) -> str:
+        dir_path = os.path.join(self.working_dir, "run", "Test", name)
+        os.makedirs(dir_path)
+        if state is not None:
+            state.save(dir_path)
+        return dir_path
+
+    def test_save_and_load(self):
+        dir_path = self.create_run_directory("abcde", EngineState(os.getpid(), self.port))
+        state = EngineState.load(dir_path)
+        self.assertEqual((state.pid, state.port), (os.getpid(), self.port))
+        self.assertTrue(self.loop.run_until_complete(state.is_alive()))
+
+        EngineState.remove(dir_path)
+        self.assertIsNone(EngineState.load(dir_path))
+
+    def test_closed_port_is_not_alive(self):
+        self.server.close()
+        self.assertFalse(self.loop.run_until_complete(EngineState(os.getpid(), self.port).is_alive()))
+
+    def test_attach_to_running_engine(self):
+        self.create_run_directory("abcde")
+        dir_path = self.create_run_directory("abcde_1", EngineState(os.getpid(), self.port))
+
+        engine = self.create_engine()
+        self.assertEqual(self.loop.run_until_complete(engine.attach()), self.port)
+        self.assertEqual(engine.run_directory, dir_path)
+
+        # the engine is used by the first client now
+        self.assertIsNone(self.loop.run_until_complete(self.create_engine().attach()))
+        engine.lock_release()
+
+    def test_nothing_to_attach(self):
+        self.server.close()
+        self.create_run_directory("abcde", EngineState(os.getpid(), self.port))
+        self.assertIsNone(self.loop.run_until_complete(self.create_engine().attach()))
+
+    def test_clear_run_directory(self):
+        run_dir = self.create_run_directory("abcde")
+        self.create_run_directory("fghij")
+        alive = self.create_run_directory("klmno", EngineState(os.getpid(), self.port))
+        for name in ["abcde", "abcde_2", "fghij", "old"]:
+            open(os.path.join(os.path.dirname(run_dir), f"{name}.lock"), "w").close()
+
+        engine = self.create_engine()
+        engine.lock_acquire(run_dir)
+        # a directory that is locked, but not created yet
+        other = self.create_engine()
+        other.lock_acquire(os.path.join(os.path.dirname(run_dir), "abcde_1"))
+        try:
+            self.loop.run_until_complete(engine._clear_run_directory())
+        finally:
+            engine.lock_release()
+            other.lock_release()
+
+        remaining = sorted(os.listdir(os.path.dirname(run_dir)))
+        self.assertEqual(remaining, ["abcde", "abcde.lock", "abcde_1.lock", os.path.basename(alive)])
+
+
+if __name__ == "__main__":
+    unittest.main()
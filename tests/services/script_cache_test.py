@@ -0,0 +1,86 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from aiohttp import web
+
+from bas_remote import Options
+from bas_remote.services import EngineService
+
+PROPERTIES = {"success": True, "engversion": "25.1.0", "free": False, "hash": "abcdef0123"}
+
+
+class ScriptCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+        self.requests = []
+
+        async def properties(request: web.Request) -> web.Response:
+            self.requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.json_response(PROPERTIES, headers={"ETag": '"v1"'})
+
+        app = web.Application()
+        app.router.add_get("/scripts/{name}/properties", properties)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        port = self.runner.addresses[0][1]
+        self.patch = mock.patch("bas_remote.services.engine_service.END_POINT", f"http://127.0.0.1:{port}")
+        self.patch.start()
+
+    def tearDown(self) -> None:
+        self.patch.stop()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def create_engine(self, ttl=3600.0) -> EngineService:
+        options = Options(working_dir=self.working_dir, script_name="Test", script_properties_ttl=ttl)
+        return EngineService(SimpleNamespace(options=options, loop=self.loop))
+
+    def initialize(self, engine: EngineService) -> None:
+        async def initialize():
+            await engine.initialize()
+            if engine._revalidate_task is not None:
+                await engine._revalidate_task
+
+        self.loop.run_until_complete(initialize())
+
+    def test_first_start_fetches_and_caches(self):
+        engine = self.create_engine()
+        self.initialize(engine)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(engine._exe_name, "abcde")
+        self.assertTrue(os.path.exists(os.path.join(self.working_dir, "run", "Test", "properties.json")))
+
+    def test_fresh_cache_skips_request(self):
+        self.initialize(self.create_engine())
+        engine = self.create_engine()
+        self.initialize(engine)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(engine._exe_name, "abcde")
+
+    def test_stale_cache_revalidated(self):
+        self.initialize(self.create_engine())
+        engine = self.create_engine(ttl=0)
+        self.initialize(engine)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.requests[1].headers.get("If-None-Match"), '"v1"')
+        self.assertEqual(engine._exe_name, "abcde")
+
+    def test_cache_disabled(self):
+        self.initialize(self.create_engine(ttl=None))
+        self.initialize(self.create_engine(ttl=None))
+        self.assertEqual(len(self.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import closing
+from types import SimpleNamespace
+
+import websockets
+
+from bas_remote import Options
+from bas_remote.errors import EngineExitedError, SocketNotConnectedError, UnhandledException
+from bas_remote.metrics import Metrics
+from bas_remote.services import EngineService, SocketService
+from bas_remote.services.decoder import SEPARATOR
+from bas_remote.types import Message
+
+
+def find_free_port() -> int:
+    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class SocketServiceTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.events = []
+        self.service = self.create_service()
+        self.port = find_free_port()
+
+    def tearDown(self) -> None:
+        self.loop.run_until_complete(self.service.close())
+        self.loop.close()
+
+    def create_service(self, metrics=None, dispatch=None, has_listeners=None, **kwargs) -> SocketService:
+        client = SimpleNamespace(
+            loop=self.loop,
+            options=Options(script_name="Test", **kwargs),
+            _metrics=metrics,
+            emit=lambda event, *args: self.events.append(event),
+        )
+        return SocketService(client, dispatch=dispatch, has_listeners=has_listeners)
+
+    async def send_messages(self, service: SocketService, count: int, delay: float = 0) -> list:
+        """Send messages to a server that records the received frames, then return the frames."""
+        frames = []
+
+        async def handler(websocket, *args):
+            async for frame in websocket:
+                frames.append(frame)
+
+        server = await websockets.serve(handler, "127.0.0.1", self.port)
+        try:
+            await service.start(self.port, timeout=5)
+            tasks = []
+            for id_ in range(1, count + 1):
+                tasks.append(asyncio.ensure_future(service.send(Message(True, "run_task", id_, {}))))
+                if delay:
+                    await asyncio.sleep(delay)
+            self.assertEqual(await asyncio.gather(*tasks), list(range(1, count + 1)))
+            await asyncio.sleep(0.1)
+            await service.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+        return frames
+
+    async def serve_later(self, delay: float):
+        async def handler(websocket, *args):
+            await websocket.wait_closed()
+
+        await asyncio.sleep(delay)
+        return await websockets.serve(handler, "127.0.0.1", self.port)
+
+    def test_connect_when_ready(self):
+        async def main():
+            server = asyncio.ensure_future(self.serve_later(0.2))
+            started = self.loop.time()
+            await self.service.start(self.port, timeout=5)
+            elapsed = self.loop.time() - started
+
+            await self.service.close()
+            server = await server
+            server.close()
+            await server.wait_closed()
+            await asyncio.sleep(0.1)
+            return elapsed
+
+        elapsed = self.loop.run_until_complete(main())
+        self.assertFalse(self.service.is_connected)
+        self.assertIn("socket_open", self.events)
+        # the fixed one second polling would connect only after a second
+        self.assertLess(elapsed, 0.8)
+
+    def test_connect_timeout(self):
+        with self.assertRaises(SocketNotConnectedError):
+            self.loop.run_until_complete(self.service.start(self.port, timeout=0.2))
+
+    def test_engine_exited(self):
+        options = Options(working_dir=tempfile.gettempdir(), script_name="Test")
+        engine = EngineService(SimpleNamespace(options=options, loop=self.loop))
+        engine._process = subprocess.Popen([sys.executable, "-c", "import sys; sys.exit(3)"])
+        engine._process.wait()
+
+        with self.assertRaises(EngineExitedError) as context:
+            self.loop.run_until_complete(self.service.start(self.port, timeout=5, check=engine.check_process))
+        self.assertEqual(context.exception.code, 3)
+
+    def test_frame_per_message(self):
+        frames = self.loop.run_until_complete(self.send_messages(self.service, 3))
+        self.assertEqual(len(frames), 3)
+
+    def test_coalesce_writes(self):
+        metrics = Metrics()
+        service = self.create_service(metrics, coalesce_writes=True)
+        frames = self.loop.run_until_complete(self.send_messages(service, 3))
+
+        self.assertEqual(len(frames), 1)
+        packets = frames[0].split(SEPARATOR)[:-1]
+        self.assertEqual([Message.from_json(packet).id_ for packet in packets], [1, 2, 3])
+        self.assertEqual(self.events.count("message_sent"), 3)
+        self.assertEqual((metrics.messages_sent, metrics.frames_sent), (3, 1))
+
+    def test_coalesce_delay(self):
+        service = self.create_service(coalesce_writes=True, coalesce_delay=0.2)
+        frames = self.loop.run_until_complete(self.send_messages(service, 3, delay=0.01))
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0].count(SEPARATOR), 3)
+
+    def test_dispatch(self):
+        received = []
+        service = self.create_service(dispatch=received.append, has_listeners=lambda event: False)
+
+        async def handler(websocket, *args):
+            await websocket.send(Message(True, "run_task", 1, "data").to_json() + SEPARATOR)
+            await websocket.wait_closed()
+
+        async def main():
+            server = await websockets.serve(handler, "127.0.0.1", self.port)
+            try:
+                await service.start(self.port, timeout=5)
+                await service.send(Message(True, "run_task", 2, {}))
+                await asyncio.sleep(0.1)
+                await service.close()
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        self.loop.run_until_complete(main())
+        self.assertEqual([(message.id_, message.data) for message in received], [(1, "data")])
+        self.assertNotIn("message_received", self.events)
+        self.assertNotIn("message_sent", self.events)
+
+    def test_coalesce_writes_closed_socket(self):
+        service = self.create_service(coalesce_writes=True)
+
+        async def main():
+            await self.send_messages(service, 1)
+            # the same error as without coalescing, the connection was closed normally
+            with self.assertRaises(UnhandledException):
+                await service.send(Message(True, "run_task", 2, {}))
+
+        self.loop.run_until_complete(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
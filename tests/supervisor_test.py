@@ -0,0 +1,134 @@
+import asyncio
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+
+from bas_remote.supervisor import EngineSupervisor, psutil
+
+STAND_IN = [sys.executable, "-c", "import time; time.sleep(60)"]
+"""Command of the stand-in engine, a process that just keeps running."""
+
+
+class FakeClient:
+    is_reconnecting = False
+
+    def __init__(self, loop):
+        self.loop = loop
+        self._engine = SimpleNamespace(process=subprocess.Popen(STAND_IN))
+        self._socket = SimpleNamespace(is_connected=True)
+        self._active = 0
+        self.is_paused = False
+        self.processes = [self._engine.process]
+        self.failures = 0
+
+    def _pause(self):
+        self.is_paused = True
+
+    async def _restart_engine(self):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("Cannot start engine")
+        self._engine.process.kill()
+        self._engine.process.wait()
+        self._engine.process = subprocess.Popen(STAND_IN)
+        self.processes.append(self._engine.process)
+        self.is_paused = False
+
+    def close(self):
+        for process in self.processes:
+            process.kill()
+            process.wait()
+
+
+class EngineSupervisorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.client = FakeClient(self.loop)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    async def wait_for(self, predicate, timeout=5.0):
+        deadline = self.loop.time() + timeout
+        while not predicate():
+            self.assertLess(self.loop.time(), deadline)
+            await asyncio.sleep(0.01)
+
+    def test_restart_crashed_engine(self):
+        supervisor = EngineSupervisor(self.client, check_interval=0.05)
+
+        async def main():
+            supervisor.start()
+            crashed = self.client._engine.process
+            crashed.kill()
+            await self.wait_for(lambda: supervisor.stats()["restarts"] == 1)
+            await supervisor.close()
+            return crashed
+
+        crashed = self.run_async(main())
+        self.assertIsNot(self.client._engine.process, crashed)
+        self.assertIsNone(self.client._engine.process.poll())
+        self.assertEqual(supervisor.stats()["crashes"], 1)
+        self.assertEqual(supervisor.stats()["recycles"], 0)
+
+    def test_restart_with_backoff(self):
+        self.client.failures = 2
+        supervisor = EngineSupervisor(self.client, check_interval=0.05, restart_delay=0.05, max_restart_delay=0.1)
+
+        async def main():
+            supervisor.start()
+            self.client._engine.process.kill()
+            started = self.loop.time()
+            await self.wait_for(lambda: supervisor.stats()["restarts"] == 1)
+            await supervisor.close()
+            return self.loop.time() - started
+
+        elapsed = self.run_async(main())
+        self.assertEqual(self.client.failures, 0)
+        # two failed attempts wait 0.05 and 0.1 seconds
+        self.assertGreaterEqual(elapsed, 0.15)
+
+    def test_recycle_after_tasks_drains_running_tasks(self):
+        supervisor = EngineSupervisor(self.client, check_interval=60, max_tasks=3)
+
+        async def main():
+            supervisor.start()
+            self.client._active = 1
+            for _ in range(3):
+                supervisor.task_done()
+
+            await asyncio.sleep(0.2)
+            self.assertTrue(self.client.is_paused)
+            self.assertEqual(len(self.client.processes), 1)
+
+            self.client._active = 0
+            await self.wait_for(lambda: supervisor.stats()["recycles"] == 1)
+            await supervisor.close()
+
+        self.run_async(main())
+        self.assertFalse(self.client.is_paused)
+        self.assertEqual(len(self.client.processes), 2)
+        self.assertEqual(supervisor.stats()["tasks"], 0)
+        self.assertEqual(supervisor.stats()["crashes"], 0)
+
+    @unittest.skipIf(psutil is None, "psutil is not installed")
+    def test_recycle_on_memory_limit(self):
+        supervisor = EngineSupervisor(self.client, check_interval=0.05, max_memory=1024)
+
+        async def main():
+            supervisor.start()
+            await self.wait_for(lambda: supervisor.stats()["recycles"] == 1)
+            await supervisor.close()
+
+        self.run_async(main())
+        self.assertGreater(supervisor.stats()["memory"], 1024)
+        self.assertEqual(supervisor.stats()["crashes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
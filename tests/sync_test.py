@@ -0,0 +1,105 @@
+import asyncio
+import gc
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import warnings
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from unittest import mock
+
+from bas_remote import Options, SyncBasRemoteClient
+from bas_remote.errors import FunctionError
+from bas_remote.testing import fake_engine_command
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SyncClientTestCase(unittest.TestCase):
+    client: SyncBasRemoteClient
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.working_dir = tempfile.mkdtemp()
+        options = Options(working_dir=cls.working_dir, script_name="Test", engine_command=fake_engine_command())
+        # the engine runs in its own directory, so the package has to be importable from there
+        with mock.patch.dict(os.environ, {"PYTHONPATH": ROOT}):
+            cls.client = SyncBasRemoteClient(options)
+            cls.client.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.client.close()
+        shutil.rmtree(cls.working_dir, ignore_errors=True)
+
+    def test_run_function(self):
+        self.assertEqual(self.client.run_function("Add", {"X": 1, "Y": 2}), 3)
+        with self.assertRaises(FunctionError):
+            self.client.run_function("Missing")
+
+    def test_many_threads(self):
+        def work(i):
+            return [self.client.run_function("Add", {"X": i, "Y": j}) for j in range(10)]
+
+        with ThreadPoolExecutor(20) as executor:
+            results = list(executor.map(work, range(20)))
+        self.assertEqual(results, [[i + j for j in range(10)] for i in range(20)])
+        self.assertEqual(self.client.stats()["gauges"]["load"], 0)
+
+    def test_submit(self):
+        futures = [self.client.submit("Add", {"X": i, "Y": i}) for i in range(10)]
+        self.assertEqual([future.result(timeout=10) for future in futures], [i * 2 for i in range(10)])
+
+    def test_submit_cancel(self):
+        future = self.client.submit("Sleep", {"Seconds": 10})
+        future.cancel()
+        with self.assertRaises(CancelledError):
+            future.result(timeout=10)
+
+    def test_map(self):
+        params = ({"X": i, "Y": 1} for i in range(20))
+        results = list(self.client.map("Add", params, concurrency=5, ordered=True))
+        self.assertEqual([result for _, result in results], list(range(1, 21)))
+
+        future = self.client.submit_map("Add", [{"X": 1, "Y": 1}, {"X": 2, "Y": 2}])
+        self.assertEqual(sorted(result for _, result in future.result(timeout=10)), [2, 4])
+
+    def test_map_stopped_early(self):
+        results = self.client.map("Add", ({"X": i, "Y": 0} for i in range(1000)), concurrency=5, ordered=True)
+        self.assertEqual(next(results), ({"X": 0, "Y": 0}, 0))
+        results.close()
+        self.assertLess(self.client.stats()["gauges"]["load"], 5)
+
+    def test_global_variables(self):
+        self.client.set_global_variable("value", [1, 2])
+        self.assertEqual(self.client.get_global_variable("value"), [1, 2])
+
+    def test_loop_thread(self):
+        self.assertTrue(self.client.is_started)
+        self.assertIsNot(threading.current_thread(), self.client._thread)
+        self.assertTrue(self.client._thread.is_alive())
+
+    def test_call_from_loop_thread(self):
+        async def call():
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                with self.assertRaises(RuntimeError):
+                    self.client.stats()
+                gc.collect()
+            return caught
+
+        caught = asyncio.run_coroutine_threadsafe(call(), self.client.loop).result(timeout=10)
+        self.assertEqual([str(warning.message) for warning in caught if warning.category is RuntimeWarning], [])
+
+
+class SyncClientCreateTestCase(unittest.TestCase):
+    def test_failed_create_stops_loop(self):
+        with mock.patch("bas_remote.sync.BasRemoteClient", side_effect=ValueError("broken options")):
+            with self.assertRaises(ValueError):
+                SyncBasRemoteClient(Options())
+        self.assertEqual([thread for thread in threading.enumerate() if thread.name == "bas-remote-loop"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
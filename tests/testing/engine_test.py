@@ -0,0 +1,137 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bas_remote import BasRemoteClient, Options
+from bas_remote.errors import AuthenticationError, ConnectionLostError, FunctionError
+from bas_remote.testing import FakeEngine, fake_engine_command
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeEngineTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def run_client(self, engine, main, **kwargs):
+        options = Options(working_dir=self.working_dir, script_name="Test", **kwargs)
+        client = BasRemoteClient(options, loop=self.loop)
+        client._engine.initialize = mock.AsyncMock()
+        client._engine.start = mock.AsyncMock()
+        client._engine.close = mock.AsyncMock()
+
+        async def run():
+            port = await engine.start()
+            try:
+                with mock.patch("bas_remote.client.find_free_port", return_value=port):
+                    await client.start()
+                try:
+                    return await main(client)
+                finally:
+                    await client.close()
+            finally:
+                await engine.close()
+
+        return self.loop.run_until_complete(run())
+
+    def test_run_functions(self):
+        engine = FakeEngine()
+
+        async def main(client):
+            results = await asyncio.gather(*[client.run_function("Add", {"X": i, "Y": 1}) for i in range(10)])
+            payload = await client.run_function("Payload", {"Size": 1000})
+            return results, payload
+
+        results, payload = self.run_client(engine, main)
+        self.assertEqual(results, list(range(1, 11)))
+        self.assertEqual(len(payload), 1000)
+        self.assertEqual(engine.tasks, 11)
+        self.assertGreater(engine.max_threads, 1)
+        self.assertEqual(engine.threads, set())
+
+    def test_latency(self):
+        engine = FakeEngine(latency=0.1)
+
+        async def main(client):
+            started = self.loop.time()
+            await asyncio.gather(*[client.run_function("Echo", {}) for _ in range(5)])
+            return self.loop.time() - started
+
+        elapsed = self.run_client(engine, main)
+        # tasks run concurrently, so they take about the latency of one of them
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 0.4)
+
+    def test_failure_injection(self):
+        engine = FakeEngine(failure_rate=1.0)
+
+        async def main(client):
+            with self.assertRaises(FunctionError):
+                await client.run_function("Add", {"X": 1, "Y": 2})
+            with self.assertRaises(FunctionError):
+                await client.run_function("Missing")
+
+        self.run_client(engine, main)
+
+    def test_drop_connection(self):
+        engine = FakeEngine(drop_after=1)
+
+        async def main(client):
+            return await client.run_function("Add", {"X": 1, "Y": 2}, idempotent=True)
+
+        result = self.run_client(engine, main, reconnect=True, reconnect_timeout=5)
+        self.assertEqual(result, 3)
+        self.assertEqual(engine.connections, 2)
+        self.assertEqual(engine.received, 2)
+
+    def test_drop_connection_without_flag(self):
+        engine = FakeEngine(drop_after=1)
+
+        async def main(client):
+            with self.assertRaises(ConnectionLostError):
+                await client.run_function("Add", {"X": 1, "Y": 2})
+            return await client.run_function("Add", {"X": 2, "Y": 2})
+
+        result = self.run_client(engine, main, reconnect=True, reconnect_timeout=5)
+        self.assertEqual(result, 4)
+        self.assertEqual(engine.connections, 2)
+
+    def test_wrong_password(self):
+        engine = FakeEngine(password="secret")
+
+        async def main(client):
+            pass
+
+        with self.assertRaises(AuthenticationError):
+            self.run_client(engine, main, password="wrong")
+
+    def test_engine_command(self):
+        options = Options(
+            working_dir=self.working_dir, script_name="Test", engine_command=fake_engine_command(payload_size=10)
+        )
+
+        async def main():
+            client = BasRemoteClient(options, loop=self.loop)
+            await client.start()
+            try:
+                return await client.run_function("Add", {"X": 1, "Y": 2}), await client.run_function("Payload")
+            finally:
+                await client.close()
+
+        # the engine runs in its own directory, so the package has to be importable from there
+        with mock.patch.dict(os.environ, {"PYTHONPATH": ROOT}):
+            result, payload = self.loop.run_until_complete(main())
+        self.assertEqual(result, 3)
+        self.assertEqual(payload, "x" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
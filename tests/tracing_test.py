@@ -0,0 +1,42 @@
+import unittest
+
+from bas_remote.tracing import OpenTelemetryTracer, Span, start_span, trace
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:
+    TracerProvider = None
+
+
+class OpenTelemetryTracerTestCase(unittest.TestCase):
+    @unittest.skipIf(trace is not None, "opentelemetry is installed")
+    def test_noop_without_opentelemetry(self):
+        tracer = OpenTelemetryTracer()
+        with start_span(tracer, "bas.run_function", attributes={"bas.function": "Test"}) as span:
+            self.assertIs(type(span), Span)
+
+    @unittest.skipIf(TracerProvider is None, "opentelemetry-sdk is not installed")
+    def test_spans(self):
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = OpenTelemetryTracer(provider.get_tracer("test"))
+
+        with self.assertRaises(ValueError):
+            with start_span(tracer, "bas.run_function", attributes={"bas.function": "Test"}) as root:
+                with start_span(tracer, "bas.run_task", root, {"bas.thread_id": 1}):
+                    pass
+                raise ValueError()
+
+        child, parent = exporter.get_finished_spans()
+        self.assertEqual((child.name, parent.name), ("bas.run_task", "bas.run_function"))
+        self.assertEqual(child.parent.span_id, parent.context.span_id)
+        self.assertEqual(parent.attributes["bas.function"], "Test")
+        self.assertEqual(child.attributes["bas.thread_id"], 1)
+        self.assertFalse(parent.status.is_ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+
+from bas_remote.types import Message, Response, codec, get_codec, set_codec
+
+
+class CodecTestCase(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_codec()
+
+    def test_json_codec(self):
+        set_codec("json")
+        self.assertEqual(get_codec().name, "json")
+        self.assertEqual(codec.loads(codec.dumps({"a": [1, "b", None]})), {"a": [1, "b", None]})
+
+    def test_available_codecs_roundtrip(self):
+        message = Message(id_=1, async_=True, type_="run_task", data={"params": '{"X": "\\u043f"}'})
+        for name, codec_class in codec.CODECS.items():
+            try:
+                codec_class()
+            except ImportError:
+                continue
+            with self.subTest(codec=name):
+                set_codec(name)
+                self.assertEqual(Message.from_json(message.to_json()), message)
+
+    def test_non_string_keys(self):
+        obj = {1: "a", 2.5: "b", None: "c", False: "d", "e": {3: "f"}}
+        for name, codec_class in codec.CODECS.items():
+            try:
+                codec_class()
+            except ImportError:
+                continue
+            with self.subTest(codec=name):
+                set_codec(name)
+                self.assertEqual(codec.loads(codec.dumps(obj)), json.loads(json.dumps(obj)))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            set_codec("unknown")
+
+    def test_response_from_json(self):
+        response = Response.from_json('{"Success":true,"Message":"","Result":[1,2]}')
+        self.assertEqual(response, Response(success=True, message="", result=[1, 2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
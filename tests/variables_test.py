@@ -0,0 +1,129 @@
+import asyncio
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from bas_remote import BasRemoteClient, Options
+from bas_remote.errors import ClientNotStartedError
+from bas_remote.testing import FakeEngine
+
+
+class GlobalVariablesTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.working_dir = tempfile.mkdtemp()
+        self.engine = FakeEngine()
+        self.reads = 0
+
+    def tearDown(self) -> None:
+        self.loop.close()
+        shutil.rmtree(self.working_dir, ignore_errors=True)
+
+    def count_reads(self, message):
+        if message.type_ == "get_global_variable":
+            self.reads += 1
+
+    def run_client(self, main, **kwargs):
+        options = Options(working_dir=self.working_dir, script_name="Test", **kwargs)
+        client = BasRemoteClient(options, loop=self.loop)
+        client._engine.initialize = mock.AsyncMock()
+        client._engine.start = mock.AsyncMock()
+        client._engine.close = mock.AsyncMock()
+        client.on("message_sent", self.count_reads)
+
+        async def run():
+            port = await self.engine.start()
+            try:
+                with mock.patch("bas_remote.client.find_free_port", return_value=port):
+                    await client.start()
+                try:
+                    return await main(client)
+                finally:
+                    await client.close()
+            finally:
+                await self.engine.close()
+
+        return client, self.loop.run_until_complete(run())
+
+    def test_get_and_set(self):
+        async def main(client):
+            await client.set_global_variable("config", {"limit": 10})
+            first = await client.get_global_variable("config")
+            second = await client.get_global_variable("config")
+            missing = await client.get_global_variable("missing")
+            return first, second, missing
+
+        client, (first, second, missing) = self.run_client(main)
+        self.assertEqual(first, {"limit": 10})
+        self.assertEqual(second, {"limit": 10})
+        self.assertIsNone(missing)
+        self.assertEqual(self.engine.variables["config"], {"limit": 10})
+        # without the cache every read goes to the engine
+        self.assertEqual(self.reads, 3)
+
+    def test_batch(self):
+        async def main(client):
+            await client.global_variables.set_many({"a": 1, "b": "two", "c": [3]})
+            return await client.global_variables.get_many(["a", "b", "c", "a"])
+
+        _, values = self.run_client(main)
+        self.assertEqual(values, {"a": 1, "b": "two", "c": [3]})
+        self.assertEqual(self.engine.variables, {"a": 1, "b": "two", "c": [3]})
+        self.assertEqual(self.reads, 3)
+
+    def test_cache(self):
+        self.engine.variables.update({"a": 1, "b": 2})
+
+        async def main(client):
+            variables = client.global_variables
+            self.assertEqual(await variables.get_many(["a", "b"]), {"a": 1, "b": 2})
+            for _ in range(100):
+                await client.get_global_variable("a")
+
+            # changes made by the script are seen after invalidation or refresh
+            self.engine.variables.update({"a": 10, "b": 20})
+            self.assertEqual(await client.get_global_variable("a"), 1)
+            variables.invalidate("a")
+            self.assertEqual(await client.get_global_variable("a"), 10)
+            self.assertEqual(await variables.get("b", refresh=True), 20)
+
+            # written values are cached too
+            await client.set_global_variable("c", 3)
+            self.assertEqual(await client.get_global_variable("c"), 3)
+            return variables.stats()
+
+        _, stats = self.run_client(main, global_variables_ttl=60)
+        self.assertEqual(self.reads, 4)
+        self.assertEqual(stats, {"size": 3, "hits": 102, "misses": 4})
+
+    def test_cache_expires(self):
+        self.engine.variables["a"] = 1
+
+        async def main(client):
+            await client.get_global_variable("a")
+            await client.get_global_variable("a")
+            await asyncio.sleep(0.1)
+            await client.get_global_variable("a")
+
+        self.run_client(main, global_variables_ttl=0.05)
+        self.assertEqual(self.reads, 2)
+
+    def test_concurrent_reads_share_request(self):
+        self.engine.variables["a"] = 1
+
+        async def main(client):
+            return await asyncio.gather(*[client.get_global_variable("a") for _ in range(10)])
+
+        _, values = self.run_client(main)
+        self.assertEqual(values, [1] * 10)
+        self.assertEqual(self.reads, 1)
+
+    def test_not_started(self):
+        client = BasRemoteClient(Options(working_dir=self.working_dir, script_name="Test"), loop=self.loop)
+        with self.assertRaises(ClientNotStartedError):
+            self.loop.run_until_complete(client.get_global_variable("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()